@@ -0,0 +1,56 @@
+import time
+import unittest
+from email.utils import formatdate
+from unittest import mock
+
+import requests
+
+from utils import http_client
+
+
+class RateLimitWaitTests(unittest.TestCase):
+    def setUp(self):
+        http_client._buckets.clear()
+        self.addCleanup(http_client._buckets.clear)
+
+    def test_wait_longer_than_max_wait_raises(self):
+        with http_client._bucket_cond:
+            bucket = http_client._get_bucket('github')
+            bucket['tokens'] = 0.0
+        started = time.monotonic()
+        with self.assertRaises(http_client.RateLimitExceeded) as caught:
+            http_client.acquire_rate_limit('github', max_wait=1)
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertIsInstance(caught.exception, requests.exceptions.RequestException)
+
+    def test_long_wait_within_max_wait_is_announced(self):
+        with http_client._bucket_cond:
+            bucket = http_client._get_bucket('ipquery')
+            bucket['blocked_until'] = time.monotonic() + http_client.RATE_LIMIT_NOTICE_AFTER + 0.2
+        with mock.patch.object(http_client.console, 'print') as printed:
+            http_client.acquire_rate_limit('ipquery', max_wait=http_client.RATE_LIMIT_NOTICE_AFTER + 1)
+        printed.assert_called_once()
+        self.assertIn('rate limit', printed.call_args[0][0])
+
+    def test_server_remaining_never_raises_local_tokens(self):
+        with http_client._bucket_cond:
+            bucket = http_client._get_bucket('ip-api')
+            bucket['tokens'] = 2.0
+        response = requests.Response()
+        response.status_code = 200
+        response.headers['X-Rl'] = '40'
+        response.headers['X-Ttl'] = '30'
+        http_client._apply_rate_limit_headers('ip-api', response)
+        self.assertLess(http_client._buckets['ip-api']['tokens'], 3)
+
+
+class RetryAfterTests(unittest.TestCase):
+    def test_seconds_and_http_date_are_both_understood(self):
+        self.assertEqual(http_client._retry_after_seconds({'Retry-After': '120'}), 120)
+        when = formatdate(time.time() + 90, usegmt=True)
+        self.assertAlmostEqual(http_client._retry_after_seconds({'Retry-After': when}), 90, delta=2)
+        self.assertIsNone(http_client._retry_after_seconds({'Retry-After': 'soon'}))
+
+
+if __name__ == '__main__':
+    unittest.main()
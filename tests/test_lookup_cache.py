@@ -0,0 +1,44 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+from utils import lookup_cache
+
+
+class LookupCacheEvictionTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "lookup_cache.sqlite3")
+        for patcher in (mock.patch.object(lookup_cache, 'LOOKUP_CACHE_FILE', self.path),
+                        mock.patch.object(lookup_cache, 'LOOKUP_CACHE_MAX_ENTRIES', 2)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(lookup_cache._memory_cache.clear)
+        self.addCleanup(lookup_cache._pending_touches.clear)
+
+    def test_recently_read_entry_survives_over_a_longer_lived_cold_one(self):
+        lookup_cache.store_lookup('ipquery', '192.0.2.1', data={'ip': '192.0.2.1'})  # Cold, 24 h TTL
+        lookup_cache.store_lookup('ipquery', '192.0.2.2', error='timeout')  # Hot, short negative TTL
+        lookup_cache._memory_cache.clear()  # Force the next read through SQLite
+        self.assertIsNotNone(lookup_cache.get_cached_lookup('ipquery', '192.0.2.2'))
+        lookup_cache.store_lookup('ipquery', '192.0.2.3', data={'ip': '192.0.2.3'})
+        lookup_cache._memory_cache.clear()
+        self.assertIsNotNone(lookup_cache.get_cached_lookup('ipquery', '192.0.2.2'))
+        self.assertIsNone(lookup_cache.get_cached_lookup('ipquery', '192.0.2.1'))
+
+    def test_cache_file_without_last_access_is_upgraded(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute("CREATE TABLE lookup_cache (provider TEXT NOT NULL, query TEXT NOT NULL,"
+                     " entry TEXT NOT NULL, expires_at REAL NOT NULL, PRIMARY KEY (provider, query))")
+        conn.commit()
+        conn.close()
+        lookup_cache.store_lookup('ipquery', '192.0.2.9', data={'ip': '192.0.2.9'})
+        lookup_cache._memory_cache.clear()
+        self.assertEqual(lookup_cache.get_cached_lookup('ipquery', '192.0.2.9')['data'], {'ip': '192.0.2.9'})
+
+
+if __name__ == '__main__':
+    unittest.main()
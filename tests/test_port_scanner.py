@@ -0,0 +1,48 @@
+import unittest
+
+from utils import port_scanner
+
+
+class ConnectTimeoutTests(unittest.TestCase):
+    def test_unmeasured_host_starts_short_and_backs_off_to_a_low_cap(self):
+        estimator = port_scanner.new_rtt_estimator()
+        self.assertLessEqual(port_scanner.current_timeout(estimator), 0.5)
+        for probe in range(port_scanner.TIMEOUT_BACKOFF_STREAK * 10):
+            port_scanner.record_timeout(estimator, probe_started=probe, now=probe)
+        self.assertGreater(estimator['backoff'], 1.0)
+        self.assertLessEqual(port_scanner.current_timeout(estimator), port_scanner.UNMEASURED_MAX_CONNECT_TIMEOUT)
+
+    def test_rtt_samples_follow_rfc_6298(self):
+        estimator = port_scanner.new_rtt_estimator()
+        port_scanner.record_rtt_sample(estimator, 0.1)
+        self.assertAlmostEqual(estimator['srtt'], 0.1)
+        self.assertAlmostEqual(estimator['rttvar'], 0.05)
+        self.assertAlmostEqual(port_scanner.current_timeout(estimator), 0.1 + 4 * 0.05)
+
+        port_scanner.record_rtt_sample(estimator, 0.2)
+        self.assertAlmostEqual(estimator['rttvar'], 0.75 * 0.05 + 0.25 * 0.1)
+        self.assertAlmostEqual(estimator['srtt'], 0.875 * 0.1 + 0.125 * 0.2)
+
+    def test_backoff_needs_a_streak_sent_with_the_current_timeout(self):
+        estimator = port_scanner.new_rtt_estimator()
+        port_scanner.record_rtt_sample(estimator, 0.1)
+        base = port_scanner.current_timeout(estimator)
+        for _ in range(port_scanner.TIMEOUT_BACKOFF_STREAK):
+            port_scanner.record_timeout(estimator, probe_started=1.0, now=2.0)
+        self.assertAlmostEqual(port_scanner.current_timeout(estimator), base * 2)
+        # Probes already in flight with the old timeout do not double it again
+        for _ in range(port_scanner.TIMEOUT_BACKOFF_STREAK):
+            port_scanner.record_timeout(estimator, probe_started=1.5, now=2.5)
+        self.assertAlmostEqual(port_scanner.current_timeout(estimator), base * 2)
+        # A fresh sample clears the backoff
+        port_scanner.record_rtt_sample(estimator, 0.1)
+        self.assertEqual(estimator['backoff'], 1.0)
+
+    def test_measured_timeout_is_capped(self):
+        estimator = port_scanner.new_rtt_estimator()
+        port_scanner.record_rtt_sample(estimator, 5.0)
+        self.assertEqual(port_scanner.current_timeout(estimator), port_scanner.MAX_CONNECT_TIMEOUT)
+
+
+if __name__ == '__main__':
+    unittest.main()
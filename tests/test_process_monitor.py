@@ -0,0 +1,121 @@
+import os
+import sys
+import time
+import select
+import subprocess
+import unittest
+from unittest import mock
+
+import psutil
+
+from utils import process_monitor
+
+
+class NameWatchTests(unittest.TestCase):
+    def test_unmatched_name_watch_keeps_waiting(self):
+        entry = process_monitor._new_watch_entry(None, 'no_such_proc_typo')
+        entry['monitor_type'] = 'exit'
+        self.assertFalse(process_monitor.poll_watches([entry]))
+        self.assertEqual(entry['status'], 'waiting')
+        self.assertFalse(process_monitor.watch_finished(entry))
+
+    def test_name_watch_exits_after_its_process_was_seen(self):
+        child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+        try:
+            entry = process_monitor._new_watch_entry(None, 'matched_by_test')
+            entry['monitor_type'] = 'exit'
+            process_monitor.update_watch(entry, {child.pid: psutil.Process(child.pid)})
+            self.assertNotIn(entry['status'], ('waiting', 'exited'))
+        finally:
+            child.kill()
+            child.wait()
+        process_monitor.update_watch(entry, {})
+        self.assertEqual(entry['status'], 'exited')
+        self.assertTrue(process_monitor.watch_finished(entry))
+
+
+class WaitForExitsTests(unittest.TestCase):
+    def spawn(self, seconds):
+        child = subprocess.Popen([sys.executable, '-c', f'import time; time.sleep({seconds})'])
+        self.addCleanup(child.wait)
+        self.addCleanup(child.kill)
+        return child
+
+    def assert_returns_soon_after_exit(self):
+        child = self.spawn(0.3)
+        exits = []
+        started = time.monotonic()
+        remaining = process_monitor.wait_for_exits({child.pid}, timeout=10, on_exit=exits.append)
+        self.assertEqual(remaining, set())
+        self.assertEqual(exits, [child.pid])
+        self.assertLess(time.monotonic() - started, 2)
+
+    @unittest.skipUnless(hasattr(os, 'pidfd_open') and hasattr(select, 'epoll'), "needs pidfd and epoll")
+    def test_pidfd_wait_returns_soon_after_exit(self):
+        with mock.patch.object(psutil, 'wait_procs', side_effect=AssertionError("fallback used")):
+            self.assert_returns_soon_after_exit()
+
+    def test_fallback_wait_returns_soon_after_exit(self):
+        with mock.patch.object(process_monitor, '_open_pidfd', return_value=None):
+            self.assert_returns_soon_after_exit()
+
+    def test_timeout_returns_processes_still_running(self):
+        child = self.spawn(30)
+        for pidfd_available in (True, False):
+            with mock.patch.object(process_monitor, '_open_pidfd',
+                                   wraps=process_monitor._open_pidfd if pidfd_available else (lambda pid: None)):
+                started = time.monotonic()
+                self.assertEqual(process_monitor.wait_for_exits({child.pid}, timeout=0.3), {child.pid})
+                self.assertLess(time.monotonic() - started, 2)
+
+
+class MonitorLoopTests(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(process_monitor.stop_process_monitoring)
+        self.addCleanup(process_monitor.monitored_processes.clear)
+
+    def test_sampling_does_not_hold_the_watch_lock(self):
+        child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(0.5)'])
+        self.addCleanup(child.wait)
+        lock_free_while_sampling = []
+        real_poll = process_monitor.poll_watches
+
+        def poll(entries, **kwargs):
+            acquired = process_monitor.watch_lock.acquire(blocking=False)
+            if acquired:
+                process_monitor.watch_lock.release()
+            lock_free_while_sampling.append(acquired)
+            return real_poll(entries, **kwargs)
+
+        with process_monitor.watch_lock:
+            process_monitor.monitored_processes.append(process_monitor._new_watch_entry(child.pid, 'sleeper'))
+        with mock.patch.object(process_monitor, 'poll_watches', poll), \
+                mock.patch.object(process_monitor, 'perform_completion_action', return_value=True) as action:
+            self.assertTrue(process_monitor.start_monitor_thread('shutdown'))
+            process_monitor.monitor_thread.join(10)
+        action.assert_called_once_with('shutdown')
+        self.assertTrue(lock_free_while_sampling)
+        self.assertTrue(all(lock_free_while_sampling))
+
+
+class BulkTerminateTests(unittest.TestCase):
+    def test_tool_ancestors_and_init_are_protected(self):
+        parent = psutil.Process().parent()
+        procs = [parent, psutil.Process(1)] if parent is not None else [psutil.Process(1)]
+        allowed, excluded = process_monitor.split_protected(procs)
+        self.assertEqual(allowed, [])
+        self.assertEqual({proc.pid for proc in excluded}, {proc.pid for proc in procs})
+        # Never let a regression signal the shell running the tests or init: stub the signalling calls
+        with mock.patch.object(psutil.Process, 'terminate', autospec=True) as terminate, \
+                mock.patch.object(psutil.Process, 'kill', autospec=True) as kill, \
+                mock.patch.object(psutil, 'wait_procs', return_value=([], [])) as wait_procs:
+            result = process_monitor.terminate_processes(procs)
+        self.assertEqual(len(result['protected']), len(procs))
+        terminate.assert_not_called()
+        kill.assert_not_called()
+        for call in wait_procs.call_args_list:
+            self.assertEqual(list(call.args[0]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -25,11 +25,14 @@ except ImportError:
 from utils import shutdown_timer
 from utils import network_tools
 from utils import process_monitor
+from utils import process_recorder
 from utils import update_checker
 from utils import logging as logging_utils  # Use alias to avoid name clash
 from utils import calendar_scheduling
 from utils import ip_lookup  # Import the new module
 from utils import download_calculator
+from utils import port_scanner
+from utils import ping_tools
 
 def arrow_menu(title, options):
     """Display a menu with arrow key and WASD navigation"""
@@ -139,6 +142,7 @@ def process_completion_menu():
             "View Monitored Processes",
             "Clear Monitored Processes",
             "Start Monitoring & Set Action",  # Combined start/config
+            "Monitoring Status",
             "Back to Advanced Settings"
         ]
         choice = arrow_menu("Process Completion Action", options)
@@ -153,7 +157,9 @@ def process_completion_menu():
             process_monitor.clear_selected_processes()
         elif choice == 4:
             process_monitor.start_process_monitoring(arrow_menu)
-        elif choice == 5 or choice == -1:
+        elif choice == 5:
+            process_monitor.show_monitoring_status()
+        elif choice == 6 or choice == -1:
             return
 
 def features_menu(current_version):  # Accept current_version
@@ -228,8 +234,12 @@ def network_tools_menu():
             "Show My IP Addresses",
             "IP/Domain Info Lookup (ip-api.com)",  # Clarify source
             "Detailed IP Lookup (ipquery.io)",    # Added option
+            "Bulk IP Lookup (File / List)",
             "Scan Open Ports",
+            "Batch Port Scan (Hosts / CIDR)",
             "Ping Host",
+            "Ping Sweep (Hosts / CIDR)",
+            "Continuous Ping Monitor",
             "Traceroute Host (with WHOIS)",       # Clarify feature
             "Back to Features Menu"
         ]
@@ -241,37 +251,98 @@ def network_tools_menu():
             network_tools.lookup_ip_info()
         elif choice == 2:  # Detailed IP Lookup
             ip_lookup.display_detailed_ip_info()  # Call the new function
-        elif choice == 3:  # Scan Ports
+        elif choice == 3:  # Bulk IP Lookup
+            ip_lookup.display_bulk_ip_lookup()
+        elif choice == 4:  # Scan Ports
             clear_screen()
             print_banner()
             target = Prompt.ask("[bold]Enter target IP or Hostname for Scan[/bold]")
             if target:
                 start_port_str = Prompt.ask("[bold]Start Port[/bold]", default="1")
                 end_port_str = Prompt.ask("[bold]End Port[/bold]", default="1024")
+                concurrency_str = Prompt.ask("[bold]Concurrent Connections[/bold]",
+                                             default=str(port_scanner.DEFAULT_SCAN_CONCURRENCY))
                 try:
                     start_port = int(start_port_str)
                     end_port = int(end_port_str)
-                    if 1 <= start_port <= end_port <= 65535:
-                        network_tools.scan_open_ports(target, start_port, end_port)
-                    else:
+                    concurrency = int(concurrency_str)
+                    if not 1 <= start_port <= end_port <= 65535:
                         console.print("[red]Invalid port range (1-65535).[/red]")
                         time.sleep(1.5)
+                    elif concurrency < 1:
+                        console.print("[red]Concurrency must be at least 1.[/red]")
+                        time.sleep(1.5)
+                    else:
+                        network_tools.scan_open_ports(target, start_port, end_port, concurrency)
                 except ValueError:
                     console.print("[red]Invalid port number entered.[/red]")
                     time.sleep(1.5)
-        elif choice == 4:  # Ping Host
+        elif choice == 5:  # Batch Port Scan
+            clear_screen()
+            print_banner()
+            target_spec = Prompt.ask("[bold]Enter targets (IPs, hostnames, CIDR ranges, comma separated)[/bold]")
+            if target_spec:
+                port_spec = Prompt.ask("[bold]Ports (e.g. 22,80,443,8000-8100)[/bold]", default="1-1024")
+                concurrency_str = Prompt.ask("[bold]Concurrent Connections[/bold]",
+                                             default=str(port_scanner.DEFAULT_SCAN_CONCURRENCY))
+                per_host_str = Prompt.ask("[bold]Max Connections per Host[/bold]",
+                                          default=str(port_scanner.DEFAULT_PER_HOST_CONCURRENCY))
+                try:
+                    concurrency = int(concurrency_str)
+                    per_host = int(per_host_str)
+                    if concurrency < 1 or per_host < 1:
+                        console.print("[red]Concurrency values must be at least 1.[/red]")
+                        time.sleep(1.5)
+                    else:
+                        network_tools.batch_scan_ports(target_spec, port_spec, concurrency, per_host)
+                except ValueError:
+                    console.print("[red]Invalid number entered.[/red]")
+                    time.sleep(1.5)
+        elif choice == 6:  # Ping Host
             clear_screen()
             print_banner()
             target = Prompt.ask("[bold]Enter target IP or Hostname to Ping[/bold]")
             if target:
                 network_tools.run_ping(target)
-        elif choice == 5:  # Traceroute Host
+        elif choice == 7:  # Ping Sweep
+            clear_screen()
+            print_banner()
+            target_spec = Prompt.ask("[bold]Enter targets to ping (IPs, hostnames, CIDR ranges, comma separated)[/bold]")
+            if target_spec:
+                count_str = Prompt.ask("[bold]Probes per Host[/bold]", default=str(ping_tools.DEFAULT_PING_COUNT))
+                try:
+                    count = int(count_str)
+                    if count < 1:
+                        console.print("[red]Probe count must be at least 1.[/red]")
+                        time.sleep(1.5)
+                    else:
+                        ping_tools.run_ping_sweep(target_spec, count)
+                except ValueError:
+                    console.print("[red]Invalid number entered.[/red]")
+                    time.sleep(1.5)
+        elif choice == 8:  # Continuous Ping Monitor
+            clear_screen()
+            print_banner()
+            target_spec = Prompt.ask("[bold]Enter targets to monitor (IPs, hostnames, CIDR ranges, comma separated)[/bold]")
+            if target_spec:
+                interval_str = Prompt.ask("[bold]Seconds between Probes[/bold]", default=str(ping_tools.DEFAULT_MONITOR_INTERVAL))
+                try:
+                    interval = float(interval_str)
+                    if interval < 0.1:
+                        console.print("[red]Interval must be at least 0.1 seconds.[/red]")
+                        time.sleep(1.5)
+                    else:
+                        ping_tools.run_ping_monitor(target_spec, interval)
+                except ValueError:
+                    console.print("[red]Invalid number entered.[/red]")
+                    time.sleep(1.5)
+        elif choice == 9:  # Traceroute Host
             clear_screen()
             print_banner()
             target = Prompt.ask("[bold]Enter target IP or Hostname for Traceroute[/bold]")
             if target:
                 network_tools.run_traceroute(target)
-        elif choice == 6 or choice == -1:  # Back
+        elif choice == 10 or choice == -1:  # Back
             return
 
 def process_utilities_menu():
@@ -280,6 +351,8 @@ def process_utilities_menu():
         options = [
             "List Running Processes",
             "Terminate Process",  # Added option
+            "Record Process Resources",
+            "View Process Recordings",
             "Back to Features Menu"
         ]
         choice = arrow_menu("Process Utilities", options)
@@ -289,7 +362,11 @@ def process_utilities_menu():
         elif choice == 1:
             # Pass arrow_menu for the selection list within terminate function
             process_monitor.select_process_to_terminate(arrow_menu)
-        elif choice == 2 or choice == -1:
+        elif choice == 2:
+            process_recorder.run_process_recorder()
+        elif choice == 3:
+            process_recorder.view_recordings(arrow_menu)
+        elif choice == 4 or choice == -1:
             return
 
 def main_menu(current_version):  # Accept current_version
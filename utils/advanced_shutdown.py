@@ -70,30 +70,3 @@ def clear_monitored_processes():
     global monitored_processes
     monitored_processes = []
     console.print("[bold green]Cleared all monitored processes.[/bold green]")
-
-def start_process_monitoring(action="shutdown"):
-    """Start monitoring processes and perform an action when they complete."""
-    global monitored_processes
-
-    if not monitored_processes:
-        console.print("[bold yellow]No processes selected for monitoring.[/bold yellow]")
-        return
-
-    console.print("[bold green]Monitoring processes...[/bold green]")
-    while monitored_processes:
-        for proc in monitored_processes[:]:
-            try:
-                psutil.Process(proc['pid'])
-            except psutil.NoSuchProcess:
-                monitored_processes.remove(proc)
-                console.print(f"[bold green]Process {proc['name']} has completed.[/bold green]")
-
-        if not monitored_processes:
-            console.print(f"[bold green]All processes have completed. Performing {action} action.[/bold green]")
-            if action == "shutdown":
-                os.system("shutdown /s /t 0")
-            elif action == "restart":
-                os.system("shutdown /r /t 0")
-            return
-
-        time.sleep(1)
@@ -0,0 +1,261 @@
+import os
+import glob
+import mmap
+import struct
+import ipaddress
+import threading
+
+# --- Offline GeoIP Configuration ---
+GEOIP_DB_ENV = "TARS_GEOIP_DB"  # Path(s) to .mmdb files, separated by os.pathsep
+GEOIP_DB_DIR = os.path.join(os.path.expanduser("~"), "TarsUtilitiesTool")  # *.mmdb here are picked up too
+RECORD_CACHE_SIZE = 65536  # Decoded records kept per database (many networks share one record)
+# --- End Configuration ---
+
+METADATA_MARKER = b"\xab\xcd\xefMaxMind.com"
+METADATA_SEARCH_BYTES = 128 * 1024  # The spec puts the metadata within the last 128 KiB
+DATA_SECTION_SEPARATOR = 16
+
+# MMDB data section type numbers
+_POINTER, _UTF8, _DOUBLE, _BYTES, _UINT16, _UINT32, _MAP = 1, 2, 3, 4, 5, 6, 7
+_INT32, _UINT64, _UINT128, _ARRAY, _CONTAINER, _END, _BOOL, _FLOAT = 8, 9, 10, 11, 12, 13, 14, 15
+
+_default_databases = None
+_default_lock = threading.Lock()
+
+
+def _decode(buf, offset, base):
+    """Decode one value of the MaxMind DB data format at offset.
+
+    Pointers are relative to base (the data section start, or the metadata start).
+    Returns (value, next_offset).
+    """
+    ctrl = buf[offset]
+    offset += 1
+    type_num = ctrl >> 5
+    if type_num == _POINTER:
+        size_bits = (ctrl >> 3) & 0x3
+        value_bits = ctrl & 0x7
+        if size_bits == 0:
+            pointer = (value_bits << 8) | buf[offset]
+        elif size_bits == 1:
+            pointer = ((value_bits << 16) | int.from_bytes(buf[offset:offset + 2], 'big')) + 2048
+        elif size_bits == 2:
+            pointer = ((value_bits << 24) | int.from_bytes(buf[offset:offset + 3], 'big')) + 526336
+        else:
+            pointer = int.from_bytes(buf[offset:offset + 4], 'big')
+        value, _ = _decode(buf, base + pointer, base)
+        return value, offset + size_bits + 1
+    if type_num == 0:  # Extended type
+        type_num = 7 + buf[offset]
+        offset += 1
+
+    size = ctrl & 0x1F
+    if size >= 29:
+        extra = size - 28
+        raw = int.from_bytes(buf[offset:offset + extra], 'big')
+        offset += extra
+        size = (29, 285, 65821)[extra - 1] + raw
+
+    if type_num == _MAP:
+        result = {}
+        for _ in range(size):
+            key, offset = _decode(buf, offset, base)
+            result[key], offset = _decode(buf, offset, base)
+        return result, offset
+    if type_num == _ARRAY:
+        items = []
+        for _ in range(size):
+            item, offset = _decode(buf, offset, base)
+            items.append(item)
+        return items, offset
+    if type_num == _BOOL:
+        return bool(size), offset
+    end = offset + size
+    if type_num == _UTF8:
+        return buf[offset:end].decode('utf-8'), end
+    if type_num == _DOUBLE:
+        return struct.unpack(">d", buf[offset:end])[0], end
+    if type_num == _FLOAT:
+        return struct.unpack(">f", buf[offset:end])[0], end
+    if type_num in (_UINT16, _UINT32, _UINT64, _UINT128):
+        return int.from_bytes(buf[offset:end], 'big'), end
+    if type_num == _INT32:
+        return int.from_bytes(buf[offset:end], 'big', signed=(size == 4)), end
+    if type_num == _BYTES:
+        return bytes(buf[offset:end]), end
+    raise ValueError(f"Unsupported MMDB data type {type_num} at offset {offset - 1}")
+
+
+def open_database(path):
+    """Memory-map a MaxMind DB (.mmdb) file such as GeoLite2/DB-IP City, Country or ASN.
+
+    Returns a database dict for lookup_database(). Raises OSError if the file cannot be
+    opened and ValueError if it is not a valid MaxMind DB.
+    """
+    with open(path, "rb") as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        marker = buf.rfind(METADATA_MARKER, max(0, len(buf) - METADATA_SEARCH_BYTES))
+        if marker < 0:
+            raise ValueError(f"{path} is not a MaxMind DB file (metadata marker not found)")
+        metadata_start = marker + len(METADATA_MARKER)
+        metadata, _ = _decode(buf, metadata_start, metadata_start)
+        record_size = metadata['record_size']
+        if record_size not in (24, 28, 32):
+            raise ValueError(f"Unsupported MMDB record size {record_size}")
+    except Exception:
+        buf.close()
+        raise
+
+    node_count = metadata['node_count']
+    db = {
+        'path': path,
+        'buffer': buf,
+        'metadata': metadata,
+        'node_count': node_count,
+        'record_size': record_size,
+        'node_bytes': record_size // 4,
+        'ip_version': metadata['ip_version'],
+        'tree_size': node_count * record_size // 4,
+        'ipv4_start': 0,
+        'cache': {},
+        'lock': threading.Lock(),
+    }
+    if db['ip_version'] == 6:
+        # IPv4 addresses live under ::/96; walk those 96 zero bits once instead of per lookup
+        node = 0
+        for _ in range(96):
+            if node >= node_count:
+                break
+            node = _read_record(db, node, 0)
+        db['ipv4_start'] = node
+    return db
+
+
+def _read_record(db, node, bit):
+    """Return the left (bit 0) or right (bit 1) record of a search tree node."""
+    buf = db['buffer']
+    size = db['record_size']
+    base = node * db['node_bytes']
+    if size == 24:
+        start = base + bit * 3
+        return int.from_bytes(buf[start:start + 3], 'big')
+    if size == 32:
+        start = base + bit * 4
+        return int.from_bytes(buf[start:start + 4], 'big')
+    # 28-bit records share the middle byte: its high nibble belongs to the left record
+    middle = buf[base + 3]
+    if bit:
+        return ((middle & 0x0F) << 24) | int.from_bytes(buf[base + 4:base + 7], 'big')
+    return ((middle & 0xF0) << 20) | int.from_bytes(buf[base:base + 3], 'big')
+
+
+def lookup_database(db, ip):
+    """Find ip in one database. Returns (record dict or None, prefix_length).
+
+    The search tree walk is one bit per step (at most 32 for IPv4, 128 for IPv6) straight
+    out of the memory map; decoded records are cached by data offset.
+    """
+    address = ipaddress.ip_address(ip)
+    if address.version == 6 and db['ip_version'] == 4:
+        return None, 0
+    packed = int(address)
+    bit_count = address.max_prefixlen
+    node = db['ipv4_start'] if address.version == 4 else 0
+    node_count = db['node_count']
+    depth = 0
+    while depth < bit_count and node < node_count:
+        node = _read_record(db, node, (packed >> (bit_count - 1 - depth)) & 1)
+        depth += 1
+    if node <= node_count:
+        return None, depth  # node == node_count marks "no data"
+
+    offset = node - node_count + db['tree_size']
+    cache = db['cache']
+    record = cache.get(offset)
+    if record is None:
+        data_start = db['tree_size'] + DATA_SECTION_SEPARATOR
+        record, _ = _decode(db['buffer'], offset, data_start)
+        with db['lock']:
+            if len(cache) >= RECORD_CACHE_SIZE:
+                cache.clear()
+            cache[offset] = record
+    return record, depth
+
+
+def close_database(db):
+    db['buffer'].close()
+
+
+def find_database_paths():
+    """Database files named in GEOIP_DB_ENV, then any *.mmdb in GEOIP_DB_DIR."""
+    paths = [p for p in os.environ.get(GEOIP_DB_ENV, "").split(os.pathsep) if p]
+    paths += sorted(glob.glob(os.path.join(GEOIP_DB_DIR, "*.mmdb")))
+    unique = []
+    for path in paths:
+        path = os.path.abspath(os.path.expanduser(path))
+        if os.path.isfile(path) and path not in unique:
+            unique.append(path)
+    return unique
+
+
+def get_databases():
+    """Open every configured database once and keep them mapped for the session."""
+    global _default_databases
+    with _default_lock:
+        if _default_databases is None:
+            _default_databases = []
+            for path in find_database_paths():
+                try:
+                    _default_databases.append(open_database(path))
+                except (OSError, ValueError, KeyError):
+                    continue  # Unreadable or not an MMDB file; the others still work
+        return _default_databases
+
+
+def offline_available():
+    return bool(get_databases())
+
+
+def lookup_offline(ip):
+    """Merge the answers of every configured database (e.g. City + ASN) for ip.
+
+    Returns a flat dict with the same keys as the bulk lookup rows, or None when no
+    database knows the address. Raises ValueError for invalid IPs.
+    """
+    merged = {}
+    for db in get_databases():
+        record, _ = lookup_database(db, ip)
+        if record:
+            merged.update(record)
+    if not merged:
+        return None
+    country = merged.get('country') or merged.get('registered_country') or {}
+    subdivisions = merged.get('subdivisions') or [{}]
+    location = merged.get('location') or {}
+
+    def name_of(entry):
+        names = entry.get('names') or {}
+        return names.get('en') or next(iter(names.values()), None)
+
+    asn = merged.get('autonomous_system_number')
+    return {
+        'ip': str(ipaddress.ip_address(ip)),
+        'country': name_of(country),
+        'country_code': country.get('iso_code'),
+        'region': name_of(subdivisions[0]),
+        'city': name_of(merged.get('city') or {}),
+        'isp': merged.get('isp'),
+        'org': merged.get('autonomous_system_organization') or merged.get('organization'),
+        'asn': f"AS{asn}" if asn else None,
+        'latitude': location.get('latitude'),
+        'longitude': location.get('longitude'),
+        'timezone': location.get('time_zone'),
+        'error': None,
+    }
+
+
+__all__ = [
+    'GEOIP_DB_ENV', 'GEOIP_DB_DIR', 'open_database', 'lookup_database', 'close_database',
+    'find_database_paths', 'get_databases', 'offline_available', 'lookup_offline'
+]
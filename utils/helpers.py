@@ -64,8 +64,11 @@ def print_banner():
     console.print(Align.center(banner))
     console.print() # Add a blank line after the banner
 
-def get_key():
-    """Get a keypress from the user, cross-platform, non-blocking."""
+def get_key(wasd=True):
+    """Get a keypress from the user, cross-platform, non-blocking.
+
+    Pass wasd=False when the caller needs typed letters (e.g. a type-to-filter box).
+    """
     if os.name == 'nt' and msvcrt:  # Windows
         if msvcrt.kbhit(): # Check if a key is pressed before blocking
             key = msvcrt.getch()
@@ -75,13 +78,16 @@ def get_key():
                 elif key == b'P': return 'DOWN'
                 elif key == b'K': return 'LEFT'
                 elif key == b'M': return 'RIGHT'
+                elif key == b'I': return 'PGUP'
+                elif key == b'Q': return 'PGDN'
             elif key == b'\r': return 'ENTER'
             elif key == b'\x1b': return 'ESC'
+            elif key == b'\x08': return 'BACKSPACE'
             # WASD for navigation
-            elif key in [b'w', b'W']: return 'UP'
-            elif key in [b's', b'S']: return 'DOWN'
-            elif key in [b'a', b'A']: return 'LEFT'
-            elif key in [b'd', b'D']: return 'RIGHT'
+            elif wasd and key in [b'w', b'W']: return 'UP'
+            elif wasd and key in [b's', b'S']: return 'DOWN'
+            elif wasd and key in [b'a', b'A']: return 'LEFT'
+            elif wasd and key in [b'd', b'D']: return 'RIGHT'
             try:
                 return key.decode('utf-8', errors='ignore')
             except UnicodeDecodeError:
@@ -110,13 +116,18 @@ def get_key():
                         elif next2 == 'B': return 'DOWN'
                         elif next2 == 'C': return 'RIGHT'
                         elif next2 == 'D': return 'LEFT'
+                        elif next2 in ('5', '6'):  # Page Up / Page Down end with '~'
+                            if select.select([sys.stdin], [], [], 0) == ([sys.stdin], [], []):
+                                sys.stdin.read(1)
+                            return 'PGUP' if next2 == '5' else 'PGDN'
                     return 'ESC' # Treat lone escape or unknown sequence as ESC
                 elif ch == '\r': return 'ENTER'
+                elif ch in ('\x7f', '\x08'): return 'BACKSPACE'
                 # WASD for navigation
-                elif ch in ['w', 'W']: return 'UP'
-                elif ch in ['s', 'S']: return 'DOWN'
-                elif ch in ['a', 'A']: return 'LEFT'
-                elif ch in ['d', 'D']: return 'RIGHT'
+                elif wasd and ch in ['w', 'W']: return 'UP'
+                elif wasd and ch in ['s', 'S']: return 'DOWN'
+                elif wasd and ch in ['a', 'A']: return 'LEFT'
+                elif wasd and ch in ['d', 'D']: return 'RIGHT'
                 return ch
             else:
                 return None # No key pressed
@@ -171,16 +182,26 @@ def format_duration(total_seconds):
         parts.append(f"{seconds} second{'s' if seconds != 1 else ''}")
     return ", ".join(parts)
 
-def generate_default_filename(base_name="output"):
+def format_bytes(value):
+    """Human-readable byte count (B, KB, MB, GB, TB); None shows as "-"."""
+    if value is None:
+        return "-"
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(value) < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} TB"
+
+def generate_default_filename(base_name="output", extension="txt"):
     """Generates a default filename with a timestamp."""
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    return f"{base_name}_{timestamp}.txt"
+    return f"{base_name}_{timestamp}.{extension}"
 
-def save_output_to_file(content_generator, default_filename_base="output"):
+def save_output_to_file(content_generator, default_filename_base="output", extension="txt"):
     """Asks the user if they want to save output and handles saving."""
     console.print() # Add a blank line before asking
     if Confirm.ask(f"Save this output to a file?", default=False):
-        default_filename = generate_default_filename(default_filename_base)
+        default_filename = generate_default_filename(default_filename_base, extension)
         filename = Prompt.ask("Enter filename to save", default=default_filename)
         filename = filename.strip()
 
@@ -203,6 +224,6 @@ def save_output_to_file(content_generator, default_filename_base="output"):
 
 __all__ = [
     'clear_screen', 'print_banner', 'get_key', 'format_time_display',
-    'format_seconds', 'format_duration', 'console', 'MAIN_STYLE', 'HIGHLIGHT_STYLE',
+    'format_seconds', 'format_duration', 'format_bytes', 'console', 'MAIN_STYLE', 'HIGHLIGHT_STYLE',
     'HACKER_GREEN', 'HACKER_BG', 'BORDER_STYLE', 'save_output_to_file' # Add save function
 ]
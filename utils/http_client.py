@@ -0,0 +1,264 @@
+import time
+import random
+import threading
+import requests
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+
+from utils.helpers import console
+
+# --- HTTP Client Configuration ---
+USER_AGENT = "TarsUtilitiesTool/1.0"
+DEFAULT_CONNECT_TIMEOUT = 3.05  # Seconds to establish TCP+TLS (just over a multiple of the 3 s SYN retransmit)
+DEFAULT_READ_TIMEOUT = 10  # Seconds to wait between bytes of the response
+POOL_HOSTS = 16  # Distinct hosts whose connection pools are kept alive
+POOL_MAXSIZE_PER_HOST = 8  # Idle connections kept per host; extra concurrent callers get a throwaway connection
+MAX_RETRIES = 3  # Extra attempts after connection errors, timeouts and RETRY_STATUSES
+RETRY_BACKOFF_BASE = 0.5  # Seconds; the backoff cap doubles with every attempt
+RETRY_BACKOFF_MAX = 8.0
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# --- End Configuration ---
+
+# --- Rate Limit Configuration ---
+# (bucket name, host, path prefix, requests, per seconds). First match wins; hosts not listed are unlimited.
+RATE_LIMIT_RULES = [
+    ("ip-api-batch", "ip-api.com", "/batch", 15, 60),  # Free tier: 15 batch requests per minute
+    ("ip-api", "ip-api.com", "", 45, 60),  # Free tier: 45 single lookups per minute
+    ("ipquery", "api.ipquery.io", "", 10, 1),
+    ("github", "api.github.com", "", 60, 3600),  # Unauthenticated REST API quota
+]
+DEFAULT_RATE_LIMIT_MAX_WAIT = 30.0  # Seconds a request may wait for a token before failing with RateLimitExceeded
+RATE_LIMIT_NOTICE_AFTER = 2.0  # Waits at least this long print a status line instead of blocking silently
+# --- End Configuration ---
+
+_session = None
+_session_lock = threading.Lock()
+
+# Token buckets, one per RATE_LIMIT_RULES entry: {'capacity', 'rate', 'tokens', 'updated', 'blocked_until'}.
+# All share one Condition so a response that tightens a bucket can wake every waiter to re-plan at once.
+_buckets = {}
+_bucket_cond = threading.Condition()
+
+
+class RateLimitExceeded(requests.exceptions.RequestException):
+    """A rate-limited request would have waited longer than its max_wait for a token."""
+
+
+def get_session():
+    """Return the process-wide requests.Session, creating it on first use.
+
+    Every outbound HTTP call goes through this session so connections (and their TLS
+    handshakes) are reused across features. Sessions are safe to share between threads
+    for the way this tool uses them (no cookies, no per-call session mutation).
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.headers['User-Agent'] = USER_AGENT
+            # Retries are handled in request() so they can use jittered backoff on any urllib3 version.
+            # pool_block stays False: requests never passes a pool timeout, so a blocking pool would
+            # make callers beyond POOL_MAXSIZE_PER_HOST wait forever regardless of their timeout=
+            adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_MAXSIZE_PER_HOST,
+                                  pool_block=False, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def close_session():
+    """Close pooled connections; the next request opens a fresh session."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def _bucket_for(url):
+    """Return the name of the rate-limit bucket a URL belongs to, or None if it is unlimited."""
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    for name, rule_host, path_prefix, _, _ in RATE_LIMIT_RULES:
+        if (host == rule_host or host.endswith("." + rule_host)) and parts.path.startswith(path_prefix):
+            return name
+    return None
+
+
+def _get_bucket(name):
+    """Create buckets lazily, full. Caller holds _bucket_cond."""
+    bucket = _buckets.get(name)
+    if bucket is None:
+        for rule_name, _, _, count, per_seconds in RATE_LIMIT_RULES:
+            if rule_name == name:
+                bucket = {'capacity': float(count), 'rate': count / per_seconds, 'tokens': float(count),
+                          'updated': time.monotonic(), 'blocked_until': 0.0}
+                _buckets[name] = bucket
+                break
+    return bucket
+
+
+def _refill(bucket, now):
+    bucket['tokens'] = min(bucket['capacity'], bucket['tokens'] + (now - bucket['updated']) * bucket['rate'])
+    bucket['updated'] = now
+
+
+def acquire_rate_limit(name, max_wait=DEFAULT_RATE_LIMIT_MAX_WAIT):
+    """Block until the named bucket has a token, then take it.
+
+    Waiters sleep on a Condition until the next token is due or until a response header
+    changes the bucket (see _apply_rate_limit_headers), whichever comes first. Raises
+    RateLimitExceeded instead of waiting past max_wait seconds (None waits as long as it
+    takes); waits of RATE_LIMIT_NOTICE_AFTER seconds or more are announced on the console.
+    """
+    deadline = None if max_wait is None else time.monotonic() + max_wait
+    announced = False
+    while True:
+        notice = None
+        with _bucket_cond:
+            bucket = _get_bucket(name)
+            if bucket is None:
+                return
+            while True:
+                now = time.monotonic()
+                _refill(bucket, now)
+                if now < bucket['blocked_until']:
+                    wait = bucket['blocked_until'] - now
+                elif bucket['tokens'] >= 1:
+                    bucket['tokens'] -= 1
+                    return
+                else:
+                    wait = (1 - bucket['tokens']) / bucket['rate']
+                if deadline is not None and now + wait > deadline:
+                    raise RateLimitExceeded(f"Rate limit for {name} reached; next request allowed in {wait:.0f} s")
+                if not announced and wait >= RATE_LIMIT_NOTICE_AFTER:
+                    announced = True
+                    notice = wait
+                    break  # Print outside the lock so other threads are not held up by terminal I/O
+                _bucket_cond.wait(wait)
+        console.print(f"[yellow]Waiting {notice:.0f} s for the {name} rate limit...[/yellow]")
+
+
+def _header_number(headers, name):
+    try:
+        return float(headers[name])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _retry_after_seconds(headers):
+    """Seconds to wait from a Retry-After header, given either as seconds or as an HTTP-date."""
+    value = headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:  # "-0000" dates parse as naive; HTTP-dates are always UTC
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _apply_rate_limit_headers(name, response):
+    """Tighten a bucket to the server's own view of the quota (never loosen it).
+
+    Understands ip-api's X-Rl / X-Ttl (remaining / seconds to reset), the common
+    X-RateLimit-Remaining / X-RateLimit-Reset (reset as epoch seconds, as GitHub sends it)
+    and Retry-After on 429 responses.
+    """
+    headers = response.headers
+    remaining = _header_number(headers, 'X-Rl')
+    reset_in = _header_number(headers, 'X-Ttl')
+    if remaining is None:
+        remaining = _header_number(headers, 'X-RateLimit-Remaining')
+        reset_at = _header_number(headers, 'X-RateLimit-Reset')
+        if reset_at is not None:
+            reset_in = max(0.0, reset_at - time.time())
+    retry_after = _retry_after_seconds(headers)
+    if remaining is None and retry_after is None and response.status_code != 429:
+        return
+
+    with _bucket_cond:
+        bucket = _get_bucket(name)
+        now = time.monotonic()
+        _refill(bucket, now)
+        if remaining is not None:
+            # Only ever lower the count: the server measured remaining before requests still in
+            # flight on other threads, so raising tokens to it would hand their tokens back
+            bucket['tokens'] = min(bucket['tokens'], remaining)
+            if remaining <= 0 and reset_in is not None:
+                bucket['blocked_until'] = max(bucket['blocked_until'], now + reset_in)
+        if response.status_code == 429:
+            wait = retry_after if retry_after is not None else reset_in
+            if wait is None:
+                wait = random.uniform(RETRY_BACKOFF_BASE, RETRY_BACKOFF_MAX)
+            bucket['tokens'] = 0.0
+            bucket['blocked_until'] = max(bucket['blocked_until'], now + wait)
+        _bucket_cond.notify_all()
+
+
+def _retry_delay(attempt, response=None):
+    """Full-jitter exponential backoff, or the server's Retry-After when it gives one."""
+    if response is not None:
+        retry_after = _retry_after_seconds(response.headers)
+        if retry_after is not None:
+            return min(retry_after, RETRY_BACKOFF_MAX)
+    return random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** attempt))
+
+
+def request(method, url, timeout=None, retries=MAX_RETRIES, max_wait=DEFAULT_RATE_LIMIT_MAX_WAIT, **kwargs):
+    """Send a request through the shared session, retrying transient failures.
+
+    Calls to rate-limited providers (RATE_LIMIT_RULES) first wait for a token from their
+    bucket, for at most max_wait seconds (see acquire_rate_limit). timeout defaults to (DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT); a single
+    number applies to both. Responses with RETRY_STATUSES are retried and the last one is
+    returned as-is, so callers still check status codes. Raises requests.RequestException
+    when every attempt failed at the network level, or RateLimitExceeded.
+    """
+    if timeout is None:
+        timeout = (DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT)
+    session = get_session()
+    bucket = _bucket_for(url)
+    for attempt in range(retries + 1):
+        if bucket:
+            acquire_rate_limit(bucket, max_wait)
+        try:
+            response = session.request(method, url, timeout=timeout, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            if attempt == retries:
+                raise
+            time.sleep(_retry_delay(attempt))
+            continue
+        if bucket:
+            _apply_rate_limit_headers(bucket, response)
+        if response.status_code not in RETRY_STATUSES or attempt == retries:
+            return response
+        response.close()  # Hand the connection back to the pool before waiting
+        if response.status_code == 429 and bucket:
+            continue  # The bucket now holds every caller until the quota resets
+        time.sleep(_retry_delay(attempt, response))
+
+
+def get(url, **kwargs):
+    """GET through the shared session. See request()."""
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    """POST through the shared session. See request()."""
+    return request("POST", url, **kwargs)
+
+
+__all__ = [
+    'USER_AGENT', 'DEFAULT_CONNECT_TIMEOUT', 'DEFAULT_READ_TIMEOUT', 'MAX_RETRIES',
+    'RATE_LIMIT_RULES', 'DEFAULT_RATE_LIMIT_MAX_WAIT', 'RateLimitExceeded',
+    'get_session', 'close_session', 'acquire_rate_limit', 'request', 'get', 'post'
+]
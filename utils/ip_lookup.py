@@ -3,6 +3,11 @@ import json
 import time
 import sys
 import re
+import os
+import csv
+import io
+import ipaddress
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Rich imports
 from rich.console import Console
@@ -10,7 +15,7 @@ from rich.table import Table
 from rich.panel import Panel
 from rich.align import Align
 from rich.text import Text
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
 from rich.prompt import Prompt
 from rich.box import DOUBLE
 
@@ -20,21 +25,49 @@ from utils.helpers import (
     MAIN_STYLE, HIGHLIGHT_STYLE, HACKER_GREEN, BORDER_STYLE
 )
 from datetime import datetime
+from utils import http_client
+from utils import lookup_cache
+from utils import geoip_offline
 
 API_URL_BASE = "https://api.ipquery.io/"  # Base URL without IP
 
-def lookup_ip_detailed(ip_address):
-    """Looks up detailed IP information using ipquery.io (JSON format).
+# --- Bulk Lookup Configuration ---
+IPQUERY_BATCH_SIZE = 100  # IPs per multi-IP request (comma separated in the URL path)
+IP_API_BATCH_URL = "http://ip-api.com/batch"
+IP_API_BATCH_SIZE = 100  # Hard limit of the ip-api.com batch endpoint (15 requests per minute)
+IP_API_BATCH_FIELDS = "status,message,country,countryCode,regionName,city,zip,lat,lon,timezone,isp,org,as,query"
+BULK_LOOKUP_WORKERS = 8  # Concurrent batch requests / single-IP fallbacks
+BULK_RATE_LIMIT_MAX_WAIT = 90  # Bulk runs show progress, so batches may wait out a full ip-api quota window
+BULK_DISPLAY_LIMIT = 200  # Rows shown on screen; exports always contain everything
+BULK_PROVIDERS = ["ipquery", "ip-api"]  # Plus "offline" when a local GeoIP database is configured
+BULK_FIELDS = ["ip", "country", "country_code", "region", "city", "isp", "org", "asn", "error"]
+# --- End Configuration ---
+
+def lookup_ip_detailed(ip_address, use_cache=True):
+    """Looks up detailed IP information using ipquery.io, answering from the lookup cache when possible.
+       Returns a dict: {"data": parsed_dict|None, "error": str|None, "raw_text": str|None, "cached": bool}
+    """
+    if use_cache:
+        entry = lookup_cache.get_cached_lookup("ipquery", ip_address)
+        if entry is not None:
+            raw_text = json.dumps(entry["data"], indent=4) if entry["data"] is not None else None
+            return {"data": entry["data"], "error": entry["error"], "raw_text": raw_text, "cached": True}
+    result = _fetch_ip_detailed(ip_address)
+    lookup_cache.store_lookup("ipquery", ip_address, result["data"], result["error"])
+    result["cached"] = False
+    return result
+
+def _fetch_ip_detailed(ip_address):
+    """Queries ipquery.io for one IP (JSON format).
        Returns a dict: {"data": parsed_dict|None, "error": str|None, "raw_text": str|None}
     """
     url = f"{API_URL_BASE}{ip_address}"
-    headers = {'User-Agent': 'TarsUtilitiesTool/1.0'}
     result = {"data": None, "error": None, "raw_text": None}
     raw_response_text = None
     response = None
 
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_client.get(url)
         try:
             raw_response_text = response.text
         except Exception as e_read:
@@ -178,6 +211,8 @@ def display_detailed_ip_info():
     else:
         console.print(Align.center(Text(f"Could not retrieve valid information for '{ip_input}'.", style="bold red")))
 
+    source = "served from cache" if lookup_result.get("cached") else "fetched from ipquery.io"
+    console.print(Align.center(Text(f"Result {source}. {lookup_cache.format_cache_stats()}", style="dim")))
     console.print()
 
     if raw_text_to_save:
@@ -188,3 +223,288 @@ def display_detailed_ip_info():
     instruction = Text("Press any key to return...", style=MAIN_STYLE)
     console.print(Align.center(instruction))
     while get_key() is None: time.sleep(0.1)
+
+
+def parse_ip_list(text):
+    """Pull IP addresses out of free text (pasted lists, files, log lines).
+
+    Returns (unique_ips, skipped_count). Order of first appearance is kept and
+    equivalent spellings (e.g. compressed/expanded IPv6) are deduplicated.
+    """
+    seen = set()
+    ips = []
+    skipped = 0
+    for token in re.split(r"[\s,;|]+", text):
+        token = token.strip("()<>\"'")
+        bracketed = re.fullmatch(r"\[([0-9A-Fa-f:.]+)\](?::\d+)?", token)
+        if bracketed:
+            token = bracketed.group(1)  # [IPv6]:port, as in URLs and logs
+        token = token.strip("[]")
+        if token.count(":") == 1:
+            token = token.split(":")[0]  # IPv4 with a port, as seen in logs
+        if not token:
+            continue
+        try:
+            address = ipaddress.ip_address(token)
+        except ValueError:
+            skipped += 1
+            continue
+        normalized = str(address)
+        if normalized not in seen:
+            seen.add(normalized)
+            ips.append(normalized)
+    return ips, skipped
+
+
+def _normalize_ipquery(data, ip):
+    """Flatten an ipquery.io record into the shared bulk row shape."""
+    isp = data.get("isp") or {}
+    location = data.get("location") or {}
+    return {
+        "ip": ip, "country": location.get("country"), "country_code": location.get("country_code"),
+        "region": location.get("state"), "city": location.get("city"), "isp": isp.get("isp"),
+        "org": isp.get("org"), "asn": isp.get("asn"), "error": None,
+    }
+
+
+def _normalize_ip_api(data, ip):
+    """Flatten an ip-api.com record into the shared bulk row shape."""
+    if data.get("status") != "success":
+        return _error_row(ip, data.get("message", "Lookup failed"))
+    asn = (data.get("as") or "").split(" ", 1)[0] or None
+    return {
+        "ip": ip, "country": data.get("country"), "country_code": data.get("countryCode"),
+        "region": data.get("regionName"), "city": data.get("city"), "isp": data.get("isp"),
+        "org": data.get("org"), "asn": asn, "error": None,
+    }
+
+
+def _error_row(ip, message):
+    row = {field: None for field in BULK_FIELDS}
+    row.update(ip=ip, error=message)
+    return row
+
+
+def lookup_ipquery_batch(ips):
+    """Look up several IPs in one ipquery.io request. Returns {ip: record}; raises RequestException."""
+    response = http_client.get(f"{API_URL_BASE}{','.join(ips)}", params={"format": "json"},
+                               timeout=(http_client.DEFAULT_CONNECT_TIMEOUT, 30), max_wait=BULK_RATE_LIMIT_MAX_WAIT)
+    response.raise_for_status()
+    records = response.json()
+    if isinstance(records, dict):  # A single IP comes back as a bare object
+        records = [records]
+    results = {}
+    for record in records:
+        if isinstance(record, dict) and record.get("ip"):
+            results[str(ipaddress.ip_address(record["ip"]))] = record
+    return results
+
+
+def _ipquery_batch_or_halves(ips):
+    """Run one ipquery batch. Returns ({ip: record}, {ip: error message}).
+
+    A batch the server rejects (4xx other than 429) is split in halves so one bad entry
+    cannot sink the rest. Network-level failures, which the HTTP client has already retried,
+    fail the whole batch instead of becoming one request per IP during an outage.
+    """
+    try:
+        return lookup_ipquery_batch(ips), {}
+    except requests.exceptions.HTTPError as e:
+        status = e.response.status_code if e.response is not None else None
+        if len(ips) > 1 and status is not None and 400 <= status < 500 and status != 429:
+            half = len(ips) // 2
+            found, failed = _ipquery_batch_or_halves(ips[:half])
+            more_found, more_failed = _ipquery_batch_or_halves(ips[half:])
+            found.update(more_found)
+            failed.update(more_failed)
+            return found, failed
+        error = f"Batch request failed: {e}"
+    except (requests.exceptions.RequestException, ValueError) as e:
+        error = f"Batch request failed: {e}"
+    return {}, {ip: error for ip in ips}
+
+
+def lookup_ip_api_batch(ips):
+    """Look up up to IP_API_BATCH_SIZE IPs in one ip-api.com batch request.
+
+    Returns {ip: record}. Pacing to the free tier's 15 batches per minute is done by the
+    shared HTTP client's rate limiter. Raises RequestException.
+    """
+    response = http_client.post(IP_API_BATCH_URL, params={"fields": IP_API_BATCH_FIELDS},
+                                json=[{"query": ip} for ip in ips],
+                                timeout=(http_client.DEFAULT_CONNECT_TIMEOUT, 30), max_wait=BULK_RATE_LIMIT_MAX_WAIT)
+    response.raise_for_status()
+    return dict(zip(ips, response.json()))
+
+
+def _ip_api_entry(record):
+    """Cache entry for an ip-api.com record; its 'fail' answers are cached as errors."""
+    if record.get("status") != "success":
+        return {"data": None, "error": record.get("message", "Lookup failed")}
+    return {"data": record, "error": None}
+
+
+def _row_from_entry(provider, ip, entry):
+    """Turn a cache entry into a bulk row."""
+    if entry["error"] is not None or not entry["data"]:
+        return _error_row(ip, entry["error"] or "No data returned")
+    if provider == "ip-api":
+        return _normalize_ip_api(entry["data"], ip)
+    return _normalize_ipquery(entry["data"], ip)
+
+
+def _lookup_single(ip):
+    """Per-IP fallback used for whatever a batch request did not answer."""
+    result = lookup_ip_detailed(ip)
+    return _row_from_entry("ipquery", ip, result)
+
+
+def _offline_row(ip):
+    """Bulk row from the local GeoIP database(s)."""
+    found = geoip_offline.lookup_offline(ip)
+    if found is None:
+        return _error_row(ip, "Not in offline database")
+    return {field: found.get(field) for field in BULK_FIELDS}
+
+
+def bulk_lookup(ips, provider="ipquery", on_progress=None):
+    """Enrich many IPs using the provider's batch endpoint, in chunks within its limits.
+
+    Cached answers are served first and only the misses are sent out. ipquery batches run
+    concurrently; a rejected batch is retried in halves, a failed one fails as a whole, and
+    only IPs missing from a successful answer are retried one by one on the same pool. ip-api
+    batches run back to back, paced by the HTTP client's rate limiter (15 per minute).
+    The "offline" provider answers everything from the local GeoIP database(s) instead.
+    on_progress(done_count) is called as results arrive. Returns rows in input order.
+    """
+    if provider == "offline":
+        rows = []
+        for ip in ips:
+            rows.append(_offline_row(ip))
+            if on_progress and len(rows) % 1000 == 0:
+                on_progress(len(rows))
+        if on_progress:
+            on_progress(len(rows))
+        return rows
+
+    results = {ip: _row_from_entry(provider, ip, entry)
+               for ip, entry in lookup_cache.get_cached_lookups(provider, ips).items()}
+    pending = [ip for ip in ips if ip not in results]
+
+    def report():
+        if on_progress:
+            on_progress(len(results))
+    report()
+
+    if provider == "ip-api":
+        for start in range(0, len(pending), IP_API_BATCH_SIZE):
+            chunk = pending[start:start + IP_API_BATCH_SIZE]
+            try:
+                batch = lookup_ip_api_batch(chunk)
+                entries = {ip: _ip_api_entry(batch[ip]) if ip in batch else
+                           {"data": None, "error": "Missing from batch response"} for ip in chunk}
+            except (requests.exceptions.RequestException, ValueError) as e:
+                entries = {ip: {"data": None, "error": f"Batch request failed: {e}"} for ip in chunk}
+            lookup_cache.store_lookups(provider, entries)
+            results.update((ip, _row_from_entry(provider, ip, entry)) for ip, entry in entries.items())
+            report()
+        return [results[ip] for ip in ips]
+
+    chunks = [pending[start:start + IPQUERY_BATCH_SIZE] for start in range(0, len(pending), IPQUERY_BATCH_SIZE)]
+    with ThreadPoolExecutor(max_workers=BULK_LOOKUP_WORKERS, thread_name_prefix="bulk-lookup") as executor:
+        batch_futures = {executor.submit(_ipquery_batch_or_halves, chunk): chunk for chunk in chunks}
+        single_futures = []
+        for future in as_completed(batch_futures):
+            chunk = batch_futures[future]
+            batch, failed = future.result()
+            entries = {ip: {"data": batch[ip], "error": None} for ip in chunk if ip in batch}
+            entries.update((ip, {"data": None, "error": error}) for ip, error in failed.items())
+            lookup_cache.store_lookups(provider, entries)
+            results.update((ip, _row_from_entry(provider, ip, entry)) for ip, entry in entries.items())
+            # Singles only for IPs a successful batch answer left out
+            single_futures.extend(executor.submit(_lookup_single, ip) for ip in chunk if ip not in entries)
+            report()
+        for future in as_completed(single_futures):
+            row = future.result()
+            results[row["ip"]] = row
+            report()
+    return [results[ip] for ip in ips]
+
+
+def format_bulk_results(rows, output_format):
+    """Serialize bulk rows as 'csv' or 'jsonl'."""
+    if output_format == "jsonl":
+        return "\n".join(json.dumps(row, ensure_ascii=False) for row in rows) + "\n"
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=BULK_FIELDS)
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+def display_bulk_ip_lookup():
+    """Prompts for a file or pasted list of IPs and enriches them all in bulk."""
+    clear_screen(); print_banner()
+    title = Text("Bulk IP Lookup", style=f"bold {HACKER_GREEN}")
+    console.print(Align.center(title)); console.print()
+
+    prompt_text = Text("Enter a path to a file containing IPs (one per line, logs are fine), or paste IPs separated by commas/spaces:", style=MAIN_STYLE)
+    console.print(Align.center(prompt_text))
+    console.print()
+    source = Prompt.ask("[bold]File or IP list[/bold]").strip()
+    if not source or source.lower() == "back":
+        clear_screen(); return
+
+    path = os.path.expanduser(source.strip('"'))
+    if os.path.isfile(path):
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                text = f.read()
+        except OSError as e:
+            console.print(Align.center(Text(f"Could not read '{path}': {e}", style="bold red")))
+            time.sleep(2)
+            clear_screen(); return
+    else:
+        text = source
+
+    ips, skipped = parse_ip_list(text)
+    if not ips:
+        console.print(Align.center(Text("No valid IP addresses found.", style="bold red")))
+        time.sleep(2)
+        clear_screen(); return
+    console.print(Align.center(Text(f"{len(ips)} unique IP(s) found ({skipped} other token(s) ignored).", style="dim")))
+
+    providers = BULK_PROVIDERS + (["offline"] if geoip_offline.offline_available() else [])
+    provider = Prompt.ask("[bold]Provider[/bold]", choices=providers, default=providers[0])
+    console.print()
+
+    started = time.monotonic()
+    with Progress(SpinnerColumn(), TextColumn("Looking up IPs..."), BarColumn(),
+                  TextColumn("{task.completed}/{task.total}"), transient=True, console=console) as progress:
+        task = progress.add_task("", total=len(ips))
+        rows = bulk_lookup(ips, provider, on_progress=lambda done: progress.update(task, completed=done))
+    elapsed = time.monotonic() - started
+
+    failed = sum(1 for row in rows if row["error"])
+    table = Table(title=f"[bold {HACKER_GREEN}]Bulk Lookup Results ({len(rows) - failed}/{len(rows)} resolved via {provider} in {elapsed:.1f}s)[/bold {HACKER_GREEN}]",
+                  box=DOUBLE, border_style=BORDER_STYLE, header_style=f"bold {HACKER_GREEN}")
+    for column in ("IP", "Country", "Region", "City", "ISP / Org", "ASN"):
+        table.add_column(column, style=MAIN_STYLE)
+    for row in rows[:BULK_DISPLAY_LIMIT]:
+        if row["error"]:
+            table.add_row(row["ip"], Text(row["error"], style="red"), "", "", "", "")
+            continue
+        table.add_row(row["ip"], str(row["country"] or "N/A"), str(row["region"] or "N/A"),
+                      str(row["city"] or "N/A"), str(row["isp"] or row["org"] or "N/A"), str(row["asn"] or "N/A"))
+    console.print(Align.center(table))
+    if len(rows) > BULK_DISPLAY_LIMIT:
+        console.print(Align.center(Text(f"Showing the first {BULK_DISPLAY_LIMIT} of {len(rows)} results; save to a file for the full set.", style="dim")))
+    console.print(Align.center(Text(lookup_cache.format_cache_stats(), style="dim")))
+    console.print()
+
+    output_format = Prompt.ask("[bold]Save format[/bold]", choices=["csv", "jsonl"], default="csv")
+    save_output_to_file(lambda: format_bulk_results(rows, output_format), "bulk_ip_lookup", output_format)
+
+    instruction = Text("Press any key to return...", style=MAIN_STYLE)
+    console.print(Align.center(instruction))
+    while get_key() is None: time.sleep(0.1)
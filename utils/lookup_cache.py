@@ -0,0 +1,206 @@
+import os
+import json
+import time
+import sqlite3
+import ipaddress
+import threading
+from collections import OrderedDict
+
+from utils.sqlite_cache import cache_db
+
+# --- Cache Configuration ---
+LOOKUP_CACHE_FILE = os.path.join(os.path.expanduser("~"), "TarsUtilitiesTool", "lookup_cache.sqlite3")
+PROVIDER_TTLS = {
+    'ip-api': 24 * 3600,  # Seconds a successful answer is reused, per provider
+    'ipquery': 24 * 3600,
+}
+DEFAULT_LOOKUP_TTL = 24 * 3600
+NEGATIVE_LOOKUP_TTL = 300  # Errors and timeouts are remembered briefly so retries do not hammer the API
+MEMORY_CACHE_SIZE = 4096  # Entries kept in the in-process LRU in front of SQLite
+LOOKUP_CACHE_MAX_ENTRIES = 100000  # Least recently used entries are evicted beyond this
+_SQLITE_IN_CHUNK = 500  # Stay well under SQLite's bound-parameter limit
+# --- End Configuration ---
+
+_cache_lock = threading.Lock()
+_memory_cache = OrderedDict()  # (provider, key) -> (expires_at, entry)
+_pending_touches = {}  # (provider, key) -> time of a memory hit not yet written to last_access on disk
+_stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+
+
+def normalize_query(query):
+    """Canonical cache key for an IP or hostname: compressed IP text or lower-case name."""
+    query = query.strip()
+    try:
+        return str(ipaddress.ip_address(query))
+    except ValueError:
+        return query.lower().rstrip('.')
+
+
+def _ttl(provider, entry):
+    if entry.get('error') is not None:
+        return NEGATIVE_LOOKUP_TTL
+    return PROVIDER_TTLS.get(provider, DEFAULT_LOOKUP_TTL)
+
+
+def _create_schema(conn):
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS lookup_cache ("
+        " provider TEXT NOT NULL,"
+        " query TEXT NOT NULL,"
+        " entry TEXT NOT NULL,"
+        " expires_at REAL NOT NULL,"
+        " last_access REAL NOT NULL DEFAULT 0,"
+        " PRIMARY KEY (provider, query))"
+    )
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(lookup_cache)")}
+    if 'last_access' not in columns:  # Cache files written before LRU eviction
+        conn.execute("ALTER TABLE lookup_cache ADD COLUMN last_access REAL NOT NULL DEFAULT 0")
+    conn.execute("CREATE INDEX IF NOT EXISTS lookup_cache_expiry ON lookup_cache (expires_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS lookup_cache_lru ON lookup_cache (last_access)")
+
+
+def _flush_touches(conn):
+    """Write pending last_access updates from memory hits. Caller holds _cache_lock and commits."""
+    if _pending_touches:
+        conn.executemany("UPDATE lookup_cache SET last_access = ? WHERE provider = ? AND query = ?",
+                         [(accessed, provider, key) for (provider, key), accessed in _pending_touches.items()])
+        _pending_touches.clear()
+
+
+def _remember(provider, key, expires_at, entry):
+    """Put an entry in the memory LRU. Caller holds _cache_lock."""
+    _memory_cache[(provider, key)] = (expires_at, entry)
+    _memory_cache.move_to_end((provider, key))
+    while len(_memory_cache) > MEMORY_CACHE_SIZE:
+        _memory_cache.popitem(last=False)
+
+
+def get_cached_lookups(provider, queries):
+    """Look up many queries at once. Returns {normalized_query: entry} for the hits.
+
+    An entry is {'data': ..., 'error': None} for a cached answer or {'data': None,
+    'error': message} for a cached failure. Memory is checked first; the rest is fetched
+    from SQLite in a handful of IN (...) queries and promoted into memory. Every hit
+    refreshes the entry's last_access, which disk eviction orders by; memory hits are
+    written back the next time the database is opened anyway.
+    """
+    now = time.time()
+    hits = {}
+    with _cache_lock:
+        missing = []
+        for key in dict.fromkeys(normalize_query(q) for q in queries):
+            cached = _memory_cache.get((provider, key))
+            if cached and cached[0] > now:
+                _memory_cache.move_to_end((provider, key))
+                _pending_touches[(provider, key)] = now
+                hits[key] = cached[1]
+                _stats['memory_hits'] += 1
+            else:
+                missing.append(key)
+        if missing:
+            with cache_db(LOOKUP_CACHE_FILE, _create_schema) as conn:
+                if conn is not None:
+                    try:
+                        for start in range(0, len(missing), _SQLITE_IN_CHUNK):
+                            chunk = missing[start:start + _SQLITE_IN_CHUNK]
+                            rows = conn.execute(
+                                "SELECT query, entry, expires_at FROM lookup_cache"
+                                f" WHERE provider = ? AND expires_at > ? AND query IN ({','.join('?' * len(chunk))})",
+                                (provider, now, *chunk)
+                            ).fetchall()
+                            for key, entry_text, expires_at in rows:
+                                entry = json.loads(entry_text)
+                                hits[key] = entry
+                                _remember(provider, key, expires_at, entry)
+                                _pending_touches[(provider, key)] = now
+                                _stats['disk_hits'] += 1
+                        _flush_touches(conn)
+                        conn.commit()
+                    except (sqlite3.Error, ValueError):
+                        pass
+        _stats['misses'] += sum(1 for key in missing if key not in hits)
+    return hits
+
+
+def get_cached_lookup(provider, query):
+    """Return the cached entry for one query (see get_cached_lookups), or None on a miss."""
+    return get_cached_lookups(provider, [query]).get(normalize_query(query))
+
+
+def store_lookups(provider, entries):
+    """Cache many answers at once. entries is {query: {'data': ..., 'error': ...}}."""
+    now = time.time()
+    rows = []
+    with _cache_lock:
+        for query, entry in entries.items():
+            key = normalize_query(query)
+            entry = {'data': entry.get('data'), 'error': entry.get('error')}
+            expires_at = now + _ttl(provider, entry)
+            _remember(provider, key, expires_at, entry)
+            rows.append((provider, key, json.dumps(entry), expires_at, now))
+            _pending_touches.pop((provider, key), None)
+        if not rows:
+            return
+        with cache_db(LOOKUP_CACHE_FILE, _create_schema) as conn:
+            if conn is None:
+                return
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO lookup_cache (provider, query, entry, expires_at, last_access)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+                _flush_touches(conn)
+                conn.execute("DELETE FROM lookup_cache WHERE expires_at <= ?", (now,))
+                count = conn.execute("SELECT COUNT(*) FROM lookup_cache").fetchone()[0]
+                if count > LOOKUP_CACHE_MAX_ENTRIES:
+                    conn.execute(
+                        "DELETE FROM lookup_cache WHERE rowid IN"
+                        " (SELECT rowid FROM lookup_cache ORDER BY last_access ASC LIMIT ?)",
+                        (count - LOOKUP_CACHE_MAX_ENTRIES,)
+                    )
+                conn.commit()
+            except (sqlite3.Error, TypeError, ValueError):
+                pass
+
+
+def store_lookup(provider, query, data=None, error=None):
+    """Cache one answer, or one failure when error is given (kept for NEGATIVE_LOOKUP_TTL)."""
+    store_lookups(provider, {query: {'data': data, 'error': error}})
+
+
+def get_cache_stats():
+    """Hit/miss counters for this session plus the number of entries held in memory."""
+    with _cache_lock:
+        stats = dict(_stats)
+        stats['memory_entries'] = len(_memory_cache)
+    stats['hits'] = stats['memory_hits'] + stats['disk_hits']
+    return stats
+
+
+def format_cache_stats():
+    """One-line summary of get_cache_stats() for display under lookup results."""
+    stats = get_cache_stats()
+    total = stats['hits'] + stats['misses']
+    rate = stats['hits'] / total * 100 if total else 0.0
+    return (f"Lookup cache: {stats['hits']} hit(s) ({stats['memory_hits']} memory, "
+            f"{stats['disk_hits']} disk), {stats['misses']} miss(es), {rate:.0f}% hit rate this session")
+
+
+def clear_lookup_cache():
+    """Remove every cached lookup, in memory and on disk."""
+    with _cache_lock:
+        _memory_cache.clear()
+        _pending_touches.clear()
+        with cache_db(LOOKUP_CACHE_FILE, _create_schema) as conn:
+            if conn is None:
+                return
+            conn.execute("DELETE FROM lookup_cache")
+            conn.commit()
+
+
+__all__ = [
+    'LOOKUP_CACHE_FILE', 'PROVIDER_TTLS', 'DEFAULT_LOOKUP_TTL', 'NEGATIVE_LOOKUP_TTL',
+    'MEMORY_CACHE_SIZE', 'normalize_query', 'get_cached_lookups', 'get_cached_lookup',
+    'store_lookups', 'store_lookup', 'get_cache_stats', 'format_cache_stats', 'clear_lookup_cache'
+]
@@ -1,5 +1,5 @@
 import socket
-import urllib.request
+import requests
 import json
 import re
 import time
@@ -7,6 +7,12 @@ import sys
 import os
 import platform
 import subprocess
+import ipaddress
+import queue
+import threading
+import psutil
+from concurrent.futures import ThreadPoolExecutor, wait, as_completed, FIRST_COMPLETED
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from datetime import datetime
 
 # Rich imports
@@ -14,25 +20,108 @@ from rich.console import Console
 from rich.table import Table
 from rich.align import Align
 from rich.text import Text
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
 from rich.prompt import Prompt
 from rich.box import DOUBLE
 from rich.panel import Panel
-
-# WHOIS import
-try:
-    import whois
-except ImportError:
-    whois = None
+from rich.live import Live
+from rich.console import Group
 
 # Local imports
 from utils.helpers import (
     clear_screen, print_banner, get_key, console, save_output_to_file,
     MAIN_STYLE, HIGHLIGHT_STYLE, HACKER_GREEN, BORDER_STYLE
 )
+from utils import port_scanner
+from utils import whois_cache
+from utils import whois_client
+from utils import traceroute_engine
+from utils import http_client
+from utils import lookup_cache
+from utils import geoip_offline
+
+# --- Traceroute Enrichment Configuration ---
+HOP_ENRICH_WORKERS = 8  # Concurrent WHOIS/reverse-DNS lookups
+HOP_ENRICH_DEADLINE = 8.0  # Seconds a single hop lookup may run before it is abandoned
+WHOIS_TIMEOUT = 5.0  # Per-request timeout for each WHOIS server queried
+TRACEROUTE_TIMEOUT = 120  # Seconds before a running traceroute command is killed
+# --- End Configuration ---
+
+# --- External IP Discovery Configuration ---
+EXTERNAL_IP_PROVIDERS = [  # Queried concurrently; the first valid answer wins
+    "https://api.ipify.org",
+    "https://ifconfig.me/ip",
+    "https://icanhazip.com",
+    "https://checkip.amazonaws.com",
+]
+EXTERNAL_IP_TIMEOUT = 3  # Seconds each provider gets
+# --- End Configuration ---
+
+# Same field set as the bulk lookup's ip-api batches, so cached answers are interchangeable
+IP_API_FIELDS = "status,message,country,countryCode,regionName,city,zip,lat,lon,timezone,isp,org,as,query"
+
+def get_interface_addresses():
+    """List every IPv4/IPv6 address on every NIC as dicts (interface, family, address, netmask, is_up)."""
+    stats = psutil.net_if_stats()
+    rows = []
+    for interface, addresses in psutil.net_if_addrs().items():
+        is_up = stats[interface].isup if interface in stats else None
+        for addr in addresses:
+            if addr.family not in (socket.AF_INET, socket.AF_INET6):
+                continue
+            rows.append({
+                "interface": interface,
+                "family": "IPv6" if addr.family == socket.AF_INET6 else "IPv4",
+                "address": addr.address,
+                "netmask": addr.netmask or "",
+                "is_up": is_up,
+            })
+    rows.sort(key=lambda row: (row["interface"], row["family"]))
+    return rows
+
+
+def get_primary_local_ip(family=socket.AF_INET):
+    """Source address the OS would use for outbound traffic. A UDP connect() sends no packets."""
+    probe = ("8.8.8.8", 80) if family == socket.AF_INET else ("2001:4860:4860::8888", 80)
+    try:
+        with socket.socket(family, socket.SOCK_DGRAM) as s:
+            s.connect(probe)
+            return s.getsockname()[0]
+    except OSError:
+        return None
+
+
+def _fetch_external_ip(url):
+    response = http_client.get(url, timeout=EXTERNAL_IP_TIMEOUT, retries=0)
+    response.raise_for_status()
+    return str(ipaddress.ip_address(response.text.strip()))  # Rejects captive-portal HTML and the like
+
+
+def discover_external_ip(providers=None, timeout=EXTERNAL_IP_TIMEOUT):
+    """Ask every provider at once and return (ip, provider_url) from the first valid answer.
+
+    Returns (None, error_text) if none answered within the timeout. Slow providers are left
+    to finish in the background instead of being waited for.
+    """
+    providers = providers or EXTERNAL_IP_PROVIDERS
+    executor = ThreadPoolExecutor(max_workers=len(providers), thread_name_prefix="external-ip")
+    futures = {executor.submit(_fetch_external_ip, url): url for url in providers}
+    errors = []
+    try:
+        for future in as_completed(futures, timeout=timeout + 1):
+            try:
+                return future.result(), futures[future]
+            except (requests.exceptions.RequestException, ValueError) as e:
+                errors.append(type(e).__name__)
+    except FuturesTimeoutError:
+        errors.append("Timeout")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return None, f"No provider answered ({', '.join(sorted(set(errors))) or 'Timeout'})"
+
 
 def show_my_ip():
-    """Display the local IP address and computer name."""
+    """Display the computer name, every interface address and the external IP."""
     clear_screen(); print_banner()
     title = Text("My IP Address", style=f"bold {HACKER_GREEN}")
     console.print(Align.center(title)); console.print()
@@ -40,34 +129,29 @@ def show_my_ip():
     hostname = "N/A"
     local_ip = "N/A"
     external_ip = "N/A"
+    interfaces = []
 
     with Progress(SpinnerColumn(), TextColumn("Gathering IP information..."), transient=True, console=console) as progress:
         progress.add_task("", total=None)
+        # External discovery is the slow part, so it runs while local information is gathered
+        external_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="external-ip-race")
+        external_future = external_executor.submit(discover_external_ip)
+        external_executor.shutdown(wait=False)
         try:
             hostname = socket.gethostname()
-            try:
-                local_ip = socket.gethostbyname(hostname)
-            except socket.gaierror:
-                try:
-                    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                    s.settimeout(1.0)
-                    s.connect(("8.8.8.8", 80))
-                    local_ip = s.getsockname()[0]
-                    s.close()
-                except Exception:
-                    local_ip = "N/A (Fallback failed)"
-            try:
-                req = urllib.request.Request("https://api.ipify.org", headers={'User-Agent': 'Mozilla/5.0'})
-                with urllib.request.urlopen(req, timeout=3) as response:
-                    external_ip = response.read().decode('utf-8')
-            except Exception as ext_e:
-                external_ip = f"Error or Timeout ({type(ext_e).__name__})"
+            local_ip = get_primary_local_ip() or get_primary_local_ip(socket.AF_INET6) or "N/A (No default route)"
+            interfaces = get_interface_addresses()
         except Exception as e:
             console.print(Align.center(Text(f"Error retrieving host/IP info: {str(e)}", style="bold red")))
+        address, provider = external_future.result()
+        if address:
+            external_ip = f"{address} (via {provider.split('//', 1)[-1].split('/', 1)[0]})"
+        else:
+            external_ip = provider
 
     ip_info_data = {
         "Computer Name": hostname,
-        "Local IP Address": local_ip,
+        "Primary Local IP": local_ip,
         "External IP Address": external_ip
     }
 
@@ -79,11 +163,30 @@ def show_my_ip():
     console.print(Align.center(table))
     console.print()
 
+    if interfaces:
+        iface_table = Table(box=DOUBLE, border_style=BORDER_STYLE, header_style=f"bold {HACKER_GREEN}",
+                            title=f"[{HACKER_GREEN}]Network Interfaces[/{HACKER_GREEN}]")
+        iface_table.add_column("Interface", style=MAIN_STYLE)
+        iface_table.add_column("Family", style=MAIN_STYLE)
+        iface_table.add_column("Address", style=MAIN_STYLE)
+        iface_table.add_column("Netmask", style=MAIN_STYLE)
+        iface_table.add_column("Status", style=MAIN_STYLE)
+        for row in interfaces:
+            status = "Up" if row["is_up"] else ("Down" if row["is_up"] is not None else "Unknown")
+            iface_table.add_row(row["interface"], row["family"], row["address"], row["netmask"],
+                                Text(status, style=MAIN_STYLE if row["is_up"] else "dim"))
+        console.print(Align.center(iface_table))
+        console.print()
+
     def generate_save_content():
         lines = [f"IP Information ({datetime.now().strftime('%Y-%m-%d %H:%M:%S')})"]
         lines.append("-" * 30)
         for key, value in ip_info_data.items():
             lines.append(f"{key}: {value}")
+        lines.append("")
+        lines.append("Interface\tFamily\tAddress\tNetmask\tUp")
+        for row in interfaces:
+            lines.append(f"{row['interface']}\t{row['family']}\t{row['address']}\t{row['netmask']}\t{row['is_up']}")
         return "\n".join(lines)
 
     save_output_to_file(generate_save_content, "my_ip_info")
@@ -123,22 +226,56 @@ def lookup_ip_info():
     ip_data = None
     error_message = None
 
-    with Progress(SpinnerColumn(), TextColumn(f"Looking up {ip_input}..."), transient=True, console=console) as progress:
-        progress.add_task("", total=None)
+    cached = lookup_cache.get_cached_lookup("ip-api", ip_input)
+    if cached is not None:
+        ip_data, error_message = cached["data"], cached["error"]
+    else:
+        with Progress(SpinnerColumn(), TextColumn(f"Looking up {ip_input}..."), transient=True, console=console) as progress:
+            progress.add_task("", total=None)
+            try:
+                url = f"http://ip-api.com/json/{requests.utils.quote(ip_input, safe='')}"
+                response = http_client.get(url, params={"fields": IP_API_FIELDS}, timeout=5)
+                response.raise_for_status()
+                # Parsed separately: requests' JSONDecodeError is also a RequestException
+                try:
+                    ip_data = response.json()
+                except ValueError:
+                    error_message = "Error decoding response from API."
+            except requests.exceptions.Timeout:
+                error_message = "Request timed out."
+            except requests.exceptions.RequestException as e:
+                error_message = f"Network error: {e}"
+            except Exception as e:
+                error_message = f"An unexpected error occurred: {type(e).__name__} - {e}"
+        if ip_data and ip_data.get("status") == "fail":
+            # Private ranges, bad queries: shown and cached exactly like any other error
+            error_message = f"API Error: {ip_data.get('message', 'Failed to retrieve information.')}"
+            ip_data = None
+        if ip_data and ip_data.get("status") == "success":
+            lookup_cache.store_lookup("ip-api", ip_input, data=ip_data)
+        else:
+            # Failures are cached briefly so retries do not hammer the API
+            lookup_cache.store_lookup("ip-api", ip_input, error=error_message or "Failed to retrieve information.")
+
+    offline_used = False
+    if error_message and geoip_offline.offline_available():
+        # Air-gapped or API unreachable: answer from the local GeoIP database instead
         try:
-            encoded_input = urllib.parse.quote(ip_input)
-            url = f"http://ip-api.com/json/{encoded_input}?fields=status,message,country,regionName,city,zip,lat,lon,timezone,isp,org,as,query"
-            req = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0'})
-            with urllib.request.urlopen(req, timeout=5) as response:
-                ip_data = json.load(response)
-        except urllib.error.URLError as e:
-            error_message = f"Network error: {e}"
-        except json.JSONDecodeError:
-            error_message = "Error decoding response from API."
-        except socket.timeout:
-            error_message = "Request timed out."
-        except Exception as e:
-            error_message = f"An unexpected error occurred: {type(e).__name__} - {e}"
+            offline = geoip_offline.lookup_offline(ip_input)
+        except ValueError:
+            offline = None  # Hostnames need the online API
+        if offline:
+            asn = " ".join(part for part in (offline['asn'], offline['org']) if part)
+            ip_data = {
+                'status': 'success', 'query': offline['ip'], 'country': offline['country'],
+                'countryCode': offline['country_code'], 'regionName': offline['region'],
+                'city': offline['city'], 'zip': None, 'lat': offline['latitude'],
+                'lon': offline['longitude'], 'timezone': offline['timezone'],
+                'isp': offline['isp'], 'org': offline['org'], 'as': asn or None,
+            }
+            ip_data = {key: value for key, value in ip_data.items() if value is not None}  # Missing shows as N/A
+            error_message = None
+            offline_used = True
 
     saved_content = None
     if error_message:
@@ -166,14 +303,15 @@ def lookup_ip_info():
             lines.append(f"{key}: {value}")
         saved_content = "\n".join(lines)
 
-    elif ip_data and ip_data.get("status") == "fail":
-        message = ip_data.get('message', 'Failed to retrieve information.')
-        console.print(Align.center(Text(f"API Error for '{ip_input}': {message}", style="bold red")))
-        saved_content = f"API Error for '{ip_input}': {message}"
     else:
         console.print(Align.center(Text(f"Could not retrieve valid information for '{ip_input}'.", style="bold red")))
         saved_content = f"Could not retrieve valid information for '{ip_input}'."
 
+    if offline_used:
+        source = "from the offline GeoIP database (ip-api.com unreachable)"
+    else:
+        source = "served from cache" if cached is not None else "fetched from ip-api.com"
+    console.print(Align.center(Text(f"Result {source}. {lookup_cache.format_cache_stats()}", style="dim")))
     console.print()
 
     if saved_content:
@@ -185,8 +323,8 @@ def lookup_ip_info():
     console.print(Align.center(instruction))
     while get_key() is None: time.sleep(0.1)
 
-def scan_open_ports(target, start_port=1, end_port=1024):
-    """Scan a target for open ports within a specified range."""
+def scan_open_ports(target, start_port=1, end_port=1024, concurrency=port_scanner.DEFAULT_SCAN_CONCURRENCY):
+    """Scan a target for open ports within a specified range using concurrent non-blocking connects."""
     clear_screen()
     print_banner()
     title = Text(f"Port Scan: {target} ({start_port}-{end_port})", style=f"bold {HACKER_GREEN}")
@@ -222,34 +360,22 @@ def scan_open_ports(target, start_port=1, end_port=1024):
         total_ports = end_port - start_port + 1
         task = progress.add_task("", total=total_ports, port=start_port)
 
-        for port in range(start_port, end_port + 1):
+        def on_result(port, is_open):
             progress.update(task, advance=1, port=port)
-            try:
-                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                    sock.settimeout(0.5)
-                    result = sock.connect_ex((target_ip, port))
-                    if result == 0:
-                        service_name = "[dim]Unknown[/dim]"
-                        try:
-                            if 1 <= port <= 65535:
-                                service_name = socket.getservbyport(port, 'tcp')
-                        except OSError:
-                            pass
-                        except OverflowError:
-                            service_name = "[dim]Invalid Port[/dim]"
-                        open_ports.append(port)
-                        open_ports_data.append((port, service_name))
-            except socket.timeout:
-                continue
-            except OSError as e:
-                console.print(f"\n[red]OS Error scanning port {port}: {e}[/red]")
-                if "Too many open files" in str(e):
-                    console.print("[yellow]Too many open files. Stopping scan. Try reducing the port range or check system limits.[/yellow]")
-                    break
-                continue
-            except Exception as e:
-                console.print(f"\n[red]Unexpected error scanning port {port}: {e}[/red]")
-                continue
+
+        try:
+            open_ports = port_scanner.scan_ports(target_ip, range(start_port, end_port + 1),
+                                                 concurrency=concurrency, on_result=on_result)
+        except OSError as e:
+            console.print(f"\n[red]OS Error during scan: {e}[/red]")
+            if "Too many open files" in str(e):
+                console.print("[yellow]Too many open files. Stopping scan. Try lowering the concurrency or check system limits.[/yellow]")
+        except Exception as e:
+            console.print(f"\n[red]Unexpected error during scan: {e}[/red]")
+
+    for port in open_ports:
+        service_name = port_scanner.get_service_name(port) or "[dim]Unknown[/dim]"
+        open_ports_data.append((port, service_name))
 
     console.print()
 
@@ -284,6 +410,110 @@ def scan_open_ports(target, start_port=1, end_port=1024):
 
     return [p[0] for p in open_ports_data]
 
+def batch_scan_ports(target_spec, port_spec, concurrency=port_scanner.DEFAULT_SCAN_CONCURRENCY,
+                     per_host_concurrency=port_scanner.DEFAULT_PER_HOST_CONCURRENCY):
+    """Scan many hosts/CIDR ranges against a port list, streaming results into one table."""
+    clear_screen()
+    print_banner()
+    title = Text(f"Batch Port Scan: {target_spec} ({port_spec})", style=f"bold {HACKER_GREEN}")
+    console.print(Align.center(title))
+    console.print()
+
+    try:
+        with Progress(SpinnerColumn(), TextColumn("Expanding targets..."), transient=True, console=console) as progress:
+            progress.add_task("", total=None)
+            ports = port_scanner.parse_port_spec(port_spec)
+            targets = port_scanner.expand_targets(target_spec)
+    except ValueError as e:
+        console.print(Align.center(Text(str(e), style="bold red")))
+        time.sleep(2)
+        clear_screen()
+        return {}
+
+    labels = {ip: label for label, ip in targets}
+    target_ips = [ip for _, ip in targets]
+    console.print(Align.center(Text(f"{len(target_ips)} host(s) x {len(ports)} port(s) = {len(target_ips) * len(ports)} probes", style="dim")))
+    console.print()
+
+    found = []  # (ip, port, service) in discovery order
+
+    def results_title(count):
+        return f"[bold {HACKER_GREEN}]Open Ports ({count} found)[/bold {HACKER_GREEN}]"
+
+    def add_result_row(table, ip, port_num, service_name):
+        host_label = labels.get(ip, ip)
+        table.add_row(host_label if host_label != ip else "", ip, str(port_num), service_name)
+
+    def build_results_table(rows):
+        table = Table(title=results_title(len(rows)), show_header=True, header_style=f"bold {HACKER_GREEN}",
+                      box=DOUBLE, border_style=BORDER_STYLE)
+        table.add_column("Host", style=MAIN_STYLE)
+        table.add_column("IP Address", style=MAIN_STYLE)
+        table.add_column("Port", style=MAIN_STYLE, justify="right")
+        table.add_column("Service (Common)", style=MAIN_STYLE)
+        for ip, port_num, service_name in rows:
+            add_result_row(table, ip, port_num, service_name)
+        return table
+
+    progress = Progress(
+        TextColumn("[bold cyan]Scanning {task.fields[target]}..."),
+        BarColumn(bar_width=40),
+        TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+        console=console
+    )
+    task = progress.add_task("", total=len(target_ips) * len(ports), target=target_ips[0])
+    results_table = build_results_table(found)
+
+    # The live table grows in place (one add_row per open port) and Live repaints it on its
+    # own timer, so the scan's event loop never waits on a rebuild
+    def on_result(ip, port, is_open):
+        progress.update(task, advance=1, target=f"{ip}:{port}")
+        if is_open:
+            service_name = port_scanner.get_service_name(port) or "[dim]Unknown[/dim]"
+            found.append((ip, port, service_name))
+            add_result_row(results_table, ip, port, service_name)
+            results_table.title = results_title(len(found))
+
+    with Live(Group(Align.center(results_table), progress), console=console,
+              refresh_per_second=4, transient=True) as live:
+        try:
+            port_scanner.scan_targets(target_ips, ports, concurrency=concurrency,
+                                      per_host_concurrency=per_host_concurrency, on_result=on_result)
+        except OSError as e:
+            live.console.print(f"[red]OS Error during scan: {e}[/red]")
+            if "Too many open files" in str(e):
+                live.console.print("[yellow]Too many open files. Stopping scan. Try lowering the concurrency or check system limits.[/yellow]")
+        except Exception as e:
+            live.console.print(f"[red]Unexpected error during scan: {e}[/red]")
+
+    found.sort(key=lambda row: (ipaddress.ip_address(row[0]), row[1]))
+    if found:
+        console.print(Align.center(build_results_table(found)))
+    else:
+        console.print(Align.center(Text(f"[bold yellow]No open ports found on {len(target_ips)} host(s) for ports {port_spec}.[/bold yellow]")))
+
+    console.print()
+
+    if found:
+        def generate_save_content():
+            lines = [f"Batch Port Scan Results for {target_spec} - Ports {port_spec} ({datetime.now().strftime('%Y-%m-%d %H:%M:%S')})"]
+            lines.append("-" * 30)
+            lines.append("Host\tIP\tPort\tService")
+            for ip, port_num, service_name in found:
+                plain_service_name = service_name.replace("[dim]", "").replace("[/dim]", "")
+                lines.append(f"{labels.get(ip, ip)}\t{ip}\t{port_num}\t{plain_service_name}")
+            return "\n".join(lines)
+        save_output_to_file(generate_save_content, "batch_port_scan")
+
+    instruction = Text("Press any key to return...", style=MAIN_STYLE)
+    console.print(Align.center(instruction))
+    while get_key() is None: time.sleep(0.1)
+
+    results = {ip: [] for ip in target_ips}
+    for ip, port_num, _ in found:
+        results[ip].append(port_num)
+    return results
+
 def parse_ping_summary(output):
     """Parses the summary statistics from ping output (Windows/Linux)."""
     summary = {
@@ -404,7 +634,7 @@ def run_ping(target):
     while get_key() is None: time.sleep(0.1)
 
 def parse_traceroute_hop(line):
-    """Parses a single line of traceroute output to find IP and hostname."""
+    """Parses a single line of traceroute output to find IP (v4 or v6), hostname and latencies."""
     line = line.strip()
     hop_match = re.match(r'^\s*(\d+)', line)
     hop_num = hop_match.group(1) if hop_match else None
@@ -414,8 +644,13 @@ def parse_traceroute_hop(line):
     if "Request timed out" in line or line.count('*') >= 3:
         return {"hop": hop_num, "ip": "* * *", "hostname": "Request timed out", "latency": None}
 
-    ip_match = re.search(r'(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})', line)
-    ip = ip_match.group(1) if ip_match else None
+    ip = None
+    for token in re.split(r'[\s\(\)\[\]]+', line)[1:]:
+        try:
+            ip = str(ipaddress.ip_address(token.split('%')[0]))  # IPv4 or IPv6 (drop any zone id)
+            break
+        except ValueError:
+            continue
     if not ip:
         return None
 
@@ -425,123 +660,201 @@ def parse_traceroute_hop(line):
     if hostname_match:
         hostname = hostname_match.group(1)
 
-    latency_match = re.findall(r'(\d+)\s*ms', line)
+    latency_match = re.findall(r'(<?\d+(?:\.\d+)?)\s*ms', line)
     latency = "/".join(latency_match) + " ms" if latency_match else None
 
     return {"hop": hop_num, "ip": ip, "hostname": hostname, "latency": latency}
 
 def get_whois_info(ip):
-    """Performs a WHOIS lookup and extracts key info, falling back to raw text."""
-    if not whois:
-        return "[dim]python-whois not installed[/dim]"
-
+    """Performs a WHOIS lookup and extracts the network holder, falling back to raw text."""
     if not isinstance(ip, str) or not ip or ip == '* * *':
         return "[dim]Invalid IP for WHOIS[/dim]"
 
     try:
-        import ipaddress
         ip_obj = ipaddress.ip_address(ip)
         if ip_obj.is_private or ip_obj.is_loopback or ip_obj.is_multicast or ip_obj.is_unspecified:
             return "[dim]Private/Reserved IP[/dim]"
     except ValueError:
         return "[dim]Invalid IP Format[/dim]"
-    except ImportError:
-        if ip.startswith('192.168.') or ip.startswith('10.') or \
-           (ip.startswith('172.') and 16 <= int(ip.split('.')[1]) <= 31) or \
-           ip.startswith('127.'):
-            return "[dim]Private/Loopback IP[/dim]"
     except Exception:
         return "[dim]IP Check Error[/dim]"
 
-    default_timeout = socket.getdefaulttimeout()
-    w = None
-    raw_whois_text = None
+    cached = whois_cache.get_cached_whois(ip)
+    if cached is not None:
+        return cached
+
     try:
-        try:
-            socket.setdefaulttimeout(5.0)
-            w = whois.whois(ip)
-        except Exception as e_lookup:
-            socket.setdefaulttimeout(default_timeout)
-            return f"[dim]WHOIS Lookup Failed ({type(e_lookup).__name__})[/dim]"
-        finally:
-            socket.setdefaulttimeout(default_timeout)
+        _, raw_whois_text = whois_client.whois_lookup(ip, timeout=WHOIS_TIMEOUT)
+    except (OSError, ValueError) as e_lookup:
+        # Failures are not cached so the next trace retries them
+        return f"[dim]WHOIS Lookup Failed ({type(e_lookup).__name__})[/dim]"
+
+    parsed = whois_client.parse_whois_response(raw_whois_text, ip)
+    if parsed['org']:
+        summary = parsed['org']
+    else:
+        first_lines = [line.strip() for line in raw_whois_text.strip().splitlines()
+                       if line.strip() and not line.startswith(('%', '#'))][:3]
+        summary = f"[dim]WHOIS Raw: {' '.join(first_lines)[:100]}...[/dim]" if first_lines else "[dim]No WHOIS data[/dim]"
 
-        try:
-            raw_whois_text = getattr(w, 'text', None)
-        except Exception:
-            pass
-
-        if w is None:
-            if raw_whois_text:
-                first_lines = raw_whois_text.strip().splitlines()[:3]
-                summary = " ".join(line.strip() for line in first_lines)
-                return f"[dim]WHOIS Raw (Obj=None): {summary[:100]}...[/dim]"
-            else:
-                return "[dim]No WHOIS data (None)[/dim]"
+    whois_cache.store_whois(ip, summary, parsed['network'])
+    return summary
 
-        is_empty_or_error = False
-        try:
-            if hasattr(w, '__dict__') and not w.__dict__:
-                is_empty_or_error = True
-            elif getattr(w, 'status', None) == 'error' or \
-                 (getattr(w, 'domain_name', None) is None and getattr(w, 'org', None) is None and getattr(w, 'nets', None) is None):
-                is_empty_or_error = True
-        except Exception:
-            is_empty_or_error = True
-
-        if is_empty_or_error:
-            if raw_whois_text:
-                first_lines = raw_whois_text.strip().splitlines()[:3]
-                summary = " ".join(line.strip() for line in first_lines)
-                return f"[dim]WHOIS Raw: {summary[:100]}...[/dim]"
-            else:
-                return "[dim]No WHOIS data[/dim]"
+def build_traceroute_table(hops, target):
+    """Build the traceroute results table, showing placeholders for lookups still in flight."""
+    table = Table(title=f"Traceroute Path to {target}", box=DOUBLE, border_style=BORDER_STYLE)
+    table.add_column("Hop", style="dim", justify="right")
+    table.add_column("IP Address", style=MAIN_STYLE)
+    table.add_column("Hostname", style=MAIN_STYLE)
+    table.add_column("Latency", style="dim")
+    table.add_column("WHOIS Org/NetName", style="cyan")
+
+    for hop in hops:
+        hop_num_str = str(hop.get("hop", ""))
+        ip_str = str(hop.get("ip", ""))
+        if ip_str == "* * *":
+            hostname_str = str(hop.get("hostname", ""))
+        elif hop.get("hostname"):
+            hostname_str = str(hop["hostname"])
+        elif hop.get("rdns_pending"):
+            hostname_str = "[dim]Resolving...[/dim]"
+        else:
+            hostname_str = ip_str
+        whois_str = str(hop.get("whois", ""))
+        table.add_row(hop_num_str, ip_str, hostname_str, hop.get("latency") or "", whois_str)
+    return table
 
-        org_name = None
-        try:
-            org_name = getattr(w, 'org', None)
-            if not org_name:
-                nets = getattr(w, 'nets', None)
-                if nets and isinstance(nets, list) and len(nets) > 0 and isinstance(nets[0], dict):
-                    org_name = nets[0].get('name')
-            if not org_name:
-                org_name = getattr(w, 'name', None)
-        except Exception:
-            if raw_whois_text:
-                first_lines = raw_whois_text.strip().splitlines()[:3]
-                summary = " ".join(line.strip() for line in first_lines)
-                return f"[dim]WHOIS Raw: {summary[:100]}...[/dim]"
-            else:
-                return "[dim]WHOIS Parse Error[/dim]"
+def _reverse_dns(ip):
+    """Reverse-resolve an IP, returning None when there is no PTR record."""
+    try:
+        hostname, _, _ = socket.gethostbyaddr(ip)
+        return hostname
+    except (socket.herror, socket.gaierror, socket.timeout, OSError):
+        return None
 
-        if org_name:
-            return str(org_name)
+def _run_timed(started, key, func, *args):
+    """Record when a worker actually picks up a lookup, so deadlines exclude queue time."""
+    started[key] = time.monotonic()
+    return func(*args)
+
+def submit_hop_enrichment(executor, hop, pending, started):
+    """Queue WHOIS and reverse-DNS lookups for a hop on the executor."""
+    if hop["ip"] == "* * *":
+        hop["whois"] = ""
+        return
+    hop["whois"] = "[dim]Looking up...[/dim]"
+    whois_future = executor.submit(_run_timed, started, (id(hop), "whois"), get_whois_info, hop["ip"])
+    pending[whois_future] = (hop, "whois")
+    if not hop["hostname"]:
+        hop["rdns_pending"] = True
+        rdns_future = executor.submit(_run_timed, started, (id(hop), "rdns"), _reverse_dns, hop["ip"])
+        pending[rdns_future] = (hop, "rdns")
+
+def collect_hop_enrichment(pending, started, wait_timeout=0.1):
+    """Apply finished lookups to their hops and expire ones past HOP_ENRICH_DEADLINE.
+
+    Returns True if any hop changed.
+    """
+    if not pending:
+        return False
+    done, _ = wait(list(pending), timeout=wait_timeout, return_when=FIRST_COMPLETED)
+    changed = False
+    for future in done:
+        hop, kind = pending.pop(future)
+        try:
+            result = future.result()
+        except Exception as e:
+            result = None
+            if kind == "whois":
+                result = f"[dim]WHOIS Error ({type(e).__name__})[/dim]"
+        if kind == "whois":
+            hop["whois"] = result
         else:
-            if raw_whois_text:
-                first_lines = raw_whois_text.strip().splitlines()[:3]
-                summary = " ".join(line.strip() for line in first_lines)
-                return f"[dim]WHOIS Raw: {summary[:100]}...[/dim]"
+            hop["hostname"] = result
+            hop["rdns_pending"] = False
+        changed = True
+
+    now = time.monotonic()
+    for future, (hop, kind) in list(pending.items()):
+        start = started.get((id(hop), kind))
+        if start is not None and now - start > HOP_ENRICH_DEADLINE:
+            # The worker thread cannot be interrupted; drop its result and move on.
+            del pending[future]
+            if kind == "whois":
+                hop["whois"] = "[dim]WHOIS Timeout[/dim]"
             else:
-                return "[dim]N/A[/dim]"
+                hop["rdns_pending"] = False
+            changed = True
+    return changed
 
-    except AttributeError as e_attr:
-        if raw_whois_text:
-            first_lines = raw_whois_text.strip().splitlines()[:3]
-            summary = " ".join(line.strip() for line in first_lines)
-            return f"[dim]WHOIS Raw (Outer AttrErr): {summary[:100]}...[/dim]"
-        else:
-            return f"[dim]WHOIS Lib Error (Outer Attr)[/dim]"
-    except Exception as e:
-        error_type = type(e).__name__
-        if raw_whois_text:
-            first_lines = raw_whois_text.strip().splitlines()[:3]
-            summary = " ".join(line.strip() for line in first_lines)
-            return f"[dim]WHOIS Raw (Outer Err: {error_type}): {summary[:100]}...[/dim]"
+def _read_traceroute_output(process, hop_queue, output_lines):
+    """Read traceroute stdout line by line, queueing each parsed hop; None marks the end."""
+    try:
+        for line in process.stdout:
+            output_lines.append(line.rstrip("\n"))
+            hop_data = parse_traceroute_hop(line)
+            if hop_data:
+                hop_queue.put(hop_data)
+    finally:
+        hop_queue.put(None)
+
+def _format_native_trace(hops):
+    """Render native engine hops as traceroute-style text for saving."""
+    lines = []
+    for hop in hops:
+        if hop["ip"] == "* * *":
+            lines.append(f"{hop['hop']:>2}  * * *")
         else:
-            return f"[dim]WHOIS Error (Outer {error_type})[/dim]"
+            lines.append(f"{hop['hop']:>2}  {hop['ip']}  {hop['latency']}")
+    return lines
+
+def stream_hops_live(hop_queue, target, deadline=None, on_deadline=None):
+    """Render hops from hop_queue into a live table as they arrive, enriching each one at once.
+
+    hop_queue yields hop dicts and then None. If deadline (time.monotonic) passes before the
+    source finishes, on_deadline() is called once and the loop keeps draining until None.
+    Returns the list of hops shown.
+    """
+    hops = []
+    pending = {}
+    started = {}
+    source_open = True
+    deadline_hit = False
+    executor = ThreadPoolExecutor(max_workers=HOP_ENRICH_WORKERS, thread_name_prefix="hop-enrich")
+    try:
+        with Live(Align.center(build_traceroute_table(hops, target)), console=console,
+                  refresh_per_second=4) as live:
+            while source_open or pending:
+                changed = False
+                if source_open:
+                    if deadline is not None and not deadline_hit and time.monotonic() > deadline:
+                        deadline_hit = True
+                        if on_deadline:
+                            on_deadline()
+                    try:
+                        hop_data = hop_queue.get(timeout=0.05)
+                    except queue.Empty:
+                        hop_data = False
+                    if hop_data is None:
+                        source_open = False
+                    elif hop_data:
+                        hops.append(hop_data)
+                        submit_hop_enrichment(executor, hop_data, pending, started)
+                        changed = True
+                if collect_hop_enrichment(pending, started, wait_timeout=0 if source_open else 0.1):
+                    changed = True
+                if changed:
+                    live.update(Align.center(build_traceroute_table(hops, target)))
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return hops
 
 def run_traceroute(target):
-    """Runs the OS traceroute command, parses hops, and adds WHOIS info."""
+    """Traces the route to a target, streaming hops into a live table with WHOIS info.
+
+    On Linux the built-in parallel engine is used; elsewhere, or if it cannot start, the OS
+    traceroute/tracert command is run and its output parsed line by line.
+    """
     clear_screen()
     print_banner()
     title = Text(f"Traceroute to {target}", style=f"bold {HACKER_GREEN}")
@@ -554,93 +867,83 @@ def run_traceroute(target):
     else:
         command = ["traceroute", "-n", target]
 
-    console.print(f"Executing: [cyan]{' '.join(command)}[/cyan]\n")
-    console.print("[yellow]Traceroute running... (WHOIS lookups will add time)[/yellow]\n")
-
-    traceroute_output = ""
+    output_lines = []
     error_output = ""
     parsed_hops = []
     process_error = None
+    native_hops = None
+    hop_queue = queue.Queue()
 
-    try:
-        process = subprocess.run(command, capture_output=True, text=True, timeout=120)
-        traceroute_output = process.stdout
-        error_output = process.stderr
-
-        if process.returncode != 0:
-            console.print(f"[yellow]Traceroute command exited with code {process.returncode}.[/yellow]")
-            if error_output:
-                console.print(Panel(error_output, title="Error Output", border_style="red", expand=False))
-
-        lines = traceroute_output.strip().splitlines()
-        start_line = 0
-        if system == "Windows":
-            for i, line in enumerate(lines):
-                if not line.strip() or line.strip().startswith("Tracing route to"):
-                    start_line = i + 1
-                elif re.match(r'^\s*\d+', line):
-                    break
-            if start_line < len(lines) and "maximum of 30 hops" in lines[start_line]:
-                start_line += 1
-
-        with Progress(TextColumn("Processing hop {task.fields[hop_num]} - WHOIS lookup..."), transient=True, console=console) as progress:
-            num_lines_to_process = len(lines) - start_line
-            task = progress.add_task("", total=num_lines_to_process if num_lines_to_process > 0 else 1, hop_num=0)
-
-            for i, line in enumerate(lines[start_line:]):
-                hop_data = parse_traceroute_hop(line)
-
-                if hop_data:
-                    current_hop_num = hop_data.get("hop", str(i + 1))
-                    progress.update(task, advance=1, hop_num=current_hop_num)
-
-                    if hop_data["ip"] != "* * *":
-                        hop_data["whois"] = get_whois_info(hop_data["ip"])
-                        if not hop_data["hostname"]:
-                            try:
-                                hostname, _, _ = socket.gethostbyaddr(hop_data["ip"])
-                                hop_data["hostname"] = hostname
-                            except (socket.herror, socket.gaierror, socket.timeout, OSError):
-                                pass
-                    else:
-                        hop_data["whois"] = ""
-
-                    parsed_hops.append(hop_data)
-                else:
-                    progress.update(task, advance=1)
-
-    except FileNotFoundError:
-        process_error = f"Error: '{command[0]}' command not found. Is it installed and in your PATH?"
-        traceroute_output = process_error
-    except subprocess.TimeoutExpired:
-        process_error = "Error: Traceroute command timed out after 120 seconds."
+    if traceroute_engine.native_traceroute_supported():
+        try:
+            target_ip = str(ipaddress.ip_address(target))
+        except ValueError:
+            try:
+                target_ip = socket.gethostbyname(target)
+            except socket.gaierror:
+                target_ip = None
+        if target_ip:
+            try:
+                with Progress(SpinnerColumn(), TextColumn(f"Probing all hops to {target_ip} in parallel..."),
+                              transient=True, console=console) as progress:
+                    progress.add_task("", total=None)
+                    native_hops = traceroute_engine.trace_route(target_ip)
+                command = ["built-in traceroute", target_ip]
+            except OSError as e:
+                console.print(f"[dim]Built-in traceroute unavailable ({e}); using system command.[/dim]")
+
+    if native_hops is not None:
+        console.print(f"Traced [cyan]{target}[/cyan] with the built-in engine ({len(native_hops)} hops)\n")
+        output_lines = _format_native_trace(native_hops)
+        for hop_data in native_hops:
+            hop_queue.put(hop_data)
+        hop_queue.put(None)
+        parsed_hops = stream_hops_live(hop_queue, target)
+    else:
+        console.print(f"Executing: [cyan]{' '.join(command)}[/cyan]\n")
+        console.print("[yellow]Traceroute running... (hops stream in, WHOIS fills in behind them)[/yellow]\n")
+        try:
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                       text=True, bufsize=1)
+        except FileNotFoundError:
+            process = None
+            process_error = f"Error: '{command[0]}' command not found. Is it installed and in your PATH?"
+        except Exception as e:
+            process = None
+            process_error = f"Error executing traceroute command: {e}"
+
+        if process:
+            error_chunks = []
+            stderr_thread = threading.Thread(target=lambda: error_chunks.append(process.stderr.read()), daemon=True)
+            stderr_thread.start()
+            threading.Thread(target=_read_traceroute_output, args=(process, hop_queue, output_lines),
+                             daemon=True).start()
+
+            def on_deadline():
+                nonlocal process_error
+                if process.poll() is None:
+                    process.kill()
+                    process_error = f"Error: Traceroute command timed out after {TRACEROUTE_TIMEOUT} seconds."
+
+            parsed_hops = stream_hops_live(hop_queue, target, time.monotonic() + TRACEROUTE_TIMEOUT, on_deadline)
+            return_code = process.wait()
+            stderr_thread.join(timeout=1)
+            error_output = "".join(error_chunks)
+
+            if return_code != 0 and not process_error:
+                console.print(f"[yellow]Traceroute command exited with code {return_code}.[/yellow]")
+                if error_output:
+                    console.print(Panel(error_output, title="Error Output", border_style="red", expand=False))
+
+    traceroute_output = "\n".join(output_lines)
+    if process_error:
         traceroute_output = (traceroute_output + f"\n\n{process_error}").strip()
-    except Exception as e:
-        process_error = f"Error executing traceroute command: {e}"
-        traceroute_output = process_error
 
     console.print()
 
-    if parsed_hops:
-        table = Table(title=f"Traceroute Path to {target}", box=DOUBLE, border_style=BORDER_STYLE)
-        table.add_column("Hop", style="dim", justify="right")
-        table.add_column("IP Address", style=MAIN_STYLE)
-        table.add_column("Hostname", style=MAIN_STYLE)
-        table.add_column("WHOIS Org/NetName", style="cyan")
-
-        for hop in parsed_hops:
-            hop_num_str = str(hop.get("hop", ""))
-            ip_str = str(hop.get("ip", ""))
-            hostname_str = str(hop.get("hostname") or "[dim]Resolving...[/dim]" if ip_str != "* * *" else hop.get("hostname", ""))
-            if hostname_str == "[dim]Resolving...[/dim]" and ip_str != "* * *":
-                hostname_str = ip_str
-            whois_str = str(hop.get("whois", ""))
-
-            table.add_row(hop_num_str, ip_str, hostname_str, whois_str)
-        console.print(Align.center(table))
-    elif process_error:
+    if process_error:
         console.print(f"[bold red]{process_error}[/bold red]")
-    else:
+    elif not parsed_hops:
         console.print("[yellow]Could not parse traceroute output.[/yellow]")
         if traceroute_output:
             console.print(Panel(traceroute_output, title="Raw Output", border_style="dim", expand=False))
@@ -655,4 +958,3 @@ def run_traceroute(target):
     instruction = Text("Press any key to return...", style=MAIN_STYLE)
     console.print(Align.center(instruction))
     while get_key() is None: time.sleep(0.1)
-
@@ -0,0 +1,634 @@
+import socket
+import select
+import struct
+import time
+import math
+import asyncio
+import ipaddress
+from array import array
+from datetime import datetime
+
+# Rich imports
+from rich.table import Table
+from rich.align import Align
+from rich.text import Text
+from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.live import Live
+from rich.box import DOUBLE
+
+# Local imports
+from utils.helpers import (
+    clear_screen, print_banner, get_key, console, save_output_to_file,
+    MAIN_STYLE, HIGHLIGHT_STYLE, HACKER_GREEN, BORDER_STYLE
+)
+from utils import port_scanner
+
+# --- Ping Configuration ---
+DEFAULT_PING_COUNT = 4
+DEFAULT_PING_INTERVAL = 0.2  # Seconds between probe rounds (each round pings every host once)
+DEFAULT_PING_TIMEOUT = 1.0  # Seconds to wait for stragglers after the last round
+TCP_PING_PORTS = (443, 80)  # Tried in order when ICMP sockets are not permitted
+SEND_BUFFER_WAIT = 2.0  # Seconds a probe may wait for room in a full socket send buffer before it counts as lost
+# --- End Configuration ---
+
+# --- Monitor Configuration ---
+DEFAULT_MONITOR_INTERVAL = 1.0  # Seconds between probes to each target
+MONITOR_HISTORY_SIZE = 3600  # Samples kept per target (an hour at 1 s); older ones are overwritten
+MONITOR_STATS_WINDOW = 300  # Newest samples the live percentiles are computed over (loss covers the whole history)
+MONITOR_REDRAW_INTERVAL = 1.0  # Seconds between screen redraws
+MONITOR_KEY_POLL_INTERVAL = 0.2  # Seconds between keyboard checks while waiting for replies
+MONITOR_MAX_TARGETS = 256
+SPARKLINE_WIDTH = 40
+SPARKLINE_BLOCKS = "▁▂▃▄▅▆▇█"
+# --- End Configuration ---
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+ICMP6_ECHO_REQUEST = 128
+ICMP6_ECHO_REPLY = 129
+_ICMP_HEADER = struct.Struct("!BBHHH")  # type, code, checksum, identifier, sequence
+
+
+def _icmp_checksum(data):
+    """RFC 1071 internet checksum."""
+    if len(data) % 2:
+        data += b"\x00"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+class PingSocketsNotPermitted(PermissionError):
+    """Unprivileged ICMP sockets are not allowed here; callers fall back to TCP connects."""
+
+
+def _open_icmp_sockets(families):
+    """{family: ping socket} for every family in use. Raises PingSocketsNotPermitted when denied."""
+    sockets = {}
+    try:
+        for family in set(families):
+            sockets[family] = open_icmp_socket(family)
+    except PermissionError as e:
+        for sock in sockets.values():
+            sock.close()
+        raise PingSocketsNotPermitted(*e.args) from e
+    except OSError:
+        for sock in sockets.values():
+            sock.close()
+        raise
+    return sockets
+
+
+def open_icmp_socket(family):
+    """Open an unprivileged ICMP datagram socket ("ping socket").
+
+    Linux allows these for groups listed in net.ipv4.ping_group_range, macOS for everyone.
+    Raises OSError (usually PermissionError) where they are not allowed.
+    """
+    proto = socket.IPPROTO_ICMPV6 if family == socket.AF_INET6 else socket.IPPROTO_ICMP
+    sock = socket.socket(family, socket.SOCK_DGRAM, proto)
+    sock.setblocking(False)
+    return sock
+
+
+def send_echo_request(sock, ip, sequence):
+    """Send one echo request. The kernel assigns the identifier for ping sockets."""
+    family = sock.family
+    icmp_type = ICMP6_ECHO_REQUEST if family == socket.AF_INET6 else ICMP_ECHO_REQUEST
+    payload = struct.pack("!d", time.time())
+    header = _ICMP_HEADER.pack(icmp_type, 0, 0, 0, sequence)
+    checksum = _icmp_checksum(header + payload) if family == socket.AF_INET else 0  # Kernel fills ICMPv6's
+    packet = _ICMP_HEADER.pack(icmp_type, 0, checksum, 0, sequence) + payload
+    sock.sendto(packet, (ip, 0))
+
+
+def send_when_writable(sock, ip, sequence, drain):
+    """Send one echo request, waiting for send buffer space instead of failing when it is full.
+
+    Large sweeps can fill the socket's send buffer; then replies are drained (drain(0)) while
+    waiting for the socket to become writable, so they are timed promptly. Returns the
+    perf_counter() time the request was sent. Raises OSError for real send errors (e.g. an
+    unreachable network) or if no buffer space frees up within SEND_BUFFER_WAIT.
+    """
+    deadline = time.perf_counter() + SEND_BUFFER_WAIT
+    while True:
+        sent_at = time.perf_counter()
+        try:
+            send_echo_request(sock, ip, sequence)
+            return sent_at
+        except (BlockingIOError, InterruptedError):
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                raise
+            drain(0)
+            select.select([], [sock], [], min(remaining, 0.05))
+
+
+def read_echo_reply(sock):
+    """Read one echo reply. Returns (source_ip, sequence) or None if nothing usable is queued."""
+    try:
+        data, addr = sock.recvfrom(1024)
+    except (BlockingIOError, InterruptedError):
+        return None
+    if data and data[0] >> 4 == 4 and sock.family == socket.AF_INET:
+        data = data[(data[0] & 0x0F) * 4:]  # macOS delivers the IP header too
+    if len(data) < _ICMP_HEADER.size:
+        return None
+    icmp_type, _, _, _, sequence = _ICMP_HEADER.unpack_from(data)
+    if icmp_type not in (ICMP_ECHO_REPLY, ICMP6_ECHO_REPLY):
+        return None
+    return str(ipaddress.ip_address(addr[0].split('%')[0])), sequence
+
+
+def percentile(sorted_samples, pct):
+    """Linear-interpolated percentile of an already sorted list."""
+    if not sorted_samples:
+        return None
+    rank = (len(sorted_samples) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_samples) - 1)
+    return sorted_samples[low] + (sorted_samples[high] - sorted_samples[low]) * (rank - low)
+
+
+def compute_ping_stats(samples, sent):
+    """Summarize raw RTT samples (ms, in send order) into loss, percentiles and jitter.
+
+    Jitter is the mean absolute difference between consecutive samples (RFC 3550 style).
+    """
+    ordered = sorted(samples)
+    stats = {
+        'sent': sent,
+        'received': len(samples),
+        'loss_percent': ((sent - len(samples)) / sent * 100) if sent else 0.0,
+        'min': ordered[0] if ordered else None,
+        'avg': sum(ordered) / len(ordered) if ordered else None,
+        'max': ordered[-1] if ordered else None,
+        'p50': percentile(ordered, 50),
+        'p95': percentile(ordered, 95),
+        'p99': percentile(ordered, 99),
+        'jitter': None,
+    }
+    if len(samples) > 1:
+        stats['jitter'] = sum(abs(b - a) for a, b in zip(samples, samples[1:])) / (len(samples) - 1)
+    return stats
+
+
+def icmp_ping_hosts(target_ips, count=DEFAULT_PING_COUNT, interval=DEFAULT_PING_INTERVAL,
+                    timeout=DEFAULT_PING_TIMEOUT):
+    """Ping every host concurrently over shared ping sockets.
+
+    Each round sends one echo request to every host, so the sweep lasts about
+    count * interval + timeout regardless of how many hosts there are.
+    Returns {ip: [rtt_ms, ...]} in send order. Raises PingSocketsNotPermitted if ping sockets
+    are not allowed.
+    """
+    families = {ip: (socket.AF_INET6 if ipaddress.ip_address(ip).version == 6 else socket.AF_INET)
+                for ip in target_ips}
+    sockets = _open_icmp_sockets(families.values())
+    try:
+        send_times = {}
+        samples = {ip: {} for ip in target_ips}
+
+        def drain(wait_seconds):
+            readable, _, _ = select.select(list(sockets.values()), [], [], max(0, wait_seconds))
+            for sock in readable:
+                while True:
+                    reply = read_echo_reply(sock)
+                    received_at = time.perf_counter()
+                    if reply is None:
+                        break
+                    sent_at = send_times.pop(reply, None)
+                    if sent_at is not None:
+                        samples[reply[0]][reply[1]] = (received_at - sent_at) * 1000
+
+        for sequence in range(count):
+            round_start = time.perf_counter()
+            for ip in target_ips:
+                try:
+                    send_times[(ip, sequence)] = send_when_writable(sockets[families[ip]], ip, sequence, drain)
+                except OSError:
+                    pass  # Unreachable network: counts as lost
+                drain(0)  # Time replies as they arrive instead of after the whole round is sent
+            if sequence < count - 1:
+                while time.perf_counter() - round_start < interval:
+                    drain(interval - (time.perf_counter() - round_start))
+
+        deadline = time.perf_counter() + timeout
+        while send_times and time.perf_counter() < deadline:
+            drain(deadline - time.perf_counter())
+    finally:
+        for sock in sockets.values():
+            sock.close()
+    return {ip: [by_seq[seq] for seq in sorted(by_seq)] for ip, by_seq in samples.items()}
+
+
+async def _tcp_ping_host(ip, count, interval, timeout, semaphore):
+    """Time TCP handshakes to a host. Returns (ip, samples, refusals).
+
+    A refusal (RST) is timed as a reply too, but counted separately: a local firewall or a
+    middlebox can send it instantly on behalf of a host that is not there at all.
+    """
+    loop = asyncio.get_running_loop()
+    family = socket.AF_INET6 if ipaddress.ip_address(ip).version == 6 else socket.AF_INET
+    samples = []
+    refusals = 0
+    for sequence in range(count):
+        if sequence:
+            await asyncio.sleep(interval)
+        for port in TCP_PING_PORTS:
+            async with semaphore:
+                sock = socket.socket(family, socket.SOCK_STREAM)
+                sock.setblocking(False)
+                started = time.perf_counter()
+                try:
+                    await asyncio.wait_for(loop.sock_connect(sock, (ip, port)), timeout)
+                    samples.append((time.perf_counter() - started) * 1000)
+                    break
+                except ConnectionRefusedError:
+                    samples.append((time.perf_counter() - started) * 1000)
+                    refusals += 1
+                    break
+                except (asyncio.TimeoutError, OSError):
+                    continue
+                finally:
+                    sock.close()
+    return ip, samples, refusals
+
+
+async def _tcp_ping_round(target_ips, count, interval, timeout, refusals):
+    semaphore = asyncio.Semaphore(port_scanner.max_scan_concurrency())
+    results = await asyncio.gather(*(_tcp_ping_host(ip, count, interval, timeout, semaphore)
+                                     for ip in target_ips))
+    samples = {}
+    for ip, host_samples, refused in results:
+        samples[ip] = host_samples
+        if refusals is not None and refused:
+            refusals[ip] = refusals.get(ip, 0) + refused
+    return samples
+
+
+def tcp_ping_hosts(target_ips, count=DEFAULT_PING_COUNT, interval=DEFAULT_PING_INTERVAL,
+                   timeout=DEFAULT_PING_TIMEOUT, refusals=None):
+    """TCP-connect fallback for icmp_ping_hosts with the same return shape.
+
+    If refusals is a dict, the number of samples per host that were refusals is added to it.
+    """
+    return asyncio.run(_tcp_ping_round(target_ips, count, interval, timeout, refusals))
+
+
+def rst_only(refused, received):
+    """True when every reply from a host was a TCP refusal, which does not prove the host is up."""
+    return bool(received) and refused >= received
+
+
+def ping_hosts(target_ips, count=DEFAULT_PING_COUNT, interval=DEFAULT_PING_INTERVAL,
+               timeout=DEFAULT_PING_TIMEOUT, refusals=None):
+    """Ping hosts with ICMP, falling back to TCP connects where ping sockets are not permitted.
+
+    Returns (method, {ip: samples}); refusals is filled as in tcp_ping_hosts.
+    """
+    try:
+        return "ICMP", icmp_ping_hosts(target_ips, count, interval, timeout)
+    except PingSocketsNotPermitted:
+        return "TCP", tcp_ping_hosts(target_ips, count, interval, timeout, refusals)
+
+
+def _format_ms(value):
+    return f"{value:.2f}" if value is not None else "-"
+
+
+def run_ping_sweep(target_spec, count=DEFAULT_PING_COUNT):
+    """Ping many hosts / CIDR ranges at once and show per-host percentile statistics."""
+    clear_screen()
+    print_banner()
+    title = Text(f"Ping Sweep: {target_spec}", style=f"bold {HACKER_GREEN}")
+    console.print(Align.center(title))
+    console.print()
+
+    try:
+        targets = port_scanner.expand_targets(target_spec)
+    except ValueError as e:
+        console.print(Align.center(Text(str(e), style="bold red")))
+        time.sleep(2)
+        clear_screen()
+        return {}
+
+    labels = {ip: label for label, ip in targets}
+    target_ips = [ip for _, ip in targets]
+    with Progress(SpinnerColumn(), TextColumn(f"Pinging {len(target_ips)} host(s), {count} probe(s) each..."),
+                  transient=True, console=console) as progress:
+        progress.add_task("", total=None)
+        refusals = {}
+        method, samples = ping_hosts(target_ips, count, refusals=refusals)
+
+    results = {ip: compute_ping_stats(samples.get(ip, []), count) for ip in target_ips}
+    order = sorted(target_ips, key=lambda ip: (ipaddress.ip_address(ip).version, ipaddress.ip_address(ip)))
+    refused_only = {ip for ip in order if rst_only(refusals.get(ip, 0), results[ip]['received'])}
+    alive = sum(1 for ip in order if results[ip]['received'] and ip not in refused_only)
+    up_text = f"{alive}/{len(order)} up" + (f", {len(refused_only)} tcp-rst only" if refused_only else "")
+
+    table = Table(title=f"[bold {HACKER_GREEN}]Ping Sweep Results ({up_text}, {method})[/bold {HACKER_GREEN}]",
+                  show_header=True, header_style=f"bold {HACKER_GREEN}",
+                  box=DOUBLE, border_style=BORDER_STYLE)
+    table.add_column("Host", style=MAIN_STYLE)
+    table.add_column("Recv/Sent", style=MAIN_STYLE, justify="right")
+    table.add_column("Loss", style=MAIN_STYLE, justify="right")
+    for column in ("Min", "p50", "p95", "p99", "Max", "Jitter"):
+        table.add_column(f"{column} (ms)", style=MAIN_STYLE, justify="right")
+    for ip in order:
+        stats = results[ip]
+        host = Text(ip if labels[ip] == ip else f"{labels[ip]} ({ip})")
+        if ip in refused_only:
+            host.append(" tcp-rst", style="yellow")
+        loss_style = "bold red" if stats['received'] == 0 else ("yellow" if stats['loss_percent'] else MAIN_STYLE)
+        table.add_row(host, f"{stats['received']}/{stats['sent']}",
+                      Text(f"{stats['loss_percent']:.0f}%", style=loss_style),
+                      _format_ms(stats['min']), _format_ms(stats['p50']), _format_ms(stats['p95']),
+                      _format_ms(stats['p99']), _format_ms(stats['max']), _format_ms(stats['jitter']))
+    console.print(Align.center(table))
+    if method == "TCP":
+        console.print(Align.center(Text(f"ICMP ping sockets are not permitted here; timed TCP connects to ports {', '.join(map(str, TCP_PING_PORTS))} instead.", style="dim")))
+        if refused_only:
+            console.print(Align.center(Text("tcp-rst: only connection refusals came back, which a firewall or middlebox can send for an absent host.", style="dim")))
+    console.print()
+
+    def generate_save_content():
+        lines = [f"Ping Sweep Results for {target_spec} ({method}, {count} probes) ({datetime.now().strftime('%Y-%m-%d %H:%M:%S')})"]
+        lines.append("-" * 30)
+        lines.append("Host\tRecv/Sent\tLoss%\tMin\tp50\tp95\tp99\tMax\tJitter")
+        for ip in order:
+            stats = results[ip]
+            host = f"{ip} (tcp-rst)" if ip in refused_only else ip
+            lines.append("\t".join([host, f"{stats['received']}/{stats['sent']}", f"{stats['loss_percent']:.0f}"] +
+                                   [_format_ms(stats[key]) for key in ('min', 'p50', 'p95', 'p99', 'max', 'jitter')]))
+        return "\n".join(lines)
+    save_output_to_file(generate_save_content, "ping_sweep")
+
+    instruction = Text("Press any key to return...", style=MAIN_STYLE)
+    console.print(Align.center(instruction))
+    while get_key() is None: time.sleep(0.1)
+    return results
+
+
+def new_ring_buffer(size=MONITOR_HISTORY_SIZE):
+    """Fixed-size sample history; lost probes are stored as NaN. Memory never grows past size.
+
+    'lost' counts the NaNs currently stored, so loss over the window needs no scan.
+    """
+    return {'samples': array('d', [math.nan]) * size, 'next': 0, 'filled': 0, 'lost': 0,
+            'total_sent': 0, 'total_received': 0}
+
+
+def ring_append(ring, value):
+    """Store one RTT (ms) or math.nan for a lost probe, overwriting the oldest sample when full."""
+    samples = ring['samples']
+    if ring['filled'] == len(samples) and math.isnan(samples[ring['next']]):
+        ring['lost'] -= 1  # A lost probe is about to be overwritten
+    if math.isnan(value):
+        ring['lost'] += 1
+    samples[ring['next']] = value
+    ring['next'] = (ring['next'] + 1) % len(samples)
+    ring['filled'] = min(ring['filled'] + 1, len(samples))
+    ring['total_sent'] += 1
+    if not math.isnan(value):
+        ring['total_received'] += 1
+
+
+def ring_values(ring, last=None):
+    """Return the stored samples oldest first, optionally only the newest `last` of them.
+
+    Only the requested samples are copied, so asking for a short tail stays cheap.
+    """
+    samples = ring['samples']
+    count = ring['filled'] if last is None else min(last, ring['filled'])
+    start = ring['next'] - count
+    if start >= 0:
+        return samples[start:ring['next']]
+    return samples[start:] + samples[:ring['next']]
+
+
+def render_sparkline(values):
+    """Render RTTs as block characters scaled to the window's own range; losses show as a red x."""
+    received = [v for v in values if not math.isnan(v)]
+    line = Text()
+    if not received:
+        return Text("x" * len(values), style="bold red")
+    low, high = min(received), max(received)
+    scale = (len(SPARKLINE_BLOCKS) - 1) / (high - low) if high > low else 0
+    run = []
+    for value in values:
+        if math.isnan(value):
+            if run:
+                line.append("".join(run), style=MAIN_STYLE)  # One span per run of replies, not per character
+                run = []
+            line.append("x", style="bold red")
+        else:
+            run.append(SPARKLINE_BLOCKS[int((value - low) * scale)])
+    if run:
+        line.append("".join(run), style=MAIN_STYLE)
+    return line
+
+
+def _icmp_monitor(target_ips, rings, interval, timeout, tick):
+    """Probe every target once per interval over shared ping sockets until tick() returns True.
+
+    Replies and expiries are recorded as they happen, so a probe slower than the interval does
+    not hold up the next one. Raises PingSocketsNotPermitted if ping sockets are not allowed.
+    """
+    families = {ip: (socket.AF_INET6 if ipaddress.ip_address(ip).version == 6 else socket.AF_INET)
+                for ip in target_ips}
+    sockets = _open_icmp_sockets(families.values())
+    try:
+        send_times = {}
+        sequence = 0
+        next_send = time.perf_counter()
+
+        def drain(wait_seconds):
+            readable, _, _ = select.select(list(sockets.values()), [], [], max(0, wait_seconds))
+            for sock in readable:
+                while True:
+                    reply = read_echo_reply(sock)
+                    received_at = time.perf_counter()
+                    if reply is None:
+                        break
+                    sent_at = send_times.pop(reply, None)
+                    if sent_at is not None:
+                        ring_append(rings[reply[0]], (received_at - sent_at) * 1000)
+
+        while True:
+            now = time.perf_counter()
+            if now >= next_send:
+                for ip in target_ips:
+                    key = (ip, sequence)
+                    if send_times.pop(key, None) is not None:  # Sequence wrapped onto a probe that never came back
+                        ring_append(rings[ip], math.nan)
+                    try:
+                        send_times[key] = send_when_writable(sockets[families[ip]], ip, sequence, drain)
+                    except OSError:
+                        ring_append(rings[ip], math.nan)
+                    drain(0)
+                sequence = (sequence + 1) % 0x10000
+                next_send = max(next_send + interval, now)  # Skip missed ticks instead of bursting
+
+            for key, sent_at in list(send_times.items()):
+                if now - sent_at > timeout:
+                    del send_times[key]
+                    ring_append(rings[key[0]], math.nan)
+
+            if tick():
+                return
+            drain(min(next_send - time.perf_counter(), MONITOR_KEY_POLL_INTERVAL))
+    finally:
+        for sock in sockets.values():
+            sock.close()
+
+
+def _tcp_monitor(target_ips, rings, interval, timeout, tick, refusals=None):
+    """TCP-connect fallback for _icmp_monitor: one concurrent probe round per interval.
+
+    All rounds run on one event loop. refusals accumulates per-host refusal counts.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            round_start = time.perf_counter()
+            samples = loop.run_until_complete(_tcp_ping_round(target_ips, 1, 0, timeout, refusals))
+            for ip in target_ips:
+                ring_append(rings[ip], samples[ip][0] if samples.get(ip) else math.nan)
+            while True:
+                if tick():
+                    return
+                remaining = interval - (time.perf_counter() - round_start)
+                if remaining <= 0:
+                    break
+                time.sleep(min(remaining, MONITOR_KEY_POLL_INTERVAL))
+    finally:
+        loop.close()
+
+
+def build_monitor_table(order, labels, rings, method, started_at, refusals=None):
+    """Loss over each target's history, percentiles over its newest samples and a sparkline of recent RTTs.
+
+    Loss comes from the ring's running counters and the percentiles from the last
+    MONITOR_STATS_WINDOW samples only, so a redraw stays cheap with many full histories.
+    Hosts whose TCP replies were all refusals (see refusals) are marked tcp-rst.
+    """
+    refusals = refusals or {}
+    elapsed = int(time.monotonic() - started_at)
+    table = Table(title=f"[bold {HACKER_GREEN}]Ping Monitor ({method}, running {elapsed // 3600:d}:{elapsed % 3600 // 60:02d}:{elapsed % 60:02d})[/bold {HACKER_GREEN}]",
+                  show_header=True, header_style=f"bold {HACKER_GREEN}",
+                  box=DOUBLE, border_style=BORDER_STYLE)
+    table.add_column("Host", style=MAIN_STYLE)
+    table.add_column("Sent", style=MAIN_STYLE, justify="right")
+    table.add_column("Loss", style=MAIN_STYLE, justify="right")
+    for column in ("Last", "p50", "p95", "p99", "Max"):
+        table.add_column(f"{column} (ms)", style=MAIN_STYLE, justify="right")
+    table.add_column("History", no_wrap=True)
+    for ip in order:
+        ring = rings[ip]
+        recent = ring_values(ring, MONITOR_STATS_WINDOW)
+        ordered = sorted(v for v in recent if not math.isnan(v))  # NaN would break the sort order
+        stats = {'p50': percentile(ordered, 50), 'p95': percentile(ordered, 95), 'p99': percentile(ordered, 99),
+                 'max': ordered[-1] if ordered else None}
+        last = recent[-1] if len(recent) else math.nan
+        loss_percent = ring['lost'] / ring['filled'] * 100 if ring['filled'] else 0.0
+        host = Text(ip if labels[ip] == ip else f"{labels[ip]} ({ip})")
+        if rst_only(refusals.get(ip, 0), ring['total_received']):
+            host.append(" tcp-rst", style="yellow")
+        loss_style = "bold red" if ring['filled'] and ring['lost'] == ring['filled'] else ("yellow" if loss_percent else MAIN_STYLE)
+        table.add_row(host, str(ring['total_sent']),
+                      Text(f"{loss_percent:.1f}%", style=loss_style),
+                      Text("lost", style="bold red") if math.isnan(last) and len(recent) else _format_ms(None if math.isnan(last) else last),
+                      _format_ms(stats['p50']), _format_ms(stats['p95']), _format_ms(stats['p99']),
+                      _format_ms(stats['max']), render_sparkline(recent[-SPARKLINE_WIDTH:]))
+    table.caption = f"Loss over the last {MONITOR_HISTORY_SIZE} probes, latency over the last {MONITOR_STATS_WINDOW}"
+    return table
+
+
+def run_ping_monitor(target_spec, interval=DEFAULT_MONITOR_INTERVAL, timeout=DEFAULT_PING_TIMEOUT):
+    """Ping targets continuously until a key is pressed, showing rolling loss and latency."""
+    clear_screen()
+    print_banner()
+    title = Text(f"Ping Monitor: {target_spec}", style=f"bold {HACKER_GREEN}")
+    console.print(Align.center(title))
+    console.print()
+
+    try:
+        targets = port_scanner.expand_targets(target_spec)
+        if len(targets) > MONITOR_MAX_TARGETS:
+            raise ValueError(f"Too many targets ({len(targets)}); the monitor watches at most {MONITOR_MAX_TARGETS}.")
+    except ValueError as e:
+        console.print(Align.center(Text(str(e), style="bold red")))
+        time.sleep(2)
+        clear_screen()
+        return {}
+
+    labels = {ip: label for label, ip in targets}
+    order = sorted(labels, key=lambda ip: (ipaddress.ip_address(ip).version, ipaddress.ip_address(ip)))
+    rings = {ip: new_ring_buffer() for ip in order}
+    timeout = min(timeout, max(interval * 4, 0.5))  # Keep expired probes from piling up at short intervals
+    started_at = time.monotonic()
+    method = "ICMP"
+    refusals = {}
+    error = None
+    console.print(Align.center(Text("Press any key to stop monitoring.", style="dim")))
+
+    # Redrawing is the expensive part, so it happens on a fixed schedule rather than per reply,
+    # and Live's own refresh thread is disabled.
+    with Live(Align.center(build_monitor_table(order, labels, rings, method, started_at, refusals)),
+              console=console, auto_refresh=False) as live:
+        next_redraw = 0.0
+
+        def tick():
+            nonlocal next_redraw
+            now = time.monotonic()
+            if now >= next_redraw:
+                live.update(Align.center(build_monitor_table(order, labels, rings, method, started_at, refusals)), refresh=True)
+                next_redraw = now + MONITOR_REDRAW_INTERVAL
+            return get_key() is not None
+
+        try:
+            try:
+                _icmp_monitor(order, rings, interval, timeout, tick)
+            except PingSocketsNotPermitted:
+                method = "TCP"
+                _tcp_monitor(order, rings, interval, timeout, tick, refusals)
+        except OSError as e:
+            error = e  # Raised mid-run: stop and show what was collected instead of switching methods
+
+    results = {}
+    for ip in order:
+        window = ring_values(rings[ip])
+        results[ip] = compute_ping_stats([v for v in window if not math.isnan(v)], len(window))
+    console.print(Align.center(build_monitor_table(order, labels, rings, method, started_at, refusals)))
+    if error is not None:
+        console.print(Align.center(Text(f"Monitoring stopped: {error}", style="bold red")))
+    console.print()
+
+    def generate_save_content():
+        lines = [f"Ping Monitor Results for {target_spec} ({method}, every {interval}s) ({datetime.now().strftime('%Y-%m-%d %H:%M:%S')})"]
+        lines.append(f"Statistics cover the last {MONITOR_HISTORY_SIZE} probes per host.")
+        lines.append("-" * 30)
+        lines.append("Host\tSent\tRecv\tLoss%\tMin\tp50\tp95\tp99\tMax\tJitter")
+        for ip in order:
+            stats = results[ip]
+            lines.append("\t".join([ip, str(stats['sent']), str(stats['received']), f"{stats['loss_percent']:.1f}"] +
+                                   [_format_ms(stats[key]) for key in ('min', 'p50', 'p95', 'p99', 'max', 'jitter')]))
+        return "\n".join(lines)
+    save_output_to_file(generate_save_content, "ping_monitor")
+
+    instruction = Text("Press any key to return...", style=MAIN_STYLE)
+    console.print(Align.center(instruction))
+    while get_key() is None: time.sleep(0.1)
+    return results
+
+
+__all__ = [
+    'DEFAULT_PING_COUNT', 'DEFAULT_PING_INTERVAL', 'DEFAULT_PING_TIMEOUT',
+    'DEFAULT_MONITOR_INTERVAL', 'MONITOR_HISTORY_SIZE',
+    'PingSocketsNotPermitted', 'open_icmp_socket', 'send_echo_request', 'send_when_writable', 'read_echo_reply', 'percentile',
+    'compute_ping_stats', 'icmp_ping_hosts', 'tcp_ping_hosts', 'rst_only', 'ping_hosts', 'run_ping_sweep',
+    'new_ring_buffer', 'ring_append', 'ring_values', 'render_sparkline', 'build_monitor_table',
+    'run_ping_monitor'
+]
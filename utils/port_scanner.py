@@ -0,0 +1,331 @@
+import asyncio
+import errno
+import ipaddress
+import os
+import socket
+import threading
+
+# --- Scan Engine Configuration ---
+DEFAULT_SCAN_CONCURRENCY = 500  # Non-blocking connects kept in flight (one worker each, so this is the global cap)
+DEFAULT_PER_HOST_CONCURRENCY = 100  # Cap per target so one host cannot starve the others
+MAX_BATCH_HOSTS = 65536  # Refuse target specs that expand beyond this (a /16)
+FD_RESERVE = 64  # File descriptors left free for the rest of the process
+
+# Adaptive connect timeout (RFC 6298 style SRTT/RTTVAR estimator, kept per host)
+INITIAL_CONNECT_TIMEOUT = 0.5  # Used until the host has answered at least once
+UNMEASURED_MAX_CONNECT_TIMEOUT = 1.0  # Backoff cap while there are no RTT samples (silent/filtered hosts)
+MIN_CONNECT_TIMEOUT = 0.05
+MAX_CONNECT_TIMEOUT = 3.0
+RTT_ALPHA = 0.125  # SRTT gain
+RTT_BETA = 0.25  # RTTVAR gain
+RTT_GRANULARITY = 0.01  # Lower bound for the variance term
+TIMEOUT_BACKOFF_STREAK = 10  # Consecutive timeouts before the timeout is doubled
+MAX_TIMEOUT_BACKOFF = 8.0
+# --- End Configuration ---
+
+# Bundled port -> service names, used where the system services database is missing
+# (common on minimal containers) or has no entry for a well-known port.
+FALLBACK_TCP_SERVICES = {
+    20: 'ftp-data', 21: 'ftp', 22: 'ssh', 23: 'telnet', 25: 'smtp', 53: 'domain',
+    67: 'bootps', 68: 'bootpc', 69: 'tftp', 80: 'http', 88: 'kerberos', 110: 'pop3',
+    111: 'sunrpc', 119: 'nntp', 123: 'ntp', 135: 'msrpc', 137: 'netbios-ns',
+    138: 'netbios-dgm', 139: 'netbios-ssn', 143: 'imap', 161: 'snmp', 162: 'snmptrap',
+    179: 'bgp', 389: 'ldap', 443: 'https', 445: 'microsoft-ds', 465: 'submissions',
+    514: 'shell', 515: 'printer', 543: 'klogin', 544: 'kshell', 548: 'afp',
+    554: 'rtsp', 587: 'submission', 631: 'ipp', 636: 'ldaps', 873: 'rsync',
+    902: 'vmware-auth', 993: 'imaps', 995: 'pop3s', 1080: 'socks', 1194: 'openvpn',
+    1433: 'ms-sql-s', 1434: 'ms-sql-m', 1521: 'oracle', 1723: 'pptp', 1883: 'mqtt',
+    2049: 'nfs', 2181: 'zookeeper', 2375: 'docker', 2376: 'docker-s', 2379: 'etcd-client',
+    2380: 'etcd-server', 3000: 'http-dev', 3128: 'squid-http', 3268: 'globalcatLDAP',
+    3306: 'mysql', 3389: 'ms-wbt-server', 3690: 'svn', 4369: 'epmd', 5000: 'upnp',
+    5060: 'sip', 5061: 'sips', 5353: 'mdns', 5432: 'postgresql', 5601: 'kibana',
+    5672: 'amqp', 5900: 'vnc', 5985: 'wsman', 5986: 'wsmans', 6379: 'redis',
+    6443: 'kubernetes-api', 6667: 'ircd', 7001: 'weblogic', 8000: 'http-alt',
+    8008: 'http-alt', 8080: 'http-proxy', 8081: 'http-alt', 8086: 'influxdb',
+    8443: 'https-alt', 8883: 'secure-mqtt', 8888: 'http-alt', 9000: 'cslistener',
+    9090: 'zeus-admin', 9092: 'kafka', 9100: 'jetdirect', 9200: 'elasticsearch',
+    9300: 'elasticsearch-nodes', 9418: 'git', 10250: 'kubelet', 11211: 'memcache',
+    15672: 'rabbitmq-mgmt', 25565: 'minecraft', 27017: 'mongodb', 32400: 'plex',
+}
+
+_service_index = None
+_service_index_lock = threading.Lock()
+
+
+def max_scan_concurrency(requested=DEFAULT_SCAN_CONCURRENCY):
+    """Clamp the requested concurrency so open sockets stay below the process file-descriptor limit."""
+    requested = max(1, int(requested))
+    try:
+        import resource  # Unix only
+        soft_limit, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if soft_limit != resource.RLIM_INFINITY:
+            return max(1, min(requested, soft_limit - FD_RESERVE))
+    except (ImportError, ValueError, OSError):
+        pass
+    return requested
+
+
+def parse_port_spec(spec):
+    """Parse a port list like '22,80,443,8000-8100' into a sorted list of unique ports."""
+    ports = set()
+    for part in spec.replace(' ', '').split(','):
+        if not part:
+            continue
+        try:
+            if '-' in part:
+                low_str, high_str = part.split('-', 1)
+                low, high = int(low_str), int(high_str)
+            else:
+                low = high = int(part)
+        except ValueError:
+            raise ValueError(f"Invalid port entry '{part}'.")
+        if not 1 <= low <= high <= 65535:
+            raise ValueError(f"Invalid port range '{part}' (1-65535).")
+        ports.update(range(low, high + 1))
+    if not ports:
+        raise ValueError("No ports specified.")
+    return sorted(ports)
+
+
+def expand_targets(spec):
+    """Expand a comma/space separated list of hosts, IPs and CIDR ranges.
+
+    Returns a list of (label, ip) tuples in input order with duplicates removed.
+    Raises ValueError for unresolvable hosts or oversized ranges.
+    """
+    targets = []
+    seen = set()
+    for entry in spec.replace(',', ' ').split():
+        if '/' in entry:
+            try:
+                network = ipaddress.ip_network(entry, strict=False)
+            except ValueError:
+                raise ValueError(f"Invalid CIDR range '{entry}'.")
+            if network.num_addresses > MAX_BATCH_HOSTS:
+                raise ValueError(f"Range '{entry}' is larger than {MAX_BATCH_HOSTS} addresses.")
+            # hosts() skips network/broadcast addresses, but is empty for /32 and /128
+            addresses = list(network.hosts()) or [network.network_address]
+            resolved = [(str(addr), str(addr)) for addr in addresses]
+        else:
+            try:
+                resolved = [(entry, str(ipaddress.ip_address(entry)))]
+            except ValueError:
+                try:
+                    resolved = [(entry, socket.gethostbyname(entry))]
+                except socket.gaierror:
+                    raise ValueError(f"Could not resolve hostname '{entry}'.")
+        for label, ip in resolved:
+            if ip not in seen:
+                seen.add(ip)
+                targets.append((label, ip))
+        if len(targets) > MAX_BATCH_HOSTS:
+            raise ValueError(f"Target list expands to more than {MAX_BATCH_HOSTS} hosts.")
+    if not targets:
+        raise ValueError("No targets specified.")
+    return targets
+
+
+def new_rtt_estimator():
+    """Create the per-host RTT state used to derive connect timeouts."""
+    return {
+        'srtt': None,
+        'rttvar': None,
+        'backoff': 1.0,
+        'timeout_streak': 0,
+        'backoff_since': 0.0,  # Probes started before this were sent with an older timeout
+    }
+
+
+def record_rtt_sample(estimator, rtt):
+    """Fold a measured handshake/refusal time into the estimate and clear any backoff."""
+    if estimator['srtt'] is None:
+        estimator['srtt'] = rtt
+        estimator['rttvar'] = rtt / 2
+    else:
+        estimator['rttvar'] = (1 - RTT_BETA) * estimator['rttvar'] + RTT_BETA * abs(estimator['srtt'] - rtt)
+        estimator['srtt'] = (1 - RTT_ALPHA) * estimator['srtt'] + RTT_ALPHA * rtt
+    estimator['backoff'] = 1.0
+    estimator['timeout_streak'] = 0
+
+
+def record_timeout(estimator, probe_started, now):
+    """Count a timed-out probe and back off after a streak of them.
+
+    Only probes sent with the current timeout count towards the streak, otherwise one burst
+    of concurrent timeouts would back off all the way in a single step.
+    """
+    if probe_started < estimator['backoff_since']:
+        return
+    estimator['timeout_streak'] += 1
+    if estimator['timeout_streak'] >= TIMEOUT_BACKOFF_STREAK and estimator['backoff'] < MAX_TIMEOUT_BACKOFF:
+        estimator['backoff'] = min(estimator['backoff'] * 2, MAX_TIMEOUT_BACKOFF)
+        estimator['timeout_streak'] = 0
+        estimator['backoff_since'] = now
+
+
+def current_timeout(estimator):
+    """Connect timeout for the next probe: SRTT + max(G, 4 * RTTVAR), scaled by backoff.
+
+    A host that has never answered keeps a short timeout (INITIAL_CONNECT_TIMEOUT, backing
+    off to UNMEASURED_MAX_CONNECT_TIMEOUT) so scanning a filtered host stays cheap.
+    """
+    if estimator['srtt'] is None:
+        base, cap = INITIAL_CONNECT_TIMEOUT, UNMEASURED_MAX_CONNECT_TIMEOUT
+    else:
+        base, cap = estimator['srtt'] + max(RTT_GRANULARITY, 4 * estimator['rttvar']), MAX_CONNECT_TIMEOUT
+    return min(cap, max(MIN_CONNECT_TIMEOUT, base * estimator['backoff']))
+
+
+def _services_file_path():
+    """Location of the system services database for this OS."""
+    if os.name == 'nt':
+        system_root = os.environ.get('SystemRoot', r'C:\Windows')
+        return os.path.join(system_root, 'System32', 'drivers', 'etc', 'services')
+    return '/etc/services'
+
+
+def _build_service_index():
+    """Read the services database once into a port -> name dict, filling gaps from the fallback table."""
+    index = {}
+    try:
+        with open(_services_file_path(), 'r', encoding='utf-8', errors='ignore') as f:
+            for line in f:
+                fields = line.split('#', 1)[0].split()
+                if len(fields) < 2 or '/' not in fields[1]:
+                    continue
+                port_str, proto = fields[1].split('/', 1)
+                if proto.lower() != 'tcp' or not port_str.isdigit():
+                    continue
+                # First entry wins, matching getservbyport()
+                index.setdefault(int(port_str), fields[0])
+    except OSError:
+        pass
+    for port, name in FALLBACK_TCP_SERVICES.items():
+        index.setdefault(port, name)
+    return index
+
+
+def get_service_name(port):
+    """Return the common TCP service name for a port, or None if it is unknown."""
+    global _service_index
+    if _service_index is None:
+        with _service_index_lock:
+            if _service_index is None:
+                _service_index = _build_service_index()
+    return _service_index.get(port)
+
+
+async def _probe_port(loop, host, port, timeout):
+    """Attempt one non-blocking TCP connect. Returns True if the port accepted the connection.
+
+    With timeout=None the host's adaptive estimate is used, and both handshakes and
+    refusals are fed back into it as RTT samples.
+    """
+    estimator = host['rtt']
+    probe_timeout = timeout if timeout is not None else current_timeout(estimator)
+    sock = socket.socket(host['family'], socket.SOCK_STREAM)
+    started = loop.time()
+    try:
+        sock.setblocking(False)
+        await asyncio.wait_for(loop.sock_connect(sock, (host['ip'], port)), probe_timeout)
+        record_rtt_sample(estimator, loop.time() - started)
+        return True
+    except asyncio.TimeoutError:
+        record_timeout(estimator, started, loop.time())
+        return False
+    except ConnectionRefusedError:
+        record_rtt_sample(estimator, loop.time() - started)
+        return False
+    except OSError as e:
+        if e.errno in (errno.EMFILE, errno.ENFILE):
+            raise  # Out of descriptors, let the caller abort the scan
+        return False
+    finally:
+        sock.close()
+
+
+async def scan_targets_async(target_ips, ports, concurrency=DEFAULT_SCAN_CONCURRENCY,
+                             per_host_concurrency=DEFAULT_PER_HOST_CONCURRENCY,
+                             timeout=None, on_result=None):
+    """Scan every (host, port) pair across one shared pool of concurrent connects.
+
+    The global cap is the number of workers: concurrency (clamped by max_scan_concurrency
+    to the fd limit) workers each keep at most one connect in flight. per_host_concurrency
+    (None for no cap) limits how many of them may probe the same host at once. Pairs are
+    scheduled port-major (every host's port N before any host's port N+1) so the per-host
+    cap rarely leaves workers idle. timeout=None derives each host's connect timeout
+    from its measured RTT; pass a number to force a fixed timeout. on_result(ip, port, is_open)
+    is called as each probe finishes. Returns a dict of ip -> sorted list of open ports.
+    """
+    loop = asyncio.get_running_loop()
+    concurrency = max_scan_concurrency(concurrency)
+    if per_host_concurrency is not None and per_host_concurrency >= concurrency:
+        per_host_concurrency = None  # A cap at or above the worker count can never be reached
+    hosts = {}
+    for ip in target_ips:
+        family = socket.AF_INET6 if ipaddress.ip_address(ip).version == 6 else socket.AF_INET
+        hosts[ip] = {'ip': ip, 'family': family,
+                     'semaphore': asyncio.Semaphore(max(1, per_host_concurrency)) if per_host_concurrency else None,
+                     'rtt': new_rtt_estimator()}
+    open_ports = {ip: [] for ip in hosts}
+    pair_iter = ((ip, port) for port in ports for ip in hosts)
+
+    async def worker():
+        # Workers pull from a shared iterator so only `concurrency` probes exist at once,
+        # even for a full 1-65535 sweep of a whole subnet.
+        for ip, port in pair_iter:
+            host = hosts[ip]
+            if host['semaphore'] is None:
+                is_open = await _probe_port(loop, host, port, timeout)
+            else:
+                async with host['semaphore']:
+                    is_open = await _probe_port(loop, host, port, timeout)
+            if is_open:
+                open_ports[ip].append(port)
+            if on_result:
+                on_result(ip, port, is_open)
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+    try:
+        await asyncio.gather(*workers)
+    finally:
+        for w in workers:
+            w.cancel()
+    return {ip: sorted(found) for ip, found in open_ports.items()}
+
+
+async def scan_ports_async(target_ip, ports, concurrency=DEFAULT_SCAN_CONCURRENCY,
+                           timeout=None, on_result=None):
+    """Scan ports on a single target_ip. on_result(port, is_open) is called per probe.
+
+    Returns the sorted list of open ports.
+    """
+    def per_port_result(ip, port, is_open):
+        if on_result:
+            on_result(port, is_open)
+
+    results = await scan_targets_async([target_ip], ports, concurrency, None,
+                                       timeout, per_port_result)
+    return results[target_ip]
+
+
+def scan_ports(target_ip, ports, concurrency=DEFAULT_SCAN_CONCURRENCY,
+               timeout=None, on_result=None):
+    """Blocking wrapper around scan_ports_async for use from the synchronous UI code."""
+    return asyncio.run(scan_ports_async(target_ip, ports, concurrency, timeout, on_result))
+
+
+def scan_targets(target_ips, ports, concurrency=DEFAULT_SCAN_CONCURRENCY,
+                 per_host_concurrency=DEFAULT_PER_HOST_CONCURRENCY,
+                 timeout=None, on_result=None):
+    """Blocking wrapper around scan_targets_async for use from the synchronous UI code."""
+    return asyncio.run(scan_targets_async(target_ips, ports, concurrency, per_host_concurrency,
+                                          timeout, on_result))
+
+
+__all__ = [
+    'DEFAULT_SCAN_CONCURRENCY', 'DEFAULT_PER_HOST_CONCURRENCY', 'INITIAL_CONNECT_TIMEOUT',
+    'UNMEASURED_MAX_CONNECT_TIMEOUT', 'MIN_CONNECT_TIMEOUT', 'MAX_CONNECT_TIMEOUT', 'max_scan_concurrency', 'parse_port_spec',
+    'expand_targets', 'get_service_name', 'new_rtt_estimator', 'record_rtt_sample', 'record_timeout', 'current_timeout',
+    'scan_targets_async', 'scan_ports_async', 'scan_targets', 'scan_ports'
+]
@@ -2,32 +2,88 @@ import psutil
 import time
 import os
 import sys
+import math
+import select
+import platform
+import threading
+from fnmatch import fnmatch
+from bisect import bisect_left
 from datetime import datetime
 
 # Rich imports
-from rich.console import Console
+from rich.console import Console, Group
 from rich.table import Table
 from rich.align import Align
 from rich.text import Text
 from rich.prompt import Prompt, Confirm
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
 from rich.live import Live
+from rich.panel import Panel
 from rich.box import DOUBLE
 
 # Local imports
 from utils.logging import log_event
 from utils.helpers import (
-    clear_screen, print_banner, get_key, format_seconds, console, save_output_to_file,
+    clear_screen, print_banner, get_key, format_seconds, format_duration, format_bytes, console, save_output_to_file,
     MAIN_STYLE, HIGHLIGHT_STYLE, HACKER_GREEN, BORDER_STYLE
 )
 
+# --- Process Table Configuration ---
+PROCESS_REFRESH_INTERVAL = 1.0  # Seconds between live table refreshes
+PROCESS_TABLE_ROWS = 40  # Rows shown in the live table
+PICKER_PAGE_SIZE = 20  # Rows rendered per page in the process picker
+PICKER_CPU_SAMPLE = 0.3  # Seconds between the two samples that give the picker its CPU% column
+PROCESS_SORT_MODES = ['cpu', 'memory', 'name']
+TERMINATE_GRACE_PERIOD = 3.0  # Seconds every process in a bulk terminate gets to exit before survivors are killed
+KILL_WAIT = 1.0  # Seconds to wait for killed processes to disappear
+BULK_PREVIEW_ROWS = 30  # Matches listed before a bulk terminate is confirmed
+# --- End Configuration ---
+
+# --- Completion Trigger Configuration ---
+WATCH_SAMPLE_INTERVAL = 2.0  # Seconds between activity samples of idle watches (exit-only watches block on exits instead)
+IDLE_EWMA_TAU = 30.0  # Seconds; time constant of the smoothed CPU/I/O rates, so short bursts and pauses average out
+IDLE_CPU_PERCENT = 2.0  # Smoothed CPU% (of one core) below which a process counts as idle
+IDLE_DISK_BYTES_PER_SEC = 64 * 1024  # Smoothed disk read+write rate below which it counts as idle
+IDLE_OTHER_BYTES_PER_SEC = 16 * 1024  # Smoothed network/pipe I/O rate below which it counts as idle
+DEFAULT_IDLE_WINDOW = 300  # Seconds a process must stay idle before the action fires
+COMPLETION_ACTION_DELAY = 60  # Seconds of warning before the OS acts (cancel with 'shutdown /a' or 'shutdown -c')
+MONITOR_TYPES = ['exit', 'idle']  # Finish when the processes exit, or when they exit or stay idle
+SNAPSHOT_MAX_AGE = 1.0  # Seconds a process-table snapshot is shared before the next caller rescans
+EXIT_WAKE_CHECK = 0.5  # Seconds between checks of the wake event while blocked on pidfds
+EXIT_FALLBACK_POLL = 0.2  # Seconds between checks of processes that have no pidfd
+# --- End Configuration ---
+
 # --- Global Variables for Process Monitoring ---
 monitored_processes = []  # List of dicts: {'pid': int|None, 'name': str, 'monitor_type': str, 'start_time': float, 'last_active': float}
+                          # While a watch runs each also has 'idle_window', 'status' and 'activity' (see update_watch)
+watch_lock = threading.Lock()  # Guards monitored_processes and watch_state; the monitor thread holds it while sampling
+watch_state = {'active': False, 'action': None, 'monitor_type': None, 'idle_window': DEFAULT_IDLE_WINDOW,
+               'started': None, 'ended': None, 'result': None}
+monitor_thread = None
+monitor_stop = threading.Event()
+monitor_wake = threading.Event()  # Interrupts the monitor thread's wait when the watch list changes or it is stopped
+process_snapshot = {'taken_at': None, 'procs': {}, 'by_name': {}}  # See take_process_snapshot()
+snapshot_lock = threading.Lock()
 # --- End Global Variables ---
 
 
-def select_running_process(arrow_menu_func):
-    """Select a running process to monitor from a list using the provided arrow_menu."""
+def _new_watch_entry(pid, name):
+    """A monitored_processes entry; joins the running watch straight away if there is one. Caller holds watch_lock."""
+    now = time.time()
+    entry = {'pid': pid, 'name': name, 'monitor_type': None, 'start_time': None, 'last_active': now}
+    if watch_state['active']:
+        entry.update(monitor_type=watch_state['monitor_type'], start_time=now,
+                     idle_window=watch_state['idle_window'], status='waiting')
+        monitor_wake.set()  # Let the monitor thread pick the new entry up now
+    return entry
+
+
+def select_running_process(arrow_menu_func=None):
+    """Select a running process to monitor with the filterable process picker.
+
+    arrow_menu_func is accepted for compatibility with existing callers; the picker renders
+    one page at a time instead of handing thousands of options to arrow_menu.
+    """
     global monitored_processes
 
     clear_screen()
@@ -36,51 +92,25 @@ def select_running_process(arrow_menu_func):
     console.print(Align.center(title))
     console.print()
 
-    running_processes_info = []
     try:
-        with Progress(SpinnerColumn(), TextColumn("Loading processes..."), transient=True, console=console) as progress:
-            progress.add_task("", total=None)
-            attrs = ['pid', 'name', 'status']
-            for proc in psutil.process_iter(attrs=attrs, ad_value=None):
-                pinfo = proc.info
-                if pinfo['pid'] is not None and pinfo['pid'] > 4 and \
-                        pinfo['name'] and pinfo['name'].lower() not in ['system idle process', 'system'] and \
-                        pinfo['status'] != psutil.STATUS_ZOMBIE:
-                    running_processes_info.append(pinfo)
+        selected_process = pick_process("Select Process to Monitor")
     except Exception as e:
         console.print(Align.center(Text(f"Error loading processes: {e}", style="bold red")))
         time.sleep(2)
         clear_screen()
         return
 
-    if not running_processes_info:
-        console.print(Align.center(Text("No suitable running processes found to select.", style="yellow")))
-        time.sleep(2)
+    if selected_process is None:
         clear_screen()
         return
 
-    running_processes_info.sort(key=lambda p: p['name'].lower())
-    process_options = [f"{p['name']} (PID: {p['pid']})" for p in running_processes_info]
-    process_options.append("Back")
-
-    selected_index = arrow_menu_func("Select Process to Monitor", process_options)
-
-    if selected_index == -1 or selected_index == len(running_processes_info):
-        clear_screen()
-        return
-
-    selected_process = running_processes_info[selected_index]
-
-    if any(p['pid'] == selected_process['pid'] for p in monitored_processes):
+    with watch_lock:
+        already_monitored = any(p['pid'] == selected_process['pid'] for p in monitored_processes)
+        if not already_monitored:
+            monitored_processes.append(_new_watch_entry(selected_process['pid'], selected_process['name']))
+    if already_monitored:
         console.print(Align.center(Text(f"Process {selected_process['name']} (PID: {selected_process['pid']}) is already being monitored.", style="yellow")))
     else:
-        monitored_processes.append({
-            'pid': selected_process['pid'],
-            'name': selected_process['name'],
-            'monitor_type': None,
-            'start_time': None,
-            'last_active': time.time()
-        })
         console.print(Align.center(Text(f"Added {selected_process['name']} (PID: {selected_process['pid']}) to monitoring list.", style=f"bold {HACKER_GREEN}")))
         log_event(f"Added process {selected_process['name']} (PID: {selected_process['pid']}) for monitoring")
 
@@ -112,17 +142,20 @@ def enter_process_manually():
         console.print(Align.center(Text("\nGoodbye!", style=f"bold {HACKER_GREEN}")))
         sys.exit()
 
-    if any(p.get('name', '').lower() == process_name.lower() for p in monitored_processes):
+    with watch_lock:
+        already_monitored = any(p['pid'] is None and normalize_process_name(p['name']) == normalize_process_name(process_name)
+                                for p in monitored_processes)
+        if not already_monitored:
+            monitored_processes.append(_new_watch_entry(None, process_name))
+    if already_monitored:
         console.print(Align.center(Text(f"Process name '{process_name}' is already in the monitoring list.", style="yellow")))
     else:
-        monitored_processes.append({
-            'pid': None,
-            'name': process_name,
-            'monitor_type': None,
-            'start_time': None,
-            'last_active': time.time()
-        })
-        console.print(Align.center(Text(f"Added '{process_name}' to monitoring list. Will monitor any process with this name.", style=f"bold {HACKER_GREEN}")))
+        try:
+            running = len(processes_named(process_name))
+        except Exception:
+            running = None
+        running_text = f" ({running} running now)" if running is not None else ""
+        console.print(Align.center(Text(f"Added '{process_name}' to monitoring list{running_text}. Will monitor any process with this name.", style=f"bold {HACKER_GREEN}")))
         log_event(f"Added process name '{process_name}' for monitoring")
 
     time.sleep(1.5)
@@ -137,15 +170,21 @@ def view_selected_processes():
     console.print(Align.center(title))
     console.print()
 
-    if not monitored_processes:
+    with watch_lock:
+        if not monitored_processes:
+            table = None
+        elif watch_state['active']:
+            table = build_watch_table(monitored_processes)
+        else:
+            table = Table(box=DOUBLE, border_style=BORDER_STYLE, title=f"[{HACKER_GREEN}]Monitored Processes[/{HACKER_GREEN}]")
+            table.add_column("Process Name", style=MAIN_STYLE)
+            table.add_column("PID", style=MAIN_STYLE)
+            for process in monitored_processes:
+                pid_str = str(process['pid']) if process['pid'] is not None else "[dim]By Name[/dim]"
+                table.add_row(process['name'], pid_str)
+    if table is None:
         console.print(Align.center(Text("No processes selected for monitoring.", style="yellow")))
     else:
-        table = Table(box=DOUBLE, border_style=BORDER_STYLE, title=f"[{HACKER_GREEN}]Monitored Processes[/{HACKER_GREEN}]")
-        table.add_column("Process Name", style=MAIN_STYLE)
-        table.add_column("PID", style=MAIN_STYLE)
-        for process in monitored_processes:
-            pid_str = str(process['pid']) if process['pid'] is not None else "[dim]By Name[/dim]"
-            table.add_row(process['name'], pid_str)
         console.print(Align.center(table))
 
     console.print()
@@ -169,9 +208,14 @@ def clear_selected_processes():
     if not monitored_processes:
         console.print(Align.center(Text("No processes are currently selected.", style="yellow")))
     else:
-        confirm = Confirm.ask(f"Clear all {len(monitored_processes)} selected processes?", default=False)
+        prompt = f"Clear all {len(monitored_processes)} selected processes?"
+        if watch_state['active']:
+            prompt += " This also stops the running watch."
+        confirm = Confirm.ask(prompt, default=False)
         if confirm:
-            monitored_processes = []
+            stop_process_monitoring()
+            with watch_lock:
+                monitored_processes.clear()  # In place: the monitor thread shares this list
             console.print(Align.center(Text("All selected processes have been cleared.", style=f"bold {HACKER_GREEN}")))
             log_event("Cleared all monitored processes")
         else:
@@ -194,42 +238,163 @@ def list_running_processes():
     return processes
 
 
-def display_running_processes():
-    """Display running processes in a table."""
+def sample_processes(cache, now=None):
+    """Refresh a {pid: entry} process cache in place and return it.
+
+    Only PIDs that appeared since the last call get a psutil.Process object and have their
+    static attributes (name, user) read; PIDs that went away are dropped. Every live process
+    then has its changing counters read inside a single oneshot() so each costs one or two
+    /proc reads. I/O rates come from the counter delta since the previous sample; processes
+    whose I/O counters are access-denied are not asked again.
+    """
+    now = time.monotonic() if now is None else now
+    current = set(psutil.pids())
+    for pid in list(cache):
+        if pid not in current:
+            del cache[pid]
+
+    for pid in current:
+        entry = cache.get(pid)
+        if entry is None:
+            try:
+                proc = psutil.Process(pid)
+                with proc.oneshot():
+                    name = proc.name()
+                    try:
+                        username = proc.username()
+                    except (psutil.AccessDenied, KeyError):
+                        username = "N/A"
+                    proc.cpu_percent(None)  # Prime the CPU counter; the first reading is always 0
+            except (psutil.NoSuchProcess, psutil.ZombieProcess, psutil.AccessDenied):
+                continue
+            entry = cache[pid] = {
+                'proc': proc, 'pid': pid, 'name': name, 'username': username,
+                'cpu': 0.0, 'rss': None, 'threads': None, 'io': None, 'io_denied': False,
+                'read_rate': None, 'write_rate': None, 'sampled_at': None,
+            }
+            continue
+
+        proc = entry['proc']
+        try:
+            with proc.oneshot():
+                entry['cpu'] = proc.cpu_percent(None)
+                entry['rss'] = proc.memory_info().rss
+                entry['threads'] = proc.num_threads()
+                io = None
+                if not entry['io_denied'] and hasattr(proc, 'io_counters'):
+                    try:
+                        counters = proc.io_counters()
+                        io = (counters.read_bytes, counters.write_bytes)
+                    except psutil.AccessDenied:
+                        entry['io_denied'] = True
+        except psutil.ZombieProcess:
+            entry['cpu'] = 0.0  # Exited but not yet reaped; keep it listed without re-reading it
+            entry['zombie'] = True
+            continue
+        except psutil.NoSuchProcess:
+            del cache[pid]
+            continue
+        except psutil.AccessDenied:
+            continue  # Keep whatever we could read before
+        if io is not None and entry['io'] is not None and entry['sampled_at'] is not None:
+            elapsed = max(now - entry['sampled_at'], 1e-6)
+            entry['read_rate'] = max(0, io[0] - entry['io'][0]) / elapsed
+            entry['write_rate'] = max(0, io[1] - entry['io'][1]) / elapsed
+        entry['io'] = io
+        entry['sampled_at'] = now
+    return cache
+
+
+def _process_row(entry):
+    """Table cells for one process, rebuilt only when its displayed values changed."""
+    key = (entry['cpu'], entry['rss'], entry['threads'], entry['read_rate'], entry['write_rate'])
+    if entry.get('row_key') != key:
+        rate = lambda value: f"{format_bytes(value)}/s" if value is not None else "-"
+        entry['row'] = (str(entry['pid']), entry['name'], entry['username'], f"{entry['cpu']:.1f}",
+                        format_bytes(entry['rss']), str(entry['threads'] or "-"),
+                        rate(entry['read_rate']), rate(entry['write_rate']))
+        entry['row_key'] = key
+    return entry['row']
+
+
+def _sort_entries(entries, sort_by):
+    """Order process entries by 'cpu' or 'memory' (highest first) or 'name'."""
+    if sort_by == 'name':
+        return sorted(entries, key=lambda e: (e['name'].lower(), e['pid']))
+    if sort_by == 'memory':
+        return sorted(entries, key=lambda e: (e['rss'] or 0, e['cpu']), reverse=True)
+    return sorted(entries, key=lambda e: (e['cpu'], e['rss'] or 0), reverse=True)
+
+
+def build_process_table(cache, limit=PROCESS_TABLE_ROWS, sort_by='cpu'):
+    """Top processes by the chosen sort mode as a Rich table."""
+    entries = _sort_entries(cache.values(), sort_by)
+    total_cpu = sum(e['cpu'] for e in entries)
+    total_rss = sum(e['rss'] or 0 for e in entries)
+    table = Table(title=f"[bold {HACKER_GREEN}]Running Processes ({len(entries)} total, CPU {total_cpu:.0f}%, RSS {format_bytes(total_rss)})[/bold {HACKER_GREEN}]",
+                  show_header=True, header_style=f"bold {HACKER_GREEN}", box=DOUBLE, border_style=BORDER_STYLE)
+    table.add_column("PID", style="dim", justify="right")
+    table.add_column("Name", style=MAIN_STYLE)
+    table.add_column("User", style=MAIN_STYLE)
+    table.add_column("CPU %", style=MAIN_STYLE, justify="right")
+    table.add_column("RSS", style=MAIN_STYLE, justify="right")
+    table.add_column("Threads", style=MAIN_STYLE, justify="right")
+    table.add_column("Read", style=MAIN_STYLE, justify="right")
+    table.add_column("Write", style=MAIN_STYLE, justify="right")
+    for entry in entries[:limit]:
+        table.add_row(*_process_row(entry))
+    table.caption = f"Sorted by {sort_by}" + (f", showing {limit} of {len(entries)}" if len(entries) > limit else "")
+    return table
+
+
+def display_running_processes(refresh_interval=PROCESS_REFRESH_INTERVAL):
+    """Display a live, top-like process table until a key is pressed."""
     clear_screen()
     print_banner()
     title = Text("Running Processes", style=f"bold {HACKER_GREEN}")
     console.print(Align.center(title))
+    console.print(Align.center(Text(f"Refreshing every {refresh_interval:g}s. C/M/N sort by CPU/memory/name, any other key stops.", style="dim")))
     console.print()
 
-    processes = list_running_processes()
-    if not processes:
+    cache = {}
+    try:
+        sample_processes(cache)
+    except Exception as e:
+        console.print(Align.center(Text(f"Error listing processes: {e}", style="bold red")))
+
+    if not cache:
         console.print(Align.center(Text("[bold yellow]No running processes found or accessible.[/bold yellow]")))
     else:
-        table = Table(title="Running Processes", show_header=True, header_style=f"bold {HACKER_GREEN}", box=DOUBLE, border_style=BORDER_STYLE)
-        table.add_column("PID", style="dim", justify="right")
-        table.add_column("Name", style=MAIN_STYLE)
-
-        processes.sort(key=lambda p: p['name'].lower())
-
-        for proc in processes:
-            pid_str = str(proc.get('pid', 'N/A'))
-            name_str = proc.get('name', 'Unknown')
-            table.add_row(pid_str, name_str)
-
-        console.print(Align.center(table))
+        sort_by = 'cpu'
+        sort_keys = {'c': 'cpu', 'm': 'memory', 'n': 'name'}
+        # Redraws happen on our own schedule; Live's refresh thread is disabled
+        with Live(Align.center(build_process_table(cache, sort_by=sort_by)), console=console, auto_refresh=False) as live:
+            next_sample = time.monotonic() + refresh_interval
+            while True:
+                key = get_key(wasd=False)
+                if key is not None:
+                    if key.lower() not in sort_keys:
+                        break
+                    sort_by = sort_keys[key.lower()]
+                    live.update(Align.center(build_process_table(cache, sort_by=sort_by)), refresh=True)
+                now = time.monotonic()
+                if now >= next_sample:
+                    sample_processes(cache, now)
+                    live.update(Align.center(build_process_table(cache, sort_by=sort_by)), refresh=True)
+                    next_sample = max(next_sample + refresh_interval, now)
+                time.sleep(min(0.1, max(0, next_sample - time.monotonic())))
 
     console.print()
 
-    if processes:
+    if cache:
+        snapshot = sorted(cache.values(), key=lambda e: e['name'].lower())
+
         def generate_save_content():
             lines = [f"Running Processes ({datetime.now().strftime('%Y-%m-%d %H:%M:%S')})"]
             lines.append("-" * 30)
-            lines.append("PID\tName")
-            for proc in processes:
-                pid_str = str(proc.get('pid', 'N/A'))
-                name_str = proc.get('name', 'Unknown')
-                lines.append(f"{pid_str}\t{name_str}")
+            lines.append("PID\tName\tUser\tCPU%\tRSS\tThreads\tRead/s\tWrite/s")
+            for entry in snapshot:
+                lines.append("\t".join(_process_row(entry)))
             return "\n".join(lines)
         save_output_to_file(generate_save_content, "running_processes")
 
@@ -240,6 +405,143 @@ def display_running_processes():
     clear_screen()
 
 
+def build_name_index(entries):
+    """Sorted (lower-case name, position) pairs so a name prefix maps to one bisect range."""
+    return sorted((entry['name'].lower(), position) for position, entry in enumerate(entries))
+
+
+def prefix_range(name_index, prefix, lo=0, hi=None):
+    """Bounds of the name_index slice whose names start with prefix.
+
+    Pass the previous (lo, hi) when the prefix only grew, so each keystroke narrows the
+    range it already has instead of searching the whole index again.
+    """
+    hi = len(name_index) if hi is None else hi
+    start = bisect_left(name_index, (prefix,), lo, hi)
+    end = bisect_left(name_index, (prefix + "\U0010ffff",), start, hi)
+    return start, end
+
+
+def _picker_candidates():
+    """Load selectable processes with CPU% measured over a short interval."""
+    cache = {}
+    sample_processes(cache)
+    time.sleep(PICKER_CPU_SAMPLE)
+    sample_processes(cache)
+    own_pid = os.getpid()
+    return [entry for entry in cache.values()
+            if entry['pid'] > 4 and entry['pid'] != own_pid and entry['name'] and not entry.get('zombie') and
+            entry['name'].lower() not in ['system idle process', 'system']]
+
+
+def pick_process(title, entries=None, page_size=PICKER_PAGE_SIZE):
+    """Interactive process picker that scales to thousands of processes.
+
+    The banner and title are drawn once; each keypress only swaps the visible page inside
+    a Live region. Typing filters by name prefix (or PID prefix for digits) through sorted
+    name/PID indexes, and a growing filter narrows the previous matches instead of the whole
+    list. Tab cycles the sort order, arrows and PgUp/PgDn move, Enter picks and Esc clears
+    the filter or cancels. Returns the chosen process entry (see sample_processes) or None.
+    """
+    if entries is None:
+        with Progress(SpinnerColumn(), TextColumn("Loading processes..."), transient=True, console=console) as progress:
+            progress.add_task("", total=None)
+            entries = _picker_candidates()
+    if not entries:
+        return None
+
+    name_index = build_name_index(entries)
+    pid_index = sorted((str(entry['pid']), position) for position, entry in enumerate(entries))
+    position_of = {id(entry): position for position, entry in enumerate(entries)}
+    orders = {mode: [position_of[id(entry)] for entry in _sort_entries(entries, mode)]
+              for mode in PROCESS_SORT_MODES}
+
+    sort_mode = 0
+    query = ""
+    index = name_index
+    bounds = (0, len(name_index))
+    visible = orders[PROCESS_SORT_MODES[sort_mode]]
+    cursor = 0
+
+    def refilter(narrowing):
+        nonlocal index, bounds, visible, cursor
+        order = orders[PROCESS_SORT_MODES[sort_mode]]
+        if not query:
+            index, bounds = name_index, (0, len(name_index))
+            visible = order
+        else:
+            wanted = pid_index if query.isdigit() else name_index
+            # Only a longer query over the same index can reuse the previous range and matches
+            narrowing = narrowing and wanted is index and len(query) > 1
+            index = wanted
+            lo, hi = bounds if narrowing else (0, len(index))
+            bounds = prefix_range(index, query.lower(), lo, hi)
+            matches = {position for _, position in index[bounds[0]:bounds[1]]}
+            visible = [position for position in (visible if narrowing else order) if position in matches]
+        cursor = min(cursor, max(0, len(visible) - 1))
+
+    def build_frame():
+        page_start = (cursor // page_size) * page_size
+        table = Table(box=DOUBLE, border_style=BORDER_STYLE, header_style=f"bold {HACKER_GREEN}",
+                      caption=f"{page_start + 1 if visible else 0}-{min(page_start + page_size, len(visible))} of {len(visible)} "
+                              f"(from {len(entries)}) | Sort: {PROCESS_SORT_MODES[sort_mode]} (Tab) | "
+                              f"Up/Down/PgUp/PgDn move, Enter selects, Esc clears/cancels")
+        table.add_column("PID", justify="right")
+        table.add_column("Name")
+        table.add_column("User")
+        table.add_column("CPU %", justify="right")
+        table.add_column("RSS", justify="right")
+        for row_number, position in enumerate(visible[page_start:page_start + page_size], start=page_start):
+            entry = entries[position]
+            style = HIGHLIGHT_STYLE if row_number == cursor else MAIN_STYLE
+            table.add_row(str(entry['pid']), entry['name'], str(entry['username']),
+                          f"{entry['cpu']:.1f}", format_bytes(entry['rss']), style=style)
+        filter_line = Text(f"Filter: {query or '(type a name or PID)'}", style=MAIN_STYLE if query else "dim")
+        return Group(Align.center(filter_line), Text(""), Align.center(table))
+
+    clear_screen()
+    print_banner()
+    console.print(Align.center(Text(title, style=f"bold {HACKER_GREEN}")))
+    # Redraws happen per keypress; Live's refresh thread is disabled
+    with Live(build_frame(), console=console, auto_refresh=False) as live:
+        while True:
+            key = None
+            while key is None:
+                key = get_key(wasd=False)
+                time.sleep(0.02)
+
+            if key == 'UP':
+                cursor = max(0, cursor - 1)
+            elif key == 'DOWN':
+                cursor = min(max(0, len(visible) - 1), cursor + 1)
+            elif key == 'PGUP':
+                cursor = max(0, cursor - page_size)
+            elif key == 'PGDN':
+                cursor = min(max(0, len(visible) - 1), cursor + page_size)
+            elif key in ('ENTER', 'RIGHT'):
+                if visible:
+                    return entries[visible[cursor]]
+            elif key == 'ESC' or (key == 'LEFT' and not query):
+                if not query:
+                    return None
+                query = ""
+                refilter(False)
+            elif key == 'BACKSPACE':
+                query = query[:-1]
+                refilter(False)
+            elif key == '\t':
+                sort_mode = (sort_mode + 1) % len(PROCESS_SORT_MODES)
+                cursor = 0
+                refilter(False)
+            elif len(key) == 1 and key.isprintable():
+                query += key
+                cursor = 0
+                refilter(True)
+            else:
+                continue
+            live.update(build_frame(), refresh=True)
+
+
 def terminate_process(pid):
     """Attempts to terminate a process by its PID."""
     try:
@@ -295,51 +597,234 @@ def terminate_process(pid):
         return False
 
 
-def select_process_to_terminate(arrow_menu_func):
-    """Displays running processes and prompts user to select one to terminate."""
+def match_by_pattern(entries, pattern):
+    """Entries whose name matches a shell-style pattern such as 'worker*' or 'python?.exe' (case-insensitive)."""
+    pattern = pattern.strip().lower()
+    return [entry for entry in entries if fnmatch(entry['name'].lower(), pattern)]
+
+
+def match_by_user(entries, username):
+    """Entries owned by username; a bare name also matches DOMAIN\\name accounts."""
+    username = username.strip().lower()
+    matches = []
+    for entry in entries:
+        owner = (entry['username'] or "").lower()
+        if owner == username or owner.rsplit('\\', 1)[-1] == username:
+            matches.append(entry)
+    return matches
+
+
+def collect_process_tree(root_pid):
+    """The process and all its descendants, deepest first, so children are always signalled before their parents."""
+    root = psutil.Process(root_pid)
+    depth = {root.pid: 0}
+    tree = [root]
+    for child in root.children(recursive=True):  # Parents come before their own children here
+        try:
+            depth[child.pid] = depth.get(child.ppid(), 0) + 1
+        except psutil.NoSuchProcess:
+            continue
+        tree.append(child)
+    return sorted(tree, key=lambda proc: depth.get(proc.pid, 0), reverse=True)
+
+
+def protected_pids():
+    """PIDs a bulk terminate never signals: 0, 1, this tool and every process above it (its shell, terminal, ...)."""
+    protected = {0, 1, os.getpid()}
+    try:
+        protected.update(proc.pid for proc in psutil.Process().parents())
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        pass
+    return protected
+
+
+def split_protected(procs):
+    """Split procs into (allowed, excluded) using protected_pids(), keeping their order."""
+    protected = protected_pids()
+    allowed = [proc for proc in procs if proc.pid not in protected]
+    excluded = [proc for proc in procs if proc.pid in protected]
+    return allowed, excluded
+
+
+def terminate_processes(procs, grace_period=TERMINATE_GRACE_PERIOD, kill_survivors=True):
+    """Terminate many processes at once: signal them all, wait once, then kill only the survivors.
+
+    Every process is sent terminate() (SIGTERM, or TerminateProcess on Windows) in the order
+    given, then a single psutil.wait_procs() call waits for all of them against one shared
+    deadline. Only those still running afterwards are killed when kill_survivors is set.
+    protected_pids() (PID 0/1, this tool and its ancestors) are never signalled. Returns
+    {'terminated', 'killed', 'alive', 'denied', 'gone', 'protected'} lists of psutil.Process.
+    """
+    result = {'terminated': [], 'killed': [], 'alive': [], 'denied': [], 'gone': [], 'protected': []}
+    procs, result['protected'] = split_protected(procs)
+    signalled = []
+    for proc in procs:
+        try:
+            proc.terminate()
+            signalled.append(proc)
+        except psutil.NoSuchProcess:
+            result['gone'].append(proc)
+        except psutil.AccessDenied:
+            result['denied'].append(proc)
+
+    gone, alive = psutil.wait_procs(signalled, timeout=grace_period)
+    result['terminated'] = gone
+    if alive and kill_survivors:
+        for proc in alive:
+            try:
+                proc.kill()
+            except psutil.NoSuchProcess:
+                pass
+            except psutil.AccessDenied:
+                result['denied'].append(proc)
+        killed, alive = psutil.wait_procs([proc for proc in alive if proc not in result['denied']], timeout=KILL_WAIT)
+        result['killed'] = killed
+    result['alive'] = alive
+    return result
+
+
+def _bulk_targets(mode):
+    """Ask for the selection for one bulk mode.
+
+    Returns (description, [psutil.Process], [protected psutil.Process left out]) or None.
+    """
+    if mode == 'tree':
+        root = pick_process("Select Root of the Process Tree")
+        if root is None:
+            return None
+        try:
+            procs = collect_process_tree(root['pid'])
+        except psutil.NoSuchProcess:
+            return f"tree of {root['name']} (PID {root['pid']})", [], []
+        return (f"tree of {root['name']} (PID {root['pid']})",) + tuple(split_protected(procs))
+
     clear_screen()
     print_banner()
-    title = Text("Terminate Process", style=f"bold {HACKER_GREEN}")
-    console.print(Align.center(title))
+    console.print(Align.center(Text("Bulk Terminate", style=f"bold {HACKER_GREEN}")))
     console.print()
+    if mode == 'pattern':
+        pattern = Prompt.ask("[bold]Name pattern[/bold] (e.g. worker*, chrome.exe, python?)")
+        if not pattern.strip():
+            return None
+        description = f"name matching '{pattern.strip()}'"
+    else:
+        try:
+            default_user = psutil.Process().username()
+        except (psutil.AccessDenied, KeyError):
+            default_user = None
+        pattern = Prompt.ask("[bold]User name[/bold]", default=default_user)
+        if not pattern or not pattern.strip():
+            return None
+        description = f"user '{pattern.strip()}'"
 
-    running_processes_info = []
+    with Progress(SpinnerColumn(), TextColumn("Loading processes..."), transient=True, console=console) as progress:
+        progress.add_task("", total=None)
+        entries = _picker_candidates()
+    matches = match_by_pattern(entries, pattern) if mode == 'pattern' else match_by_user(entries, pattern)
+    return (description,) + tuple(split_protected([entry['proc'] for entry in _sort_entries(matches, 'name')]))
+
+
+def bulk_terminate(mode, arrow_menu_func=None):
+    """Terminate every process matched by 'pattern', 'user' or 'tree' after one confirmation."""
     try:
-        with Progress(SpinnerColumn(), TextColumn("Loading processes..."), transient=True, console=console) as progress:
-            progress.add_task("", total=None)
-            attrs = ['pid', 'name', 'status', 'username']  # Add username for context
-            for proc in psutil.process_iter(attrs=attrs, ad_value='N/A'):  # Use ad_value for missing attrs
-                pinfo = proc.info
-                # Filter out low PIDs, system processes, idle, and potentially self
-                if pinfo['pid'] is not None and pinfo['pid'] > 4 and \
-                        pinfo['name'] and pinfo['name'].lower() not in ['system idle process', 'system'] and \
-                        pinfo['status'] != psutil.STATUS_ZOMBIE and \
-                        pinfo['pid'] != os.getpid():  # Don't list self
-                    running_processes_info.append(pinfo)
+        selection = _bulk_targets(mode)
     except Exception as e:
         console.print(Align.center(Text(f"Error loading processes: {e}", style="bold red")))
         time.sleep(2)
-        return  # Go back to menu
+        return
+    if selection is None:
+        return
+    description, procs, excluded = selection
+
+    clear_screen()
+    print_banner()
+    console.print(Align.center(Text(f"Bulk Terminate: {description}", style=f"bold {HACKER_GREEN}")))
+    console.print()
+    if excluded:
+        own_pid = os.getpid()
+        skipped = []
+        for proc in excluded:
+            try:
+                name = proc.name()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                name = "?"
+            reason = "this tool" if proc.pid == own_pid else "system" if proc.pid in (0, 1) else "runs this tool"
+            skipped.append(f"{name} ({proc.pid}, {reason})")
+        console.print(Align.center(Text(f"Protected, will not be terminated: {', '.join(skipped)}", style="yellow")))
+        console.print()
+    if not procs:
+        console.print(Align.center(Text("No matching processes.", style="yellow")))
+    else:
+        table = Table(box=DOUBLE, border_style=BORDER_STYLE, header_style=f"bold {HACKER_GREEN}",
+                      title=f"[{HACKER_GREEN}]{len(procs)} process(es){', children first' if mode == 'tree' else ''}[/{HACKER_GREEN}]")
+        table.add_column("PID", justify="right", style="dim")
+        table.add_column("Name", style=MAIN_STYLE)
+        table.add_column("User", style=MAIN_STYLE)
+        for proc in procs[:BULK_PREVIEW_ROWS]:
+            try:
+                with proc.oneshot():
+                    table.add_row(str(proc.pid), proc.name(), proc.username())
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                table.add_row(str(proc.pid), "?", "?")
+        if len(procs) > BULK_PREVIEW_ROWS:
+            table.caption = f"... and {len(procs) - BULK_PREVIEW_ROWS} more"
+        console.print(Align.center(table))
+        console.print()
+
+        if Confirm.ask(f"Terminate all {len(procs)} process(es)?", default=False):
+            kill_survivors = Confirm.ask(f"Force kill any still running after {TERMINATE_GRACE_PERIOD:g}s? (May cause data loss)", default=False)
+            with Progress(SpinnerColumn(), TextColumn(f"Terminating {len(procs)} process(es)..."), transient=True, console=console) as progress:
+                progress.add_task("", total=None)
+                result = terminate_processes(procs, kill_survivors=kill_survivors)
+            summary = (f"{len(result['terminated']) + len(result['gone'])} exited, {len(result['killed'])} force killed, "
+                       f"{len(result['alive'])} still running, {len(result['denied'])} access denied")
+            console.print(Align.center(Text(summary, style=f"bold {HACKER_GREEN}" if not result['alive'] and not result['denied'] else "yellow")))
+            for label in ('alive', 'denied'):
+                if result[label]:
+                    pids = ", ".join(str(proc.pid) for proc in result[label][:20])
+                    console.print(Align.center(Text(f"{'Still running' if label == 'alive' else 'Access denied'}: {pids}", style="dim")))
+            if result['denied']:
+                console.print(Align.center(Text("Try running as administrator for the access-denied processes.", style="dim")))
+            log_event(f"Bulk terminate of {description}: {summary}")
+        else:
+            console.print("Termination cancelled.", style="yellow")
+            log_event(f"Bulk termination cancelled by user for {description}")
+
+    console.print()
+    instruction = Text("Press any key to return...", style=MAIN_STYLE)
+    console.print(Align.center(instruction))
+    while get_key() is None:
+        time.sleep(0.1)
 
-    if not running_processes_info:
-        console.print(Align.center(Text("No suitable running processes found to terminate.", style="yellow")))
-        time.sleep(2)
-        return  # Go back to menu
 
-    # Sort by name
-    running_processes_info.sort(key=lambda p: p['name'].lower())
+def select_process_to_terminate(arrow_menu_func=None):
+    """Terminate one picked process, or many at once by name pattern, user or process tree."""
+    if arrow_menu_func is not None:
+        modes = [None, 'pattern', 'user', 'tree']
+        choice = arrow_menu_func("Terminate Processes", ["Single Process", "By Name Pattern", "By User",
+                                                         "Process Tree (children first)", "Back"])
+        if not 0 <= choice < len(modes):
+            return
+        if modes[choice] is not None:
+            bulk_terminate(modes[choice], arrow_menu_func)
+            return
 
-    # Create options for arrow_menu
-    process_options = [f"{p['name']} (PID: {p['pid']}, User: {p['username']})" for p in running_processes_info]
-    process_options.append("Back")
+    clear_screen()
+    print_banner()
+    title = Text("Terminate Process", style=f"bold {HACKER_GREEN}")
+    console.print(Align.center(title))
+    console.print()
 
-    # Use the passed arrow_menu function for selection
-    selected_index = arrow_menu_func("Select Process to Terminate", process_options)
+    try:
+        selected_process = pick_process("Select Process to Terminate")
+    except Exception as e:
+        console.print(Align.center(Text(f"Error loading processes: {e}", style="bold red")))
+        time.sleep(2)
+        return  # Go back to menu
 
-    if selected_index == -1 or selected_index == len(running_processes_info):  # Back selected or ESC
+    if selected_process is None:  # Nothing to pick, or Esc
         return  # Go back to menu
 
-    selected_process = running_processes_info[selected_index]
     pid_to_terminate = selected_process['pid']
     process_name = selected_process['name']
 
@@ -358,3 +843,524 @@ def select_process_to_terminate(arrow_menu_func):
     while get_key() is None:
         time.sleep(0.1)
     # No clear_screen here, let arrow_menu handle it
+
+
+def normalize_process_name(name):
+    """Index key for a process name: case-insensitive, with a trailing .exe dropped so 'chrome' matches 'chrome.exe'."""
+    key = (name or "").strip().lower()
+    return key[:-4] if key.endswith('.exe') else key
+
+
+def take_process_snapshot(max_age=SNAPSHOT_MAX_AGE):
+    """Return the shared process-table snapshot, rescanning it if it is older than max_age.
+
+    One process_iter pass builds {'procs': {pid: Process}, 'by_name': {name key: set of
+    PIDs}} (zombies left out), so any number of name lookups in the same interval are
+    dictionary hits rather than one full scan each. Callers must treat it as read-only.
+    """
+    global process_snapshot
+    with snapshot_lock:
+        taken_at = process_snapshot['taken_at']
+        if taken_at is not None and time.monotonic() - taken_at < max_age:
+            return process_snapshot
+        procs = {}
+        by_name = {}
+        for proc in psutil.process_iter(['name', 'status']):
+            if proc.info['status'] == psutil.STATUS_ZOMBIE or not proc.info['name']:
+                continue
+            procs[proc.pid] = proc
+            by_name.setdefault(normalize_process_name(proc.info['name']), set()).add(proc.pid)
+        process_snapshot = {'taken_at': time.monotonic(), 'procs': procs, 'by_name': by_name}
+        return process_snapshot
+
+
+def processes_named(name, snapshot=None):
+    """{pid: Process} of every running process called name, answered from the shared snapshot."""
+    snapshot = take_process_snapshot() if snapshot is None else snapshot
+    procs = snapshot['procs']
+    return {pid: procs[pid] for pid in snapshot['by_name'].get(normalize_process_name(name), ())}
+
+
+def read_activity(proc):
+    """Cumulative (cpu_seconds, disk_bytes, other_bytes) counters of one process.
+
+    other_bytes is I/O that never touched the disk: sockets, pipes and cached reads on
+    Linux (read_chars + write_chars minus disk bytes) and Windows' other_bytes. The I/O
+    values are None where the platform or permissions hide them (macOS has no per-process
+    I/O counters, so only CPU is judged there).
+    """
+    with proc.oneshot():
+        if proc.status() == psutil.STATUS_ZOMBIE:
+            raise psutil.ZombieProcess(proc.pid)  # Exited, only waiting to be reaped by its parent
+        times = proc.cpu_times()
+        try:
+            counters = proc.io_counters()
+        except (psutil.AccessDenied, AttributeError):
+            return times.user + times.system, None, None
+    disk = counters.read_bytes + counters.write_bytes
+    if hasattr(counters, 'read_chars'):
+        other = max(0, counters.read_chars + counters.write_chars - disk)
+    else:
+        other = getattr(counters, 'other_bytes', None)
+    return times.user + times.system, disk, other
+
+
+def _smooth(previous, value, weight):
+    if value is None:
+        return None
+    if previous is None:
+        return value  # Start from the first real rate, not from zero, so a busy process never looks idle
+    return previous + weight * (value - previous)
+
+
+def update_watch(entry, procs, now=None):
+    """Sample one watched entry's processes and advance its smoothed activity.
+
+    procs is {pid: psutil.Process} of the processes currently matching the entry. CPU%,
+    disk and other I/O rates come from counter deltas and are smoothed with a time-based
+    EWMA (weight 1 - exp(-dt / IDLE_EWMA_TAU), so irregular sample gaps are handled).
+    While any smoothed rate is at or above its threshold, last_active moves to now.
+    Sets entry['status'] to 'exited', 'idle', 'active', 'no access' or 'waiting' and
+    returns it. A name-based watch stays 'waiting' until a matching process has been seen,
+    so a typo or a program that has not started yet never counts as finished.
+    """
+    now = time.time() if now is None else now
+    state = entry.setdefault('activity', {'counters': {}, 'sampled_at': None, 'cpu': None, 'disk': None, 'other': None})
+    counters = {}
+    denied = False
+    for pid, proc in procs.items():
+        try:
+            counters[pid] = read_activity(proc)
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            continue
+        except psutil.AccessDenied:
+            denied = True
+
+    mono = time.monotonic()
+    if counters or denied:
+        state['seen'] = True
+    if not counters:
+        state['counters'] = {}
+        if denied:
+            entry['status'] = 'no access'
+        elif entry['pid'] is None and not state.get('seen'):
+            entry['status'] = 'waiting'
+        else:
+            entry['status'] = 'exited'
+        if entry['status'] != 'exited':
+            entry['last_active'] = now  # Unknown activity never counts as idle
+        return entry['status']
+
+    previous = state['counters']
+    if state['sampled_at'] is not None and previous:
+        elapsed = max(mono - state['sampled_at'], 1e-6)
+        common = [pid for pid in counters if pid in previous]
+        rates = [None, None, None]
+        for index in range(3):
+            if common and all(counters[pid][index] is not None and previous[pid][index] is not None for pid in common):
+                rates[index] = sum(max(0, counters[pid][index] - previous[pid][index]) for pid in common) / elapsed
+        if rates[0] is not None:
+            rates[0] *= 100  # CPU seconds per second -> percent of one core
+        weight = 1 - math.exp(-elapsed / IDLE_EWMA_TAU)
+        state['cpu'] = _smooth(state['cpu'], rates[0], weight)
+        state['disk'] = _smooth(state['disk'], rates[1], weight)
+        state['other'] = _smooth(state['other'], rates[2], weight)
+    state['counters'] = counters
+    state['sampled_at'] = mono
+
+    idle = (state['cpu'] is not None and state['cpu'] < IDLE_CPU_PERCENT and
+            (state['disk'] is None or state['disk'] < IDLE_DISK_BYTES_PER_SEC) and
+            (state['other'] is None or state['other'] < IDLE_OTHER_BYTES_PER_SEC))
+    if not idle:
+        entry['last_active'] = now
+    entry['status'] = 'idle' if idle else 'active'
+    return entry['status']
+
+
+def watch_finished(entry, now=None):
+    """True once an entry's processes have exited or, for 'idle' watches, stayed idle for its idle_window."""
+    now = time.time() if now is None else now
+    if entry.get('status') == 'exited':
+        return True
+    return (entry.get('monitor_type') == 'idle' and entry.get('status') == 'idle' and
+            now - entry['last_active'] >= entry.get('idle_window', DEFAULT_IDLE_WINDOW))
+
+
+def _watched_procs(entry, snapshot):
+    """{pid: Process} for a watch: its own process while that still runs, or every process with its name."""
+    if entry['pid'] is None:
+        return processes_named(entry['name'], snapshot)
+    state = entry['activity']
+    if 'proc' not in state:
+        try:
+            state['proc'] = psutil.Process(entry['pid'])
+        except psutil.NoSuchProcess:
+            state['proc'] = None
+    proc = state['proc']
+    # is_running() also compares the creation time, so a recycled PID is not mistaken for ours
+    return {entry['pid']: proc} if proc is not None and proc.is_running() else {}
+
+
+def poll_watches(entries, now=None, snapshot_max_age=SNAPSHOT_MAX_AGE):
+    """Sample every watched entry once. Returns True when all of them have finished.
+
+    Name-based entries are all answered from one shared process snapshot, so the scan
+    costs O(processes) per tick however many names are watched; each watched process then
+    costs one oneshot() read, so a tick stays cheap enough to run for hours.
+    """
+    now = time.time() if now is None else now
+    snapshot = None
+    if any(entry['pid'] is None and entry.get('status') != 'exited' for entry in entries):
+        snapshot = take_process_snapshot(snapshot_max_age)
+    finished = True
+    for entry in entries:
+        entry.setdefault('activity', {'counters': {}, 'sampled_at': None, 'cpu': None, 'disk': None, 'other': None})
+        if entry.get('status') != 'exited':
+            update_watch(entry, _watched_procs(entry, snapshot), now)
+        finished = watch_finished(entry, now) and finished
+    return finished
+
+
+def build_watch_table(entries, now=None):
+    """Rich table of watched processes with their smoothed activity and progress."""
+    now = time.time() if now is None else now
+    table = Table(box=DOUBLE, border_style=BORDER_STYLE, header_style=f"bold {HACKER_GREEN}",
+                  title=f"[{HACKER_GREEN}]Monitored Processes[/{HACKER_GREEN}]")
+    table.add_column("Process", style=MAIN_STYLE)
+    table.add_column("PID", style=MAIN_STYLE, justify="right")
+    table.add_column("Until", style=MAIN_STYLE)
+    table.add_column("CPU %", style=MAIN_STYLE, justify="right")
+    table.add_column("Disk", style=MAIN_STYLE, justify="right")
+    table.add_column("Net/Other", style=MAIN_STYLE, justify="right")
+    table.add_column("State")
+    rate = lambda value: f"{format_bytes(value)}/s" if value is not None else "-"
+    for entry in entries:
+        state = entry.get('activity') or {}
+        if entry['pid'] is not None:
+            pid_text = str(entry['pid'])
+        else:
+            pid_text = f"{len(state.get('counters') or {})} by name"
+        status = entry.get('status', 'waiting')
+        if status == 'exited':
+            status_text = "[bold green]Exited[/bold green]"
+        elif status == 'idle' and entry.get('monitor_type') == 'idle':
+            window = entry.get('idle_window', DEFAULT_IDLE_WINDOW)
+            idle_for = min(now - entry['last_active'], window)
+            status_text = f"[yellow]Idle {format_seconds(idle_for)} / {format_seconds(window)}[/yellow]"
+        elif status == 'no access':
+            status_text = "[red]No access[/red]"
+        elif status == 'waiting' and entry['pid'] is None:
+            status_text = "[dim]Waiting to start[/dim]"
+        else:
+            status_text = status.capitalize()
+        table.add_row(entry['name'], pid_text, entry.get('monitor_type') or 'exit',
+                      f"{state['cpu']:.1f}" if state.get('cpu') is not None else "-",
+                      rate(state.get('disk')), rate(state.get('other')), status_text)
+    return table
+
+
+def perform_completion_action(action, delay=COMPLETION_ACTION_DELAY):
+    """Ask the OS to 'shutdown' or 'restart' after delay seconds. Returns True if the command was accepted."""
+    if platform.system() == 'Windows':
+        command = f"shutdown {'/s' if action == 'shutdown' else '/r'} /t {int(delay)}"
+    else:
+        command = f"shutdown {'-h' if action == 'shutdown' else '-r'} +{math.ceil(delay / 60)}"  # Whole minutes
+    log_event(f"Process completion action: {action} ({command})")
+    return os.system(command) == 0
+
+
+def _open_pidfd(pid):
+    """Return a pidfd for pid (Linux 5.3+), or None where pidfds are unavailable.
+
+    Raises psutil.NoSuchProcess if the process is already gone.
+    """
+    if not hasattr(os, "pidfd_open") or not hasattr(select, "epoll"):
+        return None
+    try:
+        return os.pidfd_open(pid)
+    except ProcessLookupError:
+        raise psutil.NoSuchProcess(pid)
+    except OSError:
+        return None  # Kernel without pidfd support, or not permitted
+
+
+def wait_for_exits(pids, timeout=None, on_exit=None, wake=None):
+    """Block until every PID has exited, timeout seconds pass or wake (an Event) is set.
+
+    Returns the PIDs still running. On Linux each process gets a pidfd registered with
+    epoll, so the wait costs no CPU and returns the moment a process exits. PIDs without a
+    pidfd (other platforms, older kernels) are checked with psutil.wait_procs in the same
+    loop, so both sets are waited on together. on_exit(pid) is called once per exit.
+    """
+    remaining = set(pids)
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    def exited(pid):
+        remaining.discard(pid)
+        if on_exit:
+            on_exit(pid)
+
+    pidfds = {}
+    fallback = []
+    for pid in list(remaining):
+        try:
+            fd = _open_pidfd(pid)
+            if fd is None:
+                fallback.append(psutil.Process(pid))
+            else:
+                pidfds[fd] = pid
+        except psutil.NoSuchProcess:
+            exited(pid)
+
+    poller = select.epoll() if pidfds else None
+    try:
+        for fd in pidfds:
+            poller.register(fd, select.EPOLLIN)
+        while remaining:
+            if wake is not None and wake.is_set():
+                break
+            wait = None
+            if fallback:
+                wait = EXIT_FALLBACK_POLL
+            elif wake is not None:
+                wait = EXIT_WAKE_CHECK
+            if deadline is not None:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    break
+                wait = left if wait is None else min(wait, left)
+            if poller is not None:
+                for fd, _ in poller.poll(-1 if wait is None else wait):
+                    poller.unregister(fd)
+                    os.close(fd)
+                    exited(pidfds.pop(fd))
+            if fallback:
+                # After an epoll wait just check; without pidfds, psutil does the waiting
+                _, fallback = psutil.wait_procs(fallback, timeout=0 if poller is not None else wait,
+                                                callback=lambda proc: exited(proc.pid))
+    finally:
+        if poller is not None:
+            poller.close()
+        for fd in pidfds:
+            os.close(fd)
+    return remaining
+
+
+def _watch_wait_targets(entries):
+    """PIDs an exit-only watch can block on, and whether some name watch still needs rescans to find its process."""
+    pids = set()
+    needs_rescan = False
+    for entry in entries:
+        if entry.get('status') == 'exited':
+            continue
+        if entry['pid'] is not None:
+            pids.add(entry['pid'])
+        else:
+            pids.update(entry['activity']['counters'])
+            if entry.get('status') in ('waiting', 'no access'):
+                needs_rescan = True
+    return pids, needs_rescan
+
+
+_SAMPLED_FIELDS = ('activity', 'status', 'last_active')  # What poll_watches changes on an entry
+
+
+def _copy_for_sampling(entry):
+    """A copy of a watch entry that poll_watches can update without holding watch_lock."""
+    sample = dict(entry)
+    if 'activity' in sample:
+        sample['activity'] = dict(sample['activity'])
+    return sample
+
+
+def _monitor_loop(stop_event):
+    """Monitor thread: check the watch list until it finishes or is stopped.
+
+    Idle watches are sampled every WATCH_SAMPLE_INTERVAL. Exit-only watches block in
+    wait_for_exits on the PIDs they currently match, so the action follows the last exit
+    within milliseconds and waiting costs no CPU; the list is rechecked after every wake.
+    """
+    snapshot_max_age = SNAPSHOT_MAX_AGE
+    while True:
+        monitor_wake.clear()
+        # Sample copies outside watch_lock so the status view and the add/remove menu never
+        # wait on a process scan; only the sampled fields are written back afterwards.
+        with watch_lock:
+            if stop_event.is_set() or not watch_state['active']:
+                return
+            entries = list(monitored_processes)
+            samples = [_copy_for_sampling(entry) for entry in entries]
+        sampled = False
+        if samples:
+            try:
+                poll_watches(samples, snapshot_max_age=snapshot_max_age)
+                sampled = True
+            except Exception as e:
+                log_event(f"Process monitoring sample failed: {e}")
+        with watch_lock:
+            if stop_event.is_set() or not watch_state['active']:
+                return
+            pids, needs_rescan = set(), False
+            if sampled:
+                current = {id(entry) for entry in monitored_processes}
+                for entry, sample in zip(entries, samples):
+                    if id(entry) in current:  # Removed from the list while it was being sampled
+                        entry.update((key, sample[key]) for key in _SAMPLED_FIELDS if key in sample)
+            # Emptied while running: wait for stop_process_monitoring(). Entries added during the
+            # sample have no status yet, so they keep the watch going until their first poll.
+            now = time.time()
+            finished = sampled and bool(monitored_processes) and all(watch_finished(entry, now) for entry in monitored_processes)
+            if finished:
+                action = watch_state['action']
+                watch_state.update(active=False, ended=time.time())
+            elif monitored_processes and all(entry.get('monitor_type') != 'idle' for entry in monitored_processes):
+                pids, needs_rescan = _watch_wait_targets(monitored_processes)
+        if finished:
+            accepted = perform_completion_action(action)
+            with watch_lock:
+                watch_state['result'] = (f"All processes finished; {action} requested." if accepted else
+                                         f"All processes finished, but the {action} command failed.")
+            return
+        if pids:
+            # Name watches whose process has not appeared yet are rescanned on the sample interval
+            wait_for_exits(pids, timeout=WATCH_SAMPLE_INTERVAL if needs_rescan else None, wake=monitor_wake)
+            snapshot_max_age = 0  # Rescan at once, so a same-named process started meanwhile is not missed
+        else:
+            monitor_wake.wait(WATCH_SAMPLE_INTERVAL)
+            snapshot_max_age = SNAPSHOT_MAX_AGE
+        if stop_event.is_set():
+            return
+
+
+def start_monitor_thread(action, monitor_type='exit', idle_window=DEFAULT_IDLE_WINDOW):
+    """Start watching monitored_processes in a daemon thread. Returns False if a watch is already running."""
+    global monitor_thread
+    with watch_lock:
+        if watch_state['active'] or not monitored_processes:
+            return False
+        now = time.time()
+        for entry in monitored_processes:
+            entry.pop('activity', None)
+            entry.update(monitor_type=monitor_type, start_time=now, last_active=now,
+                         idle_window=idle_window, status='waiting')
+        watch_state.update(active=True, action=action, monitor_type=monitor_type, idle_window=idle_window,
+                           started=now, ended=None, result=None)
+        names = ", ".join(entry['name'] for entry in monitored_processes)
+    monitor_stop.clear()
+    monitor_wake.clear()
+    monitor_thread = threading.Thread(target=_monitor_loop, args=(monitor_stop,), daemon=True)
+    monitor_thread.start()
+    log_event(f"Started process completion monitoring ({monitor_type}, {action}) for {names}")
+    return True
+
+
+def stop_process_monitoring():
+    """Cancel the running watch, if any. Returns True if one was stopped."""
+    global monitor_thread
+    with watch_lock:
+        was_active = watch_state['active']
+        if was_active:
+            watch_state.update(active=False, ended=time.time(), result="Monitoring cancelled.")
+    monitor_stop.set()
+    monitor_wake.set()
+    if monitor_thread is not None and monitor_thread is not threading.current_thread():
+        monitor_thread.join(timeout=WATCH_SAMPLE_INTERVAL + 1)
+    monitor_thread = None
+    if was_active:
+        log_event("Process completion monitoring cancelled")
+    return was_active
+
+
+def build_monitor_status():
+    """Rich panel with the watch settings, elapsed time and the per-process table."""
+    with watch_lock:
+        state = dict(watch_state)
+        table = build_watch_table(monitored_processes) if monitored_processes else None
+    if state['started'] is None:
+        return Panel("No monitoring has been started", border_style=BORDER_STYLE, style=MAIN_STYLE)
+    if state['active']:
+        header = (f"[bold {HACKER_GREEN}]Watching[/bold {HACKER_GREEN}] - {state['action']} once every process has "
+                  f"{'exited' if state['monitor_type'] == 'exit' else 'exited or stayed idle for ' + format_duration(state['idle_window'])}. "
+                  f"Running for {format_duration(time.time() - state['started'])}.")
+    else:
+        header = f"[yellow]{state['result'] or 'Monitoring stopped.'}[/yellow]"
+    body = Table.grid(padding=(0, 0, 1, 0))
+    body.add_column(justify="center")
+    body.add_row(Text.from_markup(header))
+    if table is not None:
+        body.add_row(Align.center(table))
+    return Panel(body, title=f"[bold {HACKER_GREEN}]Process Monitoring[/bold {HACKER_GREEN}]", border_style=BORDER_STYLE, expand=False)
+
+
+def show_monitoring_status():
+    """Live status of the background watch. 'c' cancels it; any other key returns while it keeps running."""
+    clear_screen()
+    print_banner()
+    console.print(Align.center(Text("Monitoring Status", style=f"bold {HACKER_GREEN}")))
+    console.print(Align.center(Text("Press 'c' to cancel monitoring or any other key to return (monitoring continues).", style="dim")))
+    console.print()
+
+    with Live(Align.center(build_monitor_status()), console=console, auto_refresh=False) as live:
+        next_redraw = time.monotonic() + 1
+        while True:
+            key = get_key(wasd=False)
+            if key is not None:
+                if key.lower() == 'c' and stop_process_monitoring():
+                    live.update(Align.center(build_monitor_status()), refresh=True)
+                    time.sleep(1.5)
+                break
+            if time.monotonic() >= next_redraw:
+                live.update(Align.center(build_monitor_status()), refresh=True)
+                next_redraw = time.monotonic() + 1
+            time.sleep(0.1)
+    clear_screen()
+
+
+def start_process_monitoring(arrow_menu_func):
+    """Configure and start background monitoring of the selected processes.
+
+    The watch runs in a daemon thread, so the menus stay usable; when every process has
+    finished (exited or, with the idle trigger, exited or idle under the IDLE_* thresholds
+    for a whole idle window) it requests the chosen shutdown or restart. If a watch is
+    already running this shows its status instead.
+    """
+    if watch_state['active']:
+        show_monitoring_status()
+        return
+    if not monitored_processes:
+        clear_screen()
+        print_banner()
+        console.print(Align.center(Text("No processes selected for monitoring.", style="yellow")))
+        time.sleep(1.5)
+        clear_screen()
+        return
+
+    trigger = arrow_menu_func("Finish When", ["Processes exit", "Processes exit or go idle (CPU and I/O)", "Cancel"])
+    if trigger not in (0, 1):
+        return
+    idle_window = DEFAULT_IDLE_WINDOW
+    if MONITOR_TYPES[trigger] == 'idle':
+        clear_screen()
+        print_banner()
+        console.print(Align.center(Text("Idle Window", style=f"bold {HACKER_GREEN}")))
+        console.print(Align.center(Text(f"Idle = CPU under {IDLE_CPU_PERCENT:g}%, disk under {format_bytes(IDLE_DISK_BYTES_PER_SEC)}/s and "
+                                        f"other I/O under {format_bytes(IDLE_OTHER_BYTES_PER_SEC)}/s.", style="dim")))
+        console.print()
+        minutes = Prompt.ask("[bold]Minutes of inactivity before the action[/bold]", default=str(DEFAULT_IDLE_WINDOW // 60))
+        try:
+            idle_window = max(0.5, float(minutes)) * 60
+        except ValueError:
+            console.print(Align.center(Text(f"Invalid number, using {DEFAULT_IDLE_WINDOW // 60} minutes.", style="yellow")))
+            time.sleep(1.5)
+    choice = arrow_menu_func("Completion Action", ["Shutdown", "Restart", "Cancel"])
+    if choice not in (0, 1):
+        return
+
+    if not start_monitor_thread(['shutdown', 'restart'][choice], MONITOR_TYPES[trigger], idle_window):
+        clear_screen()
+        print_banner()
+        console.print(Align.center(Text("Monitoring could not be started.", style="yellow")))
+        time.sleep(1.5)
+        clear_screen()
+        return
+    show_monitoring_status()
@@ -0,0 +1,472 @@
+import os
+import sys
+import json
+import math
+import time
+import glob
+import struct
+import psutil
+from array import array
+from datetime import datetime
+
+# Rich imports
+from rich.table import Table
+from rich.align import Align
+from rich.text import Text
+from rich.prompt import Prompt
+from rich.live import Live
+from rich.box import DOUBLE
+
+# Local imports
+from utils.logging import log_event
+from utils.helpers import (
+    clear_screen, print_banner, get_key, format_duration, format_bytes, console, save_output_to_file,
+    MAIN_STYLE, HIGHLIGHT_STYLE, HACKER_GREEN, BORDER_STYLE
+)
+from utils import process_monitor
+from utils.ping_tools import percentile, render_sparkline
+
+# --- Recorder Configuration ---
+RECORDINGS_DIR = os.path.join(os.path.expanduser("~"), "TarsUtilitiesTool", "recordings")
+DEFAULT_RECORD_INTERVAL = 1.0  # Seconds between samples of each recorded process
+RECORD_CHUNK_ROWS = 300  # Samples buffered per process before they are written out (5 minutes at 1 s)
+RECORD_MAX_PROCESSES = 32
+RECORD_REDRAW_INTERVAL = 1.0  # Seconds between screen redraws while recording
+TREND_FRACTION = 0.1  # Trend compares the average of the last tenth of a run with the first tenth
+VIEWER_SPARKLINE_WIDTH = 60  # The whole run is averaged down to this many buckets
+# --- End Configuration ---
+
+# Column layout of a recording: (field, array typecode). Counters that are unavailable are stored as -1.
+RECORD_COLUMNS = [
+    ('time', 'd'),  # Epoch seconds
+    ('cpu', 'f'),  # Percent of one core since the previous sample
+    ('rss', 'q'),
+    ('read_bytes', 'q'),  # Cumulative; the viewer turns these into rates
+    ('write_bytes', 'q'),
+    ('threads', 'i'),
+    ('fds', 'i'),  # Open file descriptors (handles on Windows)
+]
+RECORD_MAGIC = b"TARSREC1"
+_HEADER_LENGTH = struct.Struct("<I")
+_CHUNK_HEADER = struct.Struct("<4sIII")  # b"CHNK", pid, rows, payload bytes
+_CHUNK_TAG = b"CHNK"
+DENIED_ROW = {'denied': True}  # latest[pid] for a process dropped because it could not be read
+
+
+def new_column_buffer(rows=RECORD_CHUNK_ROWS):
+    """Preallocated columns for one process; 'filled' rows are valid. Memory never grows past rows."""
+    return {'columns': {field: array(code, [0]) * rows for field, code in RECORD_COLUMNS}, 'filled': 0}
+
+
+def read_sample(proc):
+    """One row of RECORD_COLUMNS values (without time) for a process, -1 where a counter is unavailable."""
+    with proc.oneshot():
+        if proc.status() == psutil.STATUS_ZOMBIE:
+            raise psutil.ZombieProcess(proc.pid)  # Exited, only waiting to be reaped by its parent
+        cpu = proc.cpu_percent(None)
+        rss = proc.memory_info().rss
+        threads = proc.num_threads()
+        try:
+            counters = proc.io_counters()
+            read_bytes, write_bytes = counters.read_bytes, counters.write_bytes
+        except (psutil.AccessDenied, AttributeError):
+            read_bytes = write_bytes = -1
+        try:
+            fds = proc.num_fds() if hasattr(proc, 'num_fds') else proc.num_handles()
+        except (psutil.AccessDenied, AttributeError):
+            fds = -1
+    return cpu, rss, read_bytes, write_bytes, threads, fds
+
+
+def _write_header(f, processes, interval):
+    header = {
+        'version': 1,
+        'columns': RECORD_COLUMNS,
+        'byteorder': sys.byteorder,
+        'interval': interval,
+        'started': time.time(),
+        'processes': {str(pid): name for pid, name in processes.items()},
+    }
+    data = json.dumps(header).encode('utf-8')
+    f.write(RECORD_MAGIC + _HEADER_LENGTH.pack(len(data)) + data)
+
+
+def flush_chunk(f, pid, buffer):
+    """Append a process's buffered rows to the file as one columnar chunk and empty the buffer."""
+    rows = buffer['filled']
+    if not rows:
+        return
+    views = [memoryview(buffer['columns'][field])[:rows] for field, _ in RECORD_COLUMNS]
+    f.write(_CHUNK_HEADER.pack(_CHUNK_TAG, pid, rows, sum(view.nbytes for view in views)))
+    for view in views:
+        f.write(view)  # Straight from the array's memory, no per-value conversion
+    f.flush()
+    buffer['filled'] = 0
+
+
+def new_recording_path(when=None):
+    when = datetime.now() if when is None else when
+    return os.path.join(RECORDINGS_DIR, f"processes_{when.strftime('%Y%m%d_%H%M%S')}.tarsrec")
+
+
+def _drop_denied(processes, latest, pid):
+    latest[pid] = DENIED_ROW
+    log_event(f"Process recording skipped {processes[pid]} ({pid}): access denied")
+
+
+def record_processes(processes, interval=DEFAULT_RECORD_INTERVAL, path=None, tick=None):
+    """Sample processes ({pid: name}) every interval seconds into a recording file.
+
+    Rows go into preallocated per-process columns that are written out as one chunk when
+    full, so memory stays at RECORD_CHUNK_ROWS rows per process however long the run is.
+    tick(latest, buffers, samples) is called while waiting, with {pid: latest row, None once
+    exited, or DENIED_ROW}; recording stops when it returns True or no process is left.
+    A process that cannot be read at all (AccessDenied on its first sample) is dropped and
+    logged. Returns (path, samples written).
+    """
+    path = new_recording_path() if path is None else path
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    latest = {pid: None for pid in processes}
+    procs = {}
+    for pid in processes:
+        try:
+            proc = psutil.Process(pid)
+            proc.cpu_percent(None)  # Prime the CPU counter; the first reading is always 0
+        except psutil.NoSuchProcess:
+            continue
+        except psutil.AccessDenied:
+            _drop_denied(processes, latest, pid)
+            continue
+        procs[pid] = proc
+    buffers = {pid: new_column_buffer() for pid in procs}
+    samples = 0
+
+    with open(path, "wb") as f:
+        _write_header(f, processes, interval)
+        next_sample = time.monotonic() + interval
+        try:
+            while procs:
+                while True:
+                    remaining = next_sample - time.monotonic()
+                    if tick is not None and tick(latest, buffers, samples):
+                        return path, samples
+                    if remaining <= 0:
+                        break
+                    time.sleep(min(remaining, 0.1))
+                next_sample = max(next_sample + interval, time.monotonic())
+                now = time.time()
+                for pid, proc in list(procs.items()):
+                    try:
+                        row = read_sample(proc)
+                    except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                        flush_chunk(f, pid, buffers[pid])
+                        del procs[pid]
+                        latest[pid] = None
+                        continue
+                    except psutil.AccessDenied:
+                        if latest[pid] is None:  # Never readable: drop it rather than record nothing forever
+                            del procs[pid]
+                            _drop_denied(processes, latest, pid)
+                        continue  # A later denial is skipped; the samples so far stay valid
+                    buffer = buffers[pid]
+                    columns = buffer['columns']
+                    index = buffer['filled']
+                    columns['time'][index] = now
+                    for (field, _), value in zip(RECORD_COLUMNS[1:], row):
+                        columns[field][index] = value
+                    buffer['filled'] = index + 1
+                    latest[pid] = dict(zip((field for field, _ in RECORD_COLUMNS), (now,) + row))
+                    samples += 1
+                    if buffer['filled'] == RECORD_CHUNK_ROWS:
+                        flush_chunk(f, pid, buffer)
+        finally:
+            for pid, buffer in buffers.items():
+                flush_chunk(f, pid, buffer)
+    return path, samples
+
+
+def read_recording(path, fields=None):
+    """Load a recording. Returns (header, {pid: {field: array}}) oldest sample first.
+
+    Only the requested fields are read; other columns are skipped with a seek. A chunk cut
+    short (e.g. by a crash while writing) ends the recording instead of raising.
+    Raises ValueError if the file is not a recording.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(RECORD_MAGIC)) != RECORD_MAGIC:
+            raise ValueError(f"{path} is not a process recording")
+        (length,) = _HEADER_LENGTH.unpack(f.read(_HEADER_LENGTH.size))
+        header = json.loads(f.read(length).decode('utf-8'))
+        columns = [tuple(column) for column in header['columns']]
+        wanted = set(fields) if fields is not None else {field for field, _ in columns}
+        swap = header.get('byteorder', sys.byteorder) != sys.byteorder
+        series = {}
+        while True:
+            raw = f.read(_CHUNK_HEADER.size)
+            if len(raw) < _CHUNK_HEADER.size:
+                break
+            tag, pid, rows, payload = _CHUNK_HEADER.unpack(raw)
+            if tag != _CHUNK_TAG:
+                break
+            start = f.tell()
+            per_pid = series.setdefault(pid, {field: array(code) for field, code in columns if field in wanted})
+            complete = True
+            for field, code in columns:
+                size = rows * array(code).itemsize
+                if field not in wanted:
+                    f.seek(size, os.SEEK_CUR)
+                    continue
+                data = f.read(size)
+                if len(data) < size:
+                    complete = False
+                    break
+                chunk = array(code)
+                chunk.frombytes(data)
+                if swap:
+                    chunk.byteswap()
+                per_pid[field].extend(chunk)
+            if not complete or f.seek(start + payload) > os.fstat(f.fileno()).st_size:
+                break
+    # A truncated final chunk may have filled some columns and not others; keep rows present in all
+    for per_pid in series.values():
+        rows = min((len(values) for values in per_pid.values()), default=0)
+        for field, values in per_pid.items():
+            del values[rows:]
+    return header, series
+
+
+def counter_rates(times, counters):
+    """Per-second rates between consecutive samples of a cumulative counter (-1 = unavailable)."""
+    return array('d', [(b - a) / (t1 - t0) if a >= 0 and b >= a and t1 > t0 else math.nan
+                       for t0, t1, a, b in zip(times, times[1:], counters, counters[1:])])
+
+
+def summarize_series(values):
+    """min/avg/p50/p95/p99/max plus first/last-tenth averages of a column; NaN and -1 are skipped."""
+    valid = sorted(v for v in values if v >= 0)  # NaN compares False, so it is skipped too
+    if not valid:
+        return None
+    edge = max(1, int(len(values) * TREND_FRACTION))
+    head = [v for v in values[:edge] if v >= 0]
+    tail = [v for v in values[-edge:] if v >= 0]
+    return {
+        'count': len(valid),
+        'min': valid[0],
+        'avg': sum(valid) / len(valid),
+        'p50': percentile(valid, 50),
+        'p95': percentile(valid, 95),
+        'p99': percentile(valid, 99),
+        'max': valid[-1],
+        'first': sum(head) / len(head) if head else None,
+        'last': sum(tail) / len(tail) if tail else None,
+    }
+
+
+def downsample(values, width=VIEWER_SPARKLINE_WIDTH):
+    """Average values into at most width buckets (NaN where a bucket has no valid samples)."""
+    if len(values) <= width:
+        return array('d', [v if v >= 0 else math.nan for v in values])
+    buckets = array('d')
+    for index in range(width):
+        bucket = [v for v in values[index * len(values) // width:(index + 1) * len(values) // width] if v >= 0]
+        buckets.append(sum(bucket) / len(bucket) if bucket else math.nan)
+    return buckets
+
+
+def recording_metrics(series):
+    """{metric label: (values, formatter)} for one process, with I/O counters turned into rates."""
+    times = series['time']
+    rate = lambda value: f"{format_bytes(value)}/s"
+    return {
+        'CPU %': (series['cpu'], lambda value: f"{value:.1f}"),
+        'RSS': (series['rss'], format_bytes),
+        'Read': (counter_rates(times, series['read_bytes']), rate),
+        'Write': (counter_rates(times, series['write_bytes']), rate),
+        'Threads': (series['threads'], lambda value: f"{value:.0f}"),
+        'FDs/Handles': (series['fds'], lambda value: f"{value:.0f}"),
+    }
+
+
+def build_recording_table(pid, name, series):
+    """Summary table for one recorded process: percentiles and first-vs-last trend per metric."""
+    times = series['time']
+    duration = times[-1] - times[0] if len(times) > 1 else 0
+    table = Table(title=f"[bold {HACKER_GREEN}]{name} (PID {pid}) - {len(times)} samples over {format_duration(duration)}[/bold {HACKER_GREEN}]",
+                  box=DOUBLE, border_style=BORDER_STYLE, header_style=f"bold {HACKER_GREEN}")
+    table.add_column("Metric", style=MAIN_STYLE)
+    for column in ("Min", "Avg", "p50", "p95", "p99", "Max", "First 10%", "Last 10%", "Trend"):
+        table.add_column(column, style=MAIN_STYLE, justify="right")
+    for label, (values, formatter) in recording_metrics(series).items():
+        stats = summarize_series(values)
+        if stats is None:
+            table.add_row(label, *(["-"] * 9))
+            continue
+        if stats['first'] and stats['last'] is not None:
+            change = (stats['last'] - stats['first']) / stats['first'] * 100
+            trend = f"[{'red' if abs(change) >= 25 else MAIN_STYLE}]{change:+.0f}%[/]"
+        else:
+            trend = "-"
+        table.add_row(label, *[formatter(stats[key]) if stats[key] is not None else "-"
+                               for key in ('min', 'avg', 'p50', 'p95', 'p99', 'max', 'first', 'last')], trend)
+    cpu_line = Text("CPU over the run: ", style="dim")
+    cpu_line.append_text(render_sparkline(downsample(series['cpu'])))
+    table.caption = cpu_line
+    return table
+
+
+def format_recording_csv(header, series):
+    """The whole recording as CSV text, one row per sample."""
+    names = header.get('processes', {})
+    fields = [field for field, _ in RECORD_COLUMNS]
+    lines = ["pid,name," + ",".join(fields)]
+    for pid, per_pid in sorted(series.items()):
+        name = names.get(str(pid), "").replace('"', '""')
+        for row in zip(*(per_pid[field] for field in fields)):
+            lines.append(f'{pid},"{name}",{datetime.fromtimestamp(row[0]).isoformat(timespec="milliseconds")},'
+                         f"{row[1]:.1f}," + ",".join(str(value) for value in row[2:]))
+    return "\n".join(lines)
+
+
+def list_recordings():
+    """Recording files in RECORDINGS_DIR, newest first."""
+    return sorted(glob.glob(os.path.join(RECORDINGS_DIR, "*.tarsrec")), key=os.path.getmtime, reverse=True)
+
+
+def _build_live_table(processes, latest, buffers, started_at, path, samples_written):
+    table = Table(title=f"[bold {HACKER_GREEN}]Recording {len(processes)} process(es) for {format_duration(time.monotonic() - started_at)}[/bold {HACKER_GREEN}]",
+                  box=DOUBLE, border_style=BORDER_STYLE, header_style=f"bold {HACKER_GREEN}",
+                  caption=f"{path} | {samples_written} samples")
+    table.add_column("PID", justify="right", style="dim")
+    table.add_column("Name", style=MAIN_STYLE)
+    table.add_column("CPU %", justify="right", style=MAIN_STYLE)
+    table.add_column("RSS", justify="right", style=MAIN_STYLE)
+    table.add_column("Threads", justify="right", style=MAIN_STYLE)
+    table.add_column("FDs", justify="right", style=MAIN_STYLE)
+    table.add_column("Buffered", justify="right", style=MAIN_STYLE)
+    for pid, name in processes.items():
+        row = latest.get(pid)
+        buffered = f"{buffers[pid]['filled']}/{RECORD_CHUNK_ROWS}" if pid in buffers else "-"
+        if row is None or row is DENIED_ROW:
+            status = "access denied" if row is DENIED_ROW else "-"
+            table.add_row(str(pid), name, status, "-", "-", "-", buffered, style="dim")
+            continue
+        table.add_row(str(pid), name, f"{row['cpu']:.1f}", format_bytes(row['rss']),
+                      str(row['threads']), str(row['fds']) if row['fds'] >= 0 else "-", buffered)
+    return table
+
+
+def run_process_recorder():
+    """Pick processes, record their resource usage until a key is pressed, then show the summary."""
+    processes = {}
+    while len(processes) < RECORD_MAX_PROCESSES:
+        try:
+            picked = process_monitor.pick_process(f"Select Process to Record ({len(processes)} selected, Esc when done)")
+        except Exception as e:
+            console.print(Align.center(Text(f"Error loading processes: {e}", style="bold red")))
+            time.sleep(2)
+            break
+        if picked is None:
+            break
+        processes[picked['pid']] = picked['name']
+    if not processes:
+        clear_screen()
+        return
+
+    clear_screen()
+    print_banner()
+    console.print(Align.center(Text("Process Recorder", style=f"bold {HACKER_GREEN}")))
+    console.print()
+    interval_text = Prompt.ask("[bold]Seconds between samples[/bold]", default=f"{DEFAULT_RECORD_INTERVAL:g}")
+    try:
+        interval = max(0.1, float(interval_text))
+    except ValueError:
+        interval = DEFAULT_RECORD_INTERVAL
+
+    clear_screen()
+    print_banner()
+    console.print(Align.center(Text("Process Recorder", style=f"bold {HACKER_GREEN}")))
+    console.print(Align.center(Text("Press any key to stop recording. Recording also stops when every process has exited.", style="dim")))
+    console.print()
+
+    path = new_recording_path()
+    started_at = time.monotonic()
+    log_event(f"Started process recording of {', '.join(f'{name} ({pid})' for pid, name in processes.items())} to {path}")
+    try:
+        with Live(Align.center(_build_live_table(processes, {}, {}, started_at, path, 0)), console=console, auto_refresh=False) as live:
+            next_redraw = 0.0
+
+            def tick(latest, buffers, samples):
+                nonlocal next_redraw
+                if time.monotonic() >= next_redraw:
+                    live.update(Align.center(_build_live_table(processes, latest, buffers, started_at, path, samples)), refresh=True)
+                    next_redraw = time.monotonic() + RECORD_REDRAW_INTERVAL
+                return get_key() is not None
+            path, samples = record_processes(processes, interval, path, tick)
+    except OSError as e:
+        console.print(Align.center(Text(f"Could not write the recording: {e}", style="bold red")))
+        time.sleep(2)
+        clear_screen()
+        return
+    log_event(f"Stopped process recording {path} ({samples} samples)")
+    if samples == 0:
+        # Every process exited or was unreadable before the first sample: nothing worth keeping
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        console.print(Align.center(Text("No samples recorded: every process exited or could not be read before the first sample.", style="bold yellow")))
+        time.sleep(2)
+        clear_screen()
+        return
+    show_recording(path)
+
+
+def show_recording(path):
+    """Summarize one recording file and offer a CSV export."""
+    clear_screen()
+    print_banner()
+    console.print(Align.center(Text(f"Recording: {os.path.basename(path)}", style=f"bold {HACKER_GREEN}")))
+    console.print()
+    try:
+        header, series = read_recording(path)
+    except (OSError, ValueError, KeyError) as e:
+        console.print(Align.center(Text(f"Could not read {path}: {e}", style="bold red")))
+        header, series = None, {}
+    names = header.get('processes', {}) if header else {}
+    if header is not None and not series:
+        console.print(Align.center(Text("No samples recorded in this file.", style="yellow")))
+    for pid, per_pid in sorted(series.items()):
+        console.print(Align.center(build_recording_table(pid, names.get(str(pid), "?"), per_pid)))
+        console.print()
+
+    if series:
+        save_output_to_file(lambda: format_recording_csv(header, series), "process_recording", extension="csv")
+    instruction = Text("Press any key to return...", style=MAIN_STYLE)
+    console.print(Align.center(instruction))
+    while get_key() is None:
+        time.sleep(0.1)
+    clear_screen()
+
+
+def view_recordings(arrow_menu_func):
+    """Choose a saved recording and show its summary."""
+    paths = list_recordings()
+    if not paths:
+        clear_screen()
+        print_banner()
+        console.print(Align.center(Text(f"No recordings found in {RECORDINGS_DIR}.", style="yellow")))
+        time.sleep(2)
+        clear_screen()
+        return
+    labels = [f"{os.path.basename(path)} ({format_bytes(os.path.getsize(path))})" for path in paths[:20]]
+    choice = arrow_menu_func("Process Recordings", labels + ["Back"])
+    if 0 <= choice < len(labels):
+        show_recording(paths[choice])
+
+
+__all__ = [
+    'RECORDINGS_DIR', 'DEFAULT_RECORD_INTERVAL', 'RECORD_CHUNK_ROWS', 'RECORD_COLUMNS', 'DENIED_ROW',
+    'new_column_buffer', 'read_sample', 'flush_chunk', 'record_processes', 'read_recording',
+    'counter_rates', 'summarize_series', 'downsample', 'build_recording_table',
+    'format_recording_csv', 'list_recordings', 'run_process_recorder', 'show_recording', 'view_recordings'
+]
@@ -0,0 +1,52 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# --- SQLite Cache Configuration ---
+CACHE_DB_TIMEOUT = 5  # Seconds to wait for another process holding the database lock
+# --- End Configuration ---
+
+_ready_paths = set()  # Databases whose schema has been ensured in this process
+_ready_lock = threading.Lock()
+
+
+def open_cache_db(path, create_schema):
+    """Open an on-disk cache database, creating its directory and schema on first use.
+
+    create_schema(conn) runs once per path per process and must be safe to run against an
+    existing database (CREATE ... IF NOT EXISTS, or check before ALTER TABLE).
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=CACHE_DB_TIMEOUT)
+    with _ready_lock:
+        if path not in _ready_paths:
+            try:
+                create_schema(conn)
+                conn.commit()
+            except sqlite3.Error:
+                conn.close()
+                raise
+            _ready_paths.add(path)
+    return conn
+
+
+@contextmanager
+def cache_db(path, create_schema):
+    """Context manager around open_cache_db that yields None when the database cannot be opened.
+
+    Caches are an optimisation, so callers treat None as a miss instead of failing.
+    The connection is closed on exit.
+    """
+    try:
+        conn = open_cache_db(path, create_schema)
+    except (sqlite3.Error, OSError):
+        yield None
+        return
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+__all__ = ['CACHE_DB_TIMEOUT', 'open_cache_db', 'cache_db']
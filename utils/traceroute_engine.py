@@ -0,0 +1,157 @@
+import socket
+import select
+import struct
+import time
+import platform
+import ipaddress
+
+# --- Native Traceroute Configuration ---
+TRACE_BASE_PORT = 33434  # Classic traceroute destination port range
+DEFAULT_MAX_HOPS = 30
+DEFAULT_PROBES_PER_HOP = 3
+DEFAULT_PROBE_TIMEOUT = 2.0  # Seconds to wait for replies after the last probe is sent
+PROBE_ROUND_SPACING = 0.05  # Gap between probe rounds so routers' ICMP rate limits are not hit at once
+# --- End Configuration ---
+
+# Linux error-queue constants (not all are exported by the socket module)
+IP_RECVERR = getattr(socket, 'IP_RECVERR', 11)
+IPV6_RECVERR = getattr(socket, 'IPV6_RECVERR', 25)
+MSG_ERRQUEUE = getattr(socket, 'MSG_ERRQUEUE', 0x2000)
+SO_EE_ORIGIN_ICMP = 2
+SO_EE_ORIGIN_ICMP6 = 3
+ICMP_DEST_UNREACH = 3
+ICMP6_DEST_UNREACH = 1
+
+# struct sock_extended_err: ee_errno, ee_origin, ee_type, ee_code, ee_pad, ee_info, ee_data
+_EXTENDED_ERR = struct.Struct("=IBBBBII")
+_PROBE_ID = struct.Struct("!HH")  # (ttl, probe number) carried in each probe's payload
+
+
+def native_traceroute_supported():
+    """The engine reads ICMP errors from the UDP socket error queue, which only Linux provides
+    without raw-socket privileges."""
+    return platform.system() == "Linux"
+
+
+def _offender_address(cdata, family):
+    """Pull the address of the router that sent the ICMP error out of the control message."""
+    offset = _EXTENDED_ERR.size
+    if family == socket.AF_INET6:
+        # sockaddr_in6: family(2) port(2) flowinfo(4) addr(16) scope_id(4)
+        return str(ipaddress.IPv6Address(cdata[offset + 8:offset + 24]))
+    # sockaddr_in: family(2) port(2) addr(4)
+    return socket.inet_ntoa(cdata[offset + 4:offset + 8])
+
+
+def _read_error_queue(sock, family):
+    """Drain one ICMP error from the socket. Returns (probe_id, responder_ip, reached) or None."""
+    try:
+        data, ancdata, _, _ = sock.recvmsg(512, 512, MSG_ERRQUEUE)
+    except (BlockingIOError, InterruptedError):
+        return None
+    for level, cmsg_type, cdata in ancdata:
+        if not ((level == socket.IPPROTO_IP and cmsg_type == IP_RECVERR) or
+                (level == socket.IPPROTO_IPV6 and cmsg_type == IPV6_RECVERR)):
+            continue
+        if len(cdata) < _EXTENDED_ERR.size:
+            continue
+        _, origin, icmp_type, _, _, _, _ = _EXTENDED_ERR.unpack_from(cdata)
+        if origin not in (SO_EE_ORIGIN_ICMP, SO_EE_ORIGIN_ICMP6) or len(data) < _PROBE_ID.size:
+            continue  # Local errors (no route, message too long) carry no hop information
+        reached = icmp_type == (ICMP6_DEST_UNREACH if family == socket.AF_INET6 else ICMP_DEST_UNREACH)
+        return _PROBE_ID.unpack_from(data), _offender_address(cdata, family), reached
+    return None
+
+
+def trace_route(target_ip, max_hops=DEFAULT_MAX_HOPS, probes_per_hop=DEFAULT_PROBES_PER_HOP,
+                timeout=DEFAULT_PROBE_TIMEOUT):
+    """Trace the path to target_ip by probing every TTL at once.
+
+    One UDP socket per TTL sends probes and reads the resulting ICMP time-exceeded /
+    port-unreachable errors from its error queue (IP_RECVERR), which needs no privileges.
+    Total time is about one round of probes plus the slowest reply, instead of one timeout
+    per hop. Returns hop dicts shaped like parse_traceroute_hop() output, with an extra
+    'rtts' list of float milliseconds. Raises OSError if the sockets cannot be set up.
+    """
+    family = socket.AF_INET6 if ipaddress.ip_address(target_ip).version == 6 else socket.AF_INET
+    if family == socket.AF_INET6:
+        level, recverr_opt, ttl_opt = socket.IPPROTO_IPV6, IPV6_RECVERR, socket.IPV6_UNICAST_HOPS
+    else:
+        level, recverr_opt, ttl_opt = socket.IPPROTO_IP, IP_RECVERR, socket.IP_TTL
+
+    sockets = {}
+    poller = select.poll()
+    send_times = {}
+    replies = {ttl: {'ip': None, 'rtts': []} for ttl in range(1, max_hops + 1)}
+    dest_ttl = None
+    try:
+        for ttl in range(1, max_hops + 1):
+            sock = socket.socket(family, socket.SOCK_DGRAM)
+            sockets[sock.fileno()] = (sock, ttl)
+            sock.setsockopt(level, recverr_opt, 1)
+            sock.setsockopt(level, ttl_opt, ttl)
+            sock.setblocking(False)
+            poller.register(sock, select.POLLERR)
+
+        def handle_events(wait_seconds):
+            nonlocal dest_ttl
+            for fd, _ in poller.poll(max(0, wait_seconds) * 1000):
+                while True:
+                    result = _read_error_queue(sockets[fd][0], family)
+                    if result is None:
+                        break
+                    received_at = time.perf_counter()
+                    probe_id, responder, reached = result
+                    sent_at = send_times.pop(probe_id, None)
+                    if sent_at is None:
+                        continue  # Duplicate or stray reply
+                    hop = replies[probe_id[0]]
+                    hop['ip'] = hop['ip'] or responder
+                    hop['rtts'].append((received_at - sent_at) * 1000)
+                    if (reached or responder == target_ip) and (dest_ttl is None or probe_id[0] < dest_ttl):
+                        dest_ttl = probe_id[0]
+
+        for probe in range(probes_per_hop):
+            for sock, ttl in sockets.values():
+                if dest_ttl is not None and ttl > dest_ttl:
+                    continue
+                port = TRACE_BASE_PORT + (ttl - 1) * probes_per_hop + probe
+                send_times[(ttl, probe)] = time.perf_counter()
+                sock.sendto(_PROBE_ID.pack(ttl, probe), (target_ip, port))
+            round_end = time.perf_counter() + PROBE_ROUND_SPACING
+            while time.perf_counter() < round_end:
+                handle_events(round_end - time.perf_counter())
+
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            outstanding = [key for key in send_times if dest_ttl is None or key[0] <= dest_ttl]
+            if not outstanding:
+                break
+            handle_events(deadline - time.perf_counter())
+    finally:
+        for sock, _ in sockets.values():
+            sock.close()
+
+    last_ttl = dest_ttl
+    if last_ttl is None:
+        # Destination never answered: keep hops up to the last responder plus one silent row
+        answered = [ttl for ttl, hop in replies.items() if hop['ip']]
+        last_ttl = min(max_hops, (max(answered) if answered else 0) + 1)
+
+    hops = []
+    for ttl in range(1, last_ttl + 1):
+        hop = replies[ttl]
+        if not hop['ip']:
+            hops.append({"hop": str(ttl), "ip": "* * *", "hostname": "Request timed out",
+                         "latency": None, "rtts": []})
+            continue
+        latency = "/".join(f"{rtt:.3f}" for rtt in hop['rtts']) + " ms"
+        hops.append({"hop": str(ttl), "ip": hop['ip'], "hostname": None,
+                     "latency": latency, "rtts": hop['rtts']})
+    return hops
+
+
+__all__ = [
+    'DEFAULT_MAX_HOPS', 'DEFAULT_PROBES_PER_HOP', 'DEFAULT_PROBE_TIMEOUT',
+    'native_traceroute_supported', 'trace_route'
+]
@@ -6,6 +6,8 @@ from rich.text import Text
 from rich.align import Align
 from rich.progress import Progress, SpinnerColumn, TextColumn # For potential use in UI
 
+from utils import http_client
+
 # Use console from helpers if needed, or create a local one
 # from utils.helpers import console
 console = Console(color_system="auto", highlight=False)
@@ -14,6 +16,7 @@ console = Console(color_system="auto", highlight=False)
 # TODO: Replace with your actual GitHub username and repository name
 GITHUB_USERNAME = "nottherealtar"
 GITHUB_REPONAME = "Tars-Mega-Tool"
+UPDATE_CHECK_MAX_WAIT = 0  # The startup check never waits on the GitHub rate limit; it reports an error instead
 # --- End Configuration ---
 
 GITHUB_API_URL = f"https://api.github.com/repos/{GITHUB_USERNAME}/{GITHUB_REPONAME}/releases/latest"
@@ -23,7 +26,8 @@ def check_for_updates(current_v_str):
     update_info = {'update_available': False, 'current_version': current_v_str}
 
     try:
-        response = requests.get(GITHUB_API_URL, headers={'User-Agent': 'Tars-Utilities-Tool-Update-Checker'}, timeout=5)
+        response = http_client.get(GITHUB_API_URL, headers={'User-Agent': 'Tars-Utilities-Tool-Update-Checker'}, timeout=5,
+                                   max_wait=UPDATE_CHECK_MAX_WAIT)
         if response.status_code == 200:
             data = response.json()
             latest_version = data.get('tag_name', '').lstrip('v')
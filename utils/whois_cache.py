@@ -0,0 +1,116 @@
+import os
+import time
+import sqlite3
+import ipaddress
+import threading
+
+from utils.sqlite_cache import cache_db
+
+# --- Cache Configuration ---
+WHOIS_CACHE_FILE = os.path.join(os.path.expanduser("~"), "TarsUtilitiesTool", "whois_cache.sqlite3")
+WHOIS_CACHE_TTL = 7 * 24 * 3600  # Seconds before a cached answer is looked up again
+WHOIS_CACHE_MAX_ENTRIES = 10000  # Least recently used entries are evicted beyond this
+# --- End Configuration ---
+
+_cache_lock = threading.Lock()
+
+
+def _range_key(address):
+    """Encode an address as fixed-width hex so SQLite text comparison orders it numerically.
+
+    IPv4 and IPv6 share the same 128-bit width; the version column keeps them apart.
+    """
+    return f"{int(address):032x}"
+
+
+def _create_schema(conn):
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS whois_cache ("
+        " version INTEGER NOT NULL,"
+        " range_start TEXT NOT NULL,"
+        " range_end TEXT NOT NULL,"
+        " value TEXT NOT NULL,"
+        " fetched_at REAL NOT NULL,"
+        " last_access REAL NOT NULL,"
+        " PRIMARY KEY (version, range_start, range_end))"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS whois_cache_lru ON whois_cache (last_access)")
+
+
+def get_cached_whois(ip):
+    """Return the cached WHOIS summary for ip (exact or covering network), or None on a miss."""
+    try:
+        address = ipaddress.ip_address(ip)
+    except ValueError:
+        return None
+    key = _range_key(address)
+    now = time.time()
+    with _cache_lock, cache_db(WHOIS_CACHE_FILE, _create_schema) as conn:
+        if conn is None:
+            return None
+        try:
+            # Of all unexpired ranges covering the address, the one starting latest is the
+            # most specific (WHOIS allocations nest rather than partially overlap).
+            row = conn.execute(
+                "SELECT rowid, value FROM whois_cache"
+                " WHERE version = ? AND range_start <= ? AND range_end >= ? AND fetched_at >= ?"
+                " ORDER BY range_start DESC LIMIT 1",
+                (address.version, key, key, now - WHOIS_CACHE_TTL)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE whois_cache SET last_access = ? WHERE rowid = ?", (now, row[0]))
+            conn.commit()
+            return row[1]
+        except sqlite3.Error:
+            return None
+
+
+def store_whois(ip, value, network=None):
+    """Cache a WHOIS summary for ip, or for the whole network (start, end) that covers it."""
+    try:
+        address = ipaddress.ip_address(ip)
+    except ValueError:
+        return
+    start, end = address, address
+    if network is not None:
+        net_start, net_end = network
+        if net_start.version == address.version and net_start <= address <= net_end:
+            start, end = net_start, net_end
+    now = time.time()
+    with _cache_lock, cache_db(WHOIS_CACHE_FILE, _create_schema) as conn:
+        if conn is None:
+            return
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO whois_cache"
+                " (version, range_start, range_end, value, fetched_at, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (address.version, _range_key(start), _range_key(end), value, now, now)
+            )
+            conn.execute("DELETE FROM whois_cache WHERE fetched_at < ?", (now - WHOIS_CACHE_TTL,))
+            count = conn.execute("SELECT COUNT(*) FROM whois_cache").fetchone()[0]
+            if count > WHOIS_CACHE_MAX_ENTRIES:
+                conn.execute(
+                    "DELETE FROM whois_cache WHERE rowid IN"
+                    " (SELECT rowid FROM whois_cache ORDER BY last_access ASC LIMIT ?)",
+                    (count - WHOIS_CACHE_MAX_ENTRIES,)
+                )
+            conn.commit()
+        except sqlite3.Error:
+            pass
+
+
+def clear_whois_cache():
+    """Remove every cached WHOIS entry."""
+    with _cache_lock, cache_db(WHOIS_CACHE_FILE, _create_schema) as conn:
+        if conn is None:
+            return
+        conn.execute("DELETE FROM whois_cache")
+        conn.commit()
+
+
+__all__ = [
+    'WHOIS_CACHE_FILE', 'WHOIS_CACHE_TTL', 'WHOIS_CACHE_MAX_ENTRIES',
+    'get_cached_whois', 'store_whois', 'clear_whois_cache'
+]
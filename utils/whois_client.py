@@ -0,0 +1,184 @@
+import socket
+import time
+import ipaddress
+import threading
+
+# --- WHOIS Client Configuration ---
+WHOIS_PORT = 43
+IANA_WHOIS_SERVER = "whois.iana.org"
+DEFAULT_WHOIS_TIMEOUT = 5.0  # Seconds for one full request (connect + response)
+MAX_REFERRALS = 3  # IANA -> RIR -> NIR/LIR is the deepest chain normally seen
+MAX_RESPONSE_BYTES = 256 * 1024
+# --- End Configuration ---
+
+# Keys that name the holder of a network, most specific first
+ORG_KEYS = ['orgname', 'org-name', 'organization', 'owner', 'descr', 'netname']
+RANGE_KEYS = ['netrange', 'inetnum', 'inet6num', 'cidr', 'route', 'route6']
+
+# IANA's referral is the same for every address in an allocation block, so remember it
+# per /8 (IPv4) or /16 (IPv6) and skip the IANA round-trip next time.
+_referral_cache = {}
+_referral_lock = threading.Lock()
+
+
+def query_whois_server(server, query, timeout=DEFAULT_WHOIS_TIMEOUT, port=WHOIS_PORT):
+    """Send one RFC 3912 query and return the full response text.
+
+    The timeout covers the whole exchange and only applies to this socket, so concurrent
+    callers never affect each other. Raises OSError (including socket.timeout) on failure.
+    """
+    deadline = time.monotonic() + timeout
+    with socket.create_connection((server, port), timeout=timeout) as sock:
+        sock.sendall(query.encode('utf-8') + b"\r\n")
+        chunks = []
+        received = 0
+        while received < MAX_RESPONSE_BYTES:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise socket.timeout(f"WHOIS response from {server} timed out")
+            sock.settimeout(remaining)
+            chunk = sock.recv(4096)
+            if not chunk:
+                break  # Server closes the connection when the response is complete
+            chunks.append(chunk)
+            received += len(chunk)
+    return b"".join(chunks).decode('utf-8', errors='replace')
+
+
+def _server_query(server, ip):
+    """Build the query string for a server; ARIN needs flags to return full network records."""
+    if server == "whois.arin.net":
+        return f"n + {ip}"
+    return ip
+
+
+def _find_referral(text):
+    """Return the (server, port) a response refers to, or None."""
+    for line in text.splitlines():
+        key, _, value = line.partition(':')
+        key = key.strip().lower()
+        value = value.strip()
+        if key in ('refer', 'whois') and value:
+            return value.lower(), WHOIS_PORT
+        if key == 'referralserver' and value.lower().startswith('whois://'):
+            # rwhois:// referrals speak a different protocol and are not followed
+            host_port = value[len('whois://'):].strip('/')
+            host, _, port_str = host_port.partition(':')
+            port = int(port_str) if port_str.isdigit() else WHOIS_PORT
+            return host.lower(), port
+    return None
+
+
+def _referral_cache_key(address):
+    if address.version == 4:
+        return 4, int(address) >> 24
+    return 6, int(address) >> 112
+
+
+def whois_lookup(ip, timeout=DEFAULT_WHOIS_TIMEOUT):
+    """Query WHOIS for an IP, following referrals from IANA down to the registry that holds it.
+
+    Returns (server, response_text) for the most specific registry that answered.
+    Raises ValueError for invalid IPs and OSError when no server could be reached.
+    """
+    address = ipaddress.ip_address(ip)
+    cache_key = _referral_cache_key(address)
+    with _referral_lock:
+        server, port = _referral_cache.get(cache_key, (IANA_WHOIS_SERVER, WHOIS_PORT))
+
+    best = None
+    visited = set()
+    for _ in range(MAX_REFERRALS + 1):
+        visited.add((server, port))
+        try:
+            text = query_whois_server(server, _server_query(server, ip), timeout, port)
+        except OSError:
+            if best is None:
+                raise
+            break  # Keep the answer we already have from the referring server
+        if text.strip():
+            best = (server, text)
+        referral = _find_referral(text)
+        if server == IANA_WHOIS_SERVER and referral:
+            with _referral_lock:
+                _referral_cache[cache_key] = referral
+        if not referral or referral in visited:
+            break
+        server, port = referral
+    if best is None:
+        raise OSError(f"Empty WHOIS response for {ip}")
+    return best
+
+
+def _parse_range(key, value):
+    """Parse a WHOIS range value into (first, last) addresses, or None."""
+    try:
+        if '/' in value and key != 'netrange':
+            network = ipaddress.ip_network(value.split(',')[0].strip(), strict=False)
+            return network[0], network[-1]
+        if '-' in value:
+            first, last = (part.strip() for part in value.split('-', 1))
+            return ipaddress.ip_address(first), ipaddress.ip_address(last)
+    except ValueError:
+        pass
+    return None
+
+
+def parse_whois_response(text, ip):
+    """Extract the holder and allocated range for ip from a WHOIS response.
+
+    Responses may hold several nested network records (ARIN lists the parent block before
+    the customer block). Paragraphs are grouped into records at each range line, and the
+    narrowest record containing ip wins. Returns {'org': str|None, 'network': (first, last)|None}.
+    """
+    address = ipaddress.ip_address(ip)
+    records = []
+    current = None
+    for paragraph in text.replace('\r\n', '\n').split('\n\n'):
+        fields = {}
+        paragraph_range = None
+        for line in paragraph.splitlines():
+            if line.startswith(('%', '#')):
+                continue
+            key, sep, value = line.partition(':')
+            key = key.strip().lower()
+            value = value.strip()
+            if not sep or not value:
+                continue
+            if key in RANGE_KEYS and paragraph_range is None:
+                paragraph_range = _parse_range(key, value)
+            fields.setdefault(key, value)
+        if paragraph_range is not None:
+            current = {'network': paragraph_range, 'fields': fields}
+            records.append(current)
+        elif current is not None:
+            for key, value in fields.items():
+                current['fields'].setdefault(key, value)
+        elif fields:
+            current = {'network': None, 'fields': fields}
+            records.append(current)
+
+    best = None
+    for record in records:
+        network = record['network']
+        if network is None or network[0].version != address.version or not network[0] <= address <= network[1]:
+            continue
+        size = int(network[1]) - int(network[0])
+        if best is None or size < best[0]:
+            best = (size, record)
+
+    chosen = best[1] if best else (records[0] if records else None)
+    if chosen is None:
+        return {'org': None, 'network': None}
+    org = None
+    for key in ORG_KEYS:
+        if chosen['fields'].get(key):
+            org = chosen['fields'][key]
+            break
+    return {'org': org, 'network': chosen['network'] if best else None}
+
+
+__all__ = [
+    'WHOIS_PORT', 'IANA_WHOIS_SERVER', 'DEFAULT_WHOIS_TIMEOUT', 'MAX_REFERRALS',
+    'query_whois_server', 'whois_lookup', 'parse_whois_response'
+]